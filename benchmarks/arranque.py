@@ -0,0 +1,119 @@
+"""
+Benchmark de arranque en frío de Spotipy (cada medición es un proceso nuevo).
+
+Mide:
+- import_reproductor: importar servicios.reproductor.
+- import_main: importar main (crea el reproductor y demás servicios globales).
+- hasta_login: desde lanzar `python main.py` hasta que aparece el prompt de correo.
+
+Uso:
+    python benchmarks/arranque.py                      # 5 repeticiones
+    python benchmarks/arranque.py --repeticiones 10 --motor nulo --salida arranque.json
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(RAIZ)
+# -----------------------------
+
+from benchmarks.suite import _commit_actual
+
+PROMPT_LOGIN = "Correo".encode("utf-8")
+
+
+def _entorno(motor):
+    entorno = dict(os.environ, TERM=os.environ.get("TERM", "dumb"))
+    if motor:
+        entorno["SPOTIPY_AUDIO"] = motor
+    return entorno
+
+
+def medir_import(modulo, motor=None):
+    """Segundos que tarda 'import modulo' en un intérprete nuevo."""
+    codigo = (
+        "import time; t = time.perf_counter(); "
+        f"import {modulo}; print(time.perf_counter() - t)"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=RAIZ, env=_entorno(motor), capture_output=True, check=True,
+    ).stdout
+    return float(salida.strip().splitlines()[-1])
+
+
+def medir_hasta_login(motor=None, limite=60):
+    """Segundos desde lanzar main.py hasta que pide el correo (incluye arrancar el intérprete)."""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=RAIZ, env=_entorno(motor),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        leido = b""
+        while PROMPT_LOGIN not in leido:
+            trozo = os.read(proceso.stdout.fileno(), 4096)
+            if not trozo or time.perf_counter() - inicio > limite:
+                raise RuntimeError("main.py terminó (o tardó demasiado) sin mostrar el login")
+            leido += trozo
+        return time.perf_counter() - inicio
+    finally:
+        proceso.kill()
+        proceso.wait()
+
+
+MEDICIONES = {
+    "import_reproductor": lambda motor: medir_import("servicios.reproductor", motor),
+    "import_main": lambda motor: medir_import("main", motor),
+    "hasta_login": medir_hasta_login,
+}
+
+
+def ejecutar(repeticiones=5, motor=None):
+    resultados = []
+    for nombre, medir in MEDICIONES.items():
+        muestras = [medir(motor) for _ in range(repeticiones)]
+        fila = {
+            "benchmark": nombre,
+            "repeticiones": repeticiones,
+            "mediana_ms": round(statistics.median(muestras) * 1000, 1),
+            "minimo_ms": round(min(muestras) * 1000, 1),
+        }
+        resultados.append(fila)
+        print(f"   {nombre:<20} {fila['mediana_ms']:>8.1f} ms (mín {fila['minimo_ms']:.1f})", file=sys.stderr)
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "motor": motor or os.environ.get("SPOTIPY_AUDIO", "auto"),
+        "resultados": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de Spotipy")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--motor", help="Valor de SPOTIPY_AUDIO para los procesos medidos")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: stdout)")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.repeticiones, args.motor)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    else:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
@@ -0,0 +1,141 @@
+"""
+Benchmark de búsqueda y reinicio de pista en MP3 grandes (sintéticos, CBR 128 kbps).
+
+Por cada duración mide, con el motor "pcm" sonando en tiempo real:
+- indexar: leer metadatos + armar el índice de búsqueda (lo que paga el escáner una vez).
+- reinicio_recarga: el reinicio de antes, volver a cargar la pista (_reproducir_actual).
+- reinicio_indice: el reinicio de ahora, Reproductor.buscar(0).
+- busqueda_sin_indice: recorrer cabeceras de frames hasta la mitad (lo que hace un
+  decodificador sin tabla de saltos; en pygame, music.play(start=...)).
+- busqueda_indice: Reproductor.buscar(mitad) con el índice.
+
+Uso:
+    python benchmarks/busqueda.py                          # 10 y 120 minutos
+    python benchmarks/busqueda.py --minutos 5 60 240 --repeticiones 20 --salida busqueda.json
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from benchmarks.suite import _commit_actual
+from servicios.audio import MotorPCM
+from servicios.escaner import EscanerBiblioteca, _cabecera_mpeg
+from servicios.reproductor import Reproductor
+
+FRAME = b"\xff\xfb\x90\x00" + bytes(413)  # MPEG1 Layer III, 128 kbps, 44.1 kHz, sin relleno
+SEGUNDOS_POR_FRAME = 1152 / 44100
+
+
+def mp3_grande(carpeta, minutos):
+    ruta = os.path.join(carpeta, f"largo_{minutos:04}min.mp3")
+    frames = round(minutos * 60 / SEGUNDOS_POR_FRAME)
+    with open(ruta, "wb") as archivo:
+        bloque = FRAME * 1000
+        for _ in range(frames // 1000):
+            archivo.write(bloque)
+        archivo.write(FRAME * (frames % 1000))
+    return ruta
+
+
+def recorrer_hasta(ruta, segundos):
+    """Byte del frame en 'segundos' sin índice: leer y saltar cabecera por cabecera."""
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    pos, tiempo = 0, 0.0
+    while tiempo < segundos:
+        cab = _cabecera_mpeg(datos, pos)
+        tiempo += cab["muestras"] / cab["frecuencia"]
+        pos += cab["tamano"]
+    return pos
+
+
+def _medir(funcion, repeticiones):
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        muestras.append(time.perf_counter() - inicio)
+    return {
+        "mediana_ms": round(statistics.median(muestras) * 1000, 3),
+        "minimo_ms": round(min(muestras) * 1000, 3),
+    }
+
+
+def ejecutar(minutos=(10, 120), repeticiones=10):
+    resultados = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        for duracion in minutos:
+            ruta = mp3_grande(carpeta, duracion)
+            escaner = EscanerBiblioteca(carpeta, ruta_cache=os.path.join(carpeta, "cache.json"), procesos=1)
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                canciones, _ = escaner.escanear()
+            indexar_ms = (time.perf_counter() - inicio) * 1000
+            cancion = next(c for c in canciones if c.ruta_archivo == ruta)
+            indice = escaner.indice_busqueda(ruta)
+
+            motor = MotorPCM(velocidad=1)
+            motor.iniciar(0.5)
+            dj = Reproductor(motor=motor)
+            dj.indices_busqueda = escaner
+            mitad = cancion.duracion / 2
+            with contextlib.redirect_stdout(io.StringIO()):
+                dj.cargar_origen(cancion)
+                fila = {
+                    "minutos": duracion,
+                    "mib": round(os.path.getsize(ruta) / 2**20, 1),
+                    "indexar_ms": round(indexar_ms, 1),
+                    "indice_bytes": len(indice) * indice.desplazamientos.itemsize,
+                    "reinicio_recarga": _medir(dj._reproducir_actual, repeticiones),
+                    "reinicio_indice": _medir(lambda: dj.buscar(0), repeticiones),
+                    "busqueda_sin_indice": _medir(lambda: recorrer_hasta(ruta, mitad), max(1, repeticiones // 5)),
+                    "busqueda_indice": _medir(lambda: dj.buscar(mitad), repeticiones),
+                }
+                dj.detener()
+            motor.cerrar()
+            if dj.precarga is not None:
+                dj.precarga.detener()
+            resultados.append(fila)
+            print(
+                f"   {duracion:>4} min ({fila['mib']:>6.1f} MiB)  indexar {fila['indexar_ms']:>8.1f} ms  "
+                f"reinicio {fila['reinicio_recarga']['mediana_ms']:>8.3f} -> {fila['reinicio_indice']['mediana_ms']:.3f} ms  "
+                f"búsqueda {fila['busqueda_sin_indice']['mediana_ms']:>8.1f} -> {fila['busqueda_indice']['mediana_ms']:.3f} ms",
+                file=sys.stderr,
+            )
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia de reinicio y búsqueda en MP3 grandes")
+    parser.add_argument("--minutos", type=int, nargs="+", default=[10, 120])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: stdout)")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.minutos, args.repeticiones)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    else:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
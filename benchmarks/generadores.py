@@ -0,0 +1,64 @@
+import sys
+import os
+import random
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.multimedia import Cancion, Playlist
+from modelos.usuario import Cliente, Administrador
+from utils import seguridad
+
+GENEROS = ["Rock", "Pop", "Jazz", "Latino", "Metal", "Clásica", "Reggaetón", "Indie"]
+
+
+def generar_catalogo(n, semilla=42):
+    """n canciones sintéticas con artistas/álbumes repetidos como en un catálogo real."""
+    azar = random.Random(semilla)
+    n_artistas = max(1, n // 200)
+    return [
+        Cancion(
+            f"Tema {i}",
+            f"Artista {azar.randrange(n_artistas)}",
+            f"Disco {i // 12}",
+            azar.choice(GENEROS),
+            f"assets/musica/{i}.mp3",
+            azar.randint(90, 420),
+        )
+        for i in range(n)
+    ]
+
+
+def generar_usuarios(n, proporcion_admin=0.01, costo_kdf_minimo=True):
+    """
+    n usuarios (Cliente/Administrador). Por defecto usa un KDF mínimo:
+    con scrypt real, crear 100k cuentas tardaría horas y aquí no medimos el hash.
+    """
+    anteriores = dict(seguridad.PARAMETROS_KDF)
+    if costo_kdf_minimo:
+        seguridad.PARAMETROS_KDF.update(n=2, r=1, p=1)
+    try:
+        cada_admin = max(1, round(1 / proporcion_admin)) if proporcion_admin else 0
+        usuarios = []
+        for i in range(n):
+            if cada_admin and i % cada_admin == 0:
+                usuarios.append(Administrador(f"Admin {i}", f"admin{i}@spotipy.com", "clave"))
+            else:
+                usuarios.append(Cliente(f"Usuario {i}", f"user{i}@spotipy.com", "clave"))
+        return usuarios
+    finally:
+        seguridad.PARAMETROS_KDF.clear()
+        seguridad.PARAMETROS_KDF.update(anteriores)
+
+
+def generar_playlists(catalogo, cantidad, largo, semilla=7):
+    """'cantidad' playlists de 'largo' pistas tomadas al azar del catálogo."""
+    azar = random.Random(semilla)
+    playlists = []
+    for i in range(cantidad):
+        playlist = Playlist(f"Playlist {i}", "Generada para benchmark")
+        for cancion in azar.choices(catalogo, k=largo):
+            playlist.agregar_cancion(cancion)
+        playlists.append(playlist)
+    return playlists
@@ -0,0 +1,235 @@
+"""
+Suite de benchmarks de Spotipy con datos sintéticos.
+
+Uso:
+    python benchmarks/suite.py                       # tamaños 10k y 100k
+    python benchmarks/suite.py --tamanos 10000 1000000 --salida bench.json
+    python benchmarks/suite.py --comparar base.json  # compara contra otra corrida
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from benchmarks.generadores import generar_catalogo, generar_usuarios, generar_playlists
+from modelos.multimedia import Album, Playlist
+from servicios.repositorio_usuarios import UsuarioRepositorio
+from servicios.reloj import RelojVirtual
+from servicios.reproductor import Reproductor
+from servicios.audio import MotorPCM, TASA
+from utils.terminal import Lienzo, barra_progreso
+
+BENCHMARKS = {}  # nombre -> función(contexto) -> (operaciones, segundos)
+UMBRAL_REGRESION = 1.20  # +20% de ns/op se marca como regresión
+
+
+def benchmark(nombre):
+    def registrar(funcion):
+        BENCHMARKS[nombre] = funcion
+        return funcion
+
+    return registrar
+
+
+@benchmark("login_busqueda")
+def _login(ctx):
+    """Búsqueda de usuario de sistema_login (el hash de la clave es costoso a propósito y no entra)."""
+    repo = UsuarioRepositorio()
+    for usuario in ctx["usuarios"]:
+        repo.registrar(usuario)
+    correos = [u.correo.upper() for u in random.Random(1).choices(ctx["usuarios"], k=100_000)]
+    inicio = time.perf_counter()
+    for correo in correos:
+        repo.buscar_por_correo(correo)
+    return len(correos), time.perf_counter() - inicio
+
+
+@benchmark("playlist_agregar")
+def _agregar(ctx):
+    playlist = Playlist("Bench", "agregar")
+    inicio = time.perf_counter()
+    for cancion in ctx["catalogo"]:
+        playlist.agregar_cancion(cancion)
+    ctx["playlist_grande"] = playlist
+    return len(ctx["catalogo"]), time.perf_counter() - inicio
+
+
+@benchmark("playlist_eliminar")
+def _eliminar(ctx):
+    playlist = ctx["playlist_grande"]
+    victimas = random.Random(2).sample(ctx["catalogo"], k=min(10_000, len(ctx["catalogo"])))
+    inicio = time.perf_counter()
+    for cancion in victimas:
+        playlist.eliminar_cancion(cancion)
+    return len(victimas), time.perf_counter() - inicio
+
+
+@benchmark("album_construccion")
+def _album(ctx):
+    catalogo = ctx["catalogo"]
+    grupos = [catalogo[i : i + 12] for i in range(0, len(catalogo), 12)]
+    inicio = time.perf_counter()
+    for i, pistas in enumerate(grupos):
+        Album(f"Disco {i}", pistas[0].artista, 2000, pistas)
+    return len(grupos), time.perf_counter() - inicio
+
+
+@benchmark("reproductor_cargar_origen")
+def _cargar(ctx):
+    dj = Reproductor(reloj=RelojVirtual(), con_audio=False)
+    playlists = ctx["playlists"]
+    inicio = time.perf_counter()
+    for playlist in playlists:
+        dj.cargar_origen(playlist)
+    return len(playlists), time.perf_counter() - inicio
+
+
+@benchmark("reproductor_siguiente_anterior")
+def _navegar(ctx):
+    dj = Reproductor(reloj=RelojVirtual(), con_audio=False)
+    dj.cargar_origen(ctx["playlist_grande"])
+    pasos = 20_000
+    inicio = time.perf_counter()
+    for _ in range(pasos):
+        dj.siguiente()
+    for _ in range(pasos):
+        dj.anterior()
+    return 2 * pasos, time.perf_counter() - inicio
+
+
+@benchmark("motor_pcm_frames")
+def _pcm(ctx):
+    """Frames PCM sintetizados, pasados por el anillo y mezclados sin ritmo (x∞ tiempo real)."""
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as archivo:
+        archivo.write(bytes(512 * 1024))  # ≈ 32 s de audio sintético
+        archivo.flush()
+        motor = MotorPCM(velocidad=0)
+        motor.iniciar(volumen=0.5)
+        inicio = time.perf_counter()
+        for _ in range(3):
+            motor.cargar(archivo.name)
+            motor.reproducir()
+            while not motor.fines_pendientes():
+                time.sleep(0.001)
+        segundos = time.perf_counter() - inicio
+        motor.cerrar()
+    frames = round(motor.estadisticas()["segundos_audio_consumidos"] * TASA)
+    return frames, segundos
+
+
+@benchmark("tui_cuadro")
+def _tui(ctx):
+    """Cuadros del reproductor (20 líneas) a 4 por segundo: armar la barra, el diff y escribir."""
+    salida = io.StringIO()
+    salida.isatty = lambda: True  # El Lienzo emite ANSI como en una terminal
+    lienzo = Lienzo(salida)
+    fijas = [f"│ {'línea fija ' + str(i):^36} │" for i in range(19)]
+    cuadros = 4 * 3600  # Una hora de reproducción
+    inicio = time.perf_counter()
+    for tick in range(cuadros):
+        lienzo.dibujar(fijas[:8] + [f"│ {barra_progreso(tick / 4, 3600):^36} │"] + fijas[8:])
+    return cuadros, time.perf_counter() - inicio
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(tamanos, seleccion=None):
+    """Corre los benchmarks para cada tamaño de catálogo y devuelve el informe (dict)."""
+    resultados = []
+    for tamano in tamanos:
+        print(f"\n📦 Generando datos sintéticos: {tamano:,} canciones / usuarios...", file=sys.stderr)
+        # Los modelos imprimen en cada operación: lo descartamos para medir solo la lógica
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            catalogo = generar_catalogo(tamano)
+            ctx = {
+                "catalogo": catalogo,
+                "usuarios": generar_usuarios(tamano),
+                "playlists": generar_playlists(catalogo, cantidad=200, largo=50),
+            }
+            for nombre, funcion in BENCHMARKS.items():
+                elegido = not seleccion or nombre in seleccion
+                # playlist_agregar siempre corre: deja lista la playlist grande que usan otros
+                if not elegido and nombre != "playlist_agregar":
+                    continue
+                operaciones, segundos = funcion(ctx)
+                if not elegido:
+                    continue
+                fila = {
+                    "benchmark": nombre,
+                    "tamano": tamano,
+                    "operaciones": operaciones,
+                    "segundos": round(segundos, 6),
+                    "ns_por_op": round(segundos * 1e9 / max(1, operaciones), 1),
+                }
+                resultados.append(fila)
+                print(f"   {nombre:<32} {fila['ns_por_op']:>12,.1f} ns/op", file=sys.stderr)
+
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base):
+    """Imprime la variación de ns/op frente a otra corrida y devuelve las regresiones."""
+    previos = {(r["benchmark"], r["tamano"]): r for r in base["resultados"]}
+    regresiones = []
+    print(f"\n--- Comparación contra {base.get('commit')} ---", file=sys.stderr)
+    for fila in actual["resultados"]:
+        previo = previos.get((fila["benchmark"], fila["tamano"]))
+        if not previo or not previo["ns_por_op"]:
+            continue
+        razon = fila["ns_por_op"] / previo["ns_por_op"]
+        marca = "🔴 REGRESIÓN" if razon > UMBRAL_REGRESION else ""
+        if marca:
+            regresiones.append(fila)
+        print(f"   {fila['benchmark']:<32} {fila['tamano']:>9,} x{razon:5.2f} {marca}", file=sys.stderr)
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks sintéticos de Spotipy")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--solo", nargs="+", choices=sorted(BENCHMARKS), help="Subconjunto a correr")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: stdout)")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.tamanos, args.solo)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    else:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            if comparar(informe, json.load(archivo)):
+                sys.exit(1)
@@ -1,59 +1,147 @@
 import sys
 import os
 import time
+import threading
+import contextlib
 
 # Importaciones de nuestros módulos
 from modelos.usuario import Cliente, Administrador
-from modelos.multimedia import Cancion, Playlist, Album
+from modelos.multimedia import Playlist, Album
+from modelos.catalogo import CatalogoColumnar
+from modelos.catalogo_binario import CatalogoBinario
 from servicios.reproductor import Reproductor
+from servicios.repositorio_usuarios import UsuarioRepositorio
+from servicios.buscador import BuscadorCatalogo
+from servicios.autenticacion import ServicioAutenticacion
+from servicios.escaner import EscanerBiblioteca
+from servicios.precarga import cache_compartida
+from servicios.recomendador import Recomendador
+from servicios.bitacora import BitacoraEventos
+from servicios.estadisticas import EstadisticasReproduccion
+from servicios.sonoridad import AnalizadorSonoridad
+from utils import metricas
+from utils import terminal
 from utils.excepciones import (
     SpotipyError,
     UsuarioNoEncontradoError,
     ContrasenaIncorrectaError,
+    CancionNoEncontradaError,
 )
 
 # --- BASE DE DATOS SIMULADA (RAM) ---
-usuarios_db = []
-catalogo_musica = []
-reproductor = Reproductor()  # Instancia única del motor de audio
+RUTA_CATALOGO = "assets/catalogo.ntfy"  # Si existe, se mapea en vez de construirse
+CARPETA_MUSICA = "assets/musica"  # MP3 locales: se escanean sus etiquetas ID3
+CARPETA_EVENTOS = "assets/eventos"  # Bitácora de reproducción (segmentos JSONL)
+TICK_SEGUNDOS = 0.25  # Refresco del reproductor (barra de progreso) mientras no se pulsa nada
+usuarios_db = UsuarioRepositorio()  # Índice hash por correo, rol y bloqueo
+autenticacion = ServicioAutenticacion(usuarios_db)  # scrypt en un pool de hilos
+catalogo_musica = CatalogoColumnar()  # Columnas compactas, entrega vistas de Cancion
+buscador = BuscadorCatalogo()  # Índice invertido sobre el catálogo (se arma en 2º plano; ver indexar_catalogo)
+_hilo_buscador = None
+reproductor = Reproductor()  # Instancia única; el motor de audio se inicia al primer play
+recomendador = Recomendador()  # Co-ocurrencia en playlists (se entrena en 2º plano; ver preparar_radio)
+_hilo_recomendador = None
+estadisticas = EstadisticasReproduccion()  # Agregados en streaming para el panel de admin
+sonoridad = AnalizadorSonoridad()  # Ganancia por pista (ReplayGain), caché por contenido
+reproductor.normalizacion = sonoridad
 
 
 def limpiar_pantalla():
-    """Limpia la consola según el sistema operativo."""
-    if os.name == "nt":  # Windows
-        os.system("cls")
-    else:  # Mac/Linux
-        os.system("clear")
+    """Limpia la consola con una secuencia ANSI (antes: un proceso 'clear'/'cls' cada vez)."""
+    terminal.limpiar()
+
+
+def analizar_biblioteca():
+    """Mide la sonoridad de la música local (en procesos aparte; lo ya medido sale de la caché)."""
+    rutas = [
+        os.path.join(raiz, nombre)
+        for raiz, _, archivos in os.walk(CARPETA_MUSICA)
+        for nombre in archivos
+        if nombre.lower().endswith((".mp3", ".wav"))
+    ]
+    if rutas:
+        sonoridad.analizar(rutas)
+
+
+def indexar_catalogo():
+    """
+    Arma el índice de búsqueda en segundo plano (como la sonoridad) y lo publica de una
+    vez al terminar. Devuelve el hilo, para que una búsqueda temprana pueda esperarlo.
+    """
+    global _hilo_buscador
+    if _hilo_buscador is None:
+
+        def construir():
+            global buscador
+            nuevo = BuscadorCatalogo()
+            nuevo.agregar_lote(catalogo_musica)
+            buscador = nuevo
+
+        _hilo_buscador = threading.Thread(target=construir, name="spotipy-buscador", daemon=True)
+        _hilo_buscador.start()
+    return _hilo_buscador
+
+
+def preparar_radio():
+    """
+    Reentrena el recomendador en segundo plano si cambiaron las playlists (como la
+    sonoridad): la interfaz no espera, y la radio usa el modelo anterior mientras tanto.
+    """
+    global _hilo_recomendador
+    if _hilo_recomendador is not None and _hilo_recomendador.is_alive():
+        return  # Ya hay un entrenamiento en curso; el próximo pedido verá los cambios
+    playlists = [pl for cliente in usuarios_db.clientes() for pl in cliente.mis_playlists]
+    entrenar = recomendador.preparar(playlists, catalogo_musica)
+    if entrenar is None:
+        return
+
+    def publicar():
+        global recomendador
+        recomendador = entrenar()  # Se reemplaza de una vez: nadie ve un modelo a medias
+
+    _hilo_recomendador = threading.Thread(target=publicar, name="spotipy-recomendador", daemon=True)
+    _hilo_recomendador.start()
 
 
 def inicializar_datos():
     """Crea datos de prueba para que el sistema no esté vacío."""
+    global catalogo_musica
     limpiar_pantalla()
     print("🔄 Inicializando sistema Spotipy...")
-    time.sleep(1)  # Pequeña pausa dramática
-
-    # 1. Crear Canciones (Simuladas)
-    c1 = Cancion(
-        "Billie Jean",
-        "Michael Jackson",
-        "Thriller",
-        "Pop",
-        "assets/01 Enter Pharloom.mp3",
-        294,
-    )
-    c2 = Cancion(
-        "Bohemian Rhapsody",
-        "Queen",
-        "A Night at the Opera",
-        "Rock",
-        "assets/musica/bohemian.mp3",
-        354,
-    )
-    c3 = Cancion(
-        "Shape of You", "Ed Sheeran", "Divide", "Pop", "assets/musica/shape.mp3", 233
-    )
-
-    catalogo_musica.extend([c1, c2, c3])
+
+    if os.path.exists(RUTA_CATALOGO):
+        # Arranque instantáneo: el archivo se mapea con mmap y se lee bajo demanda
+        catalogo_musica = CatalogoBinario(RUTA_CATALOGO)
+        print(f"📀 Catálogo binario cargado: {len(catalogo_musica)} canciones")
+    else:
+        # 1. Crear Canciones (Simuladas) directamente en el catálogo columnar
+        catalogo_musica.agregar(
+            "Billie Jean",
+            "Michael Jackson",
+            "Thriller",
+            "Pop",
+            "assets/01 Enter Pharloom.mp3",
+            294,
+        )
+        catalogo_musica.agregar(
+            "Bohemian Rhapsody",
+            "Queen",
+            "A Night at the Opera",
+            "Rock",
+            "assets/musica/bohemian.mp3",
+            354,
+        )
+        catalogo_musica.agregar(
+            "Shape of You", "Ed Sheeran", "Divide", "Pop", "assets/musica/shape.mp3", 233
+        )
+
+        # 1.b Canciones reales de la carpeta de música (escaneo incremental con caché)
+        if os.path.isdir(CARPETA_MUSICA):
+            escaner = EscanerBiblioteca(CARPETA_MUSICA)
+            canciones, _ = escaner.escanear()
+            for cancion in canciones:
+                catalogo_musica.agregar_cancion(cancion)
+            reproductor.indices_busqueda = escaner  # Saltos en O(1) con el índice de cada MP3
 
     # 2. Crear Usuarios
     # Admin (Clave: admin123)
@@ -63,10 +151,11 @@ def inicializar_datos():
     cliente = Cliente("Juan Perez", "juan@gmail.com", "1234")
     # Le regalamos una playlist al cliente
     pl_rock = cliente.crear_playlist("Mis Favoritas", "Rock y Pop")
-    pl_rock.agregar_cancion(c2)
-    pl_rock.agregar_cancion(c3)
+    for i in range(1, min(3, len(catalogo_musica))):
+        pl_rock.agregar_cancion(catalogo_musica[i])
 
-    usuarios_db.extend([admin, cliente])
+    usuarios_db.registrar(admin)
+    usuarios_db.registrar(cliente)
 
 
 def sistema_login():
@@ -79,21 +168,11 @@ def sistema_login():
         password = input("🔑 Contraseña: ")
 
         try:
-            # 1. Buscar usuario
-            usuario_encontrado = None
-            for u in usuarios_db:
-                if u.correo == email:
-                    usuario_encontrado = u
-                    break
-
-            if not usuario_encontrado:
-                raise UsuarioNoEncontradoError(f"No existe cuenta con {email}")
-
-            # 2. Verificar password
-            usuario_encontrado.verificar_contrasena(password)
+            # 1. Buscar usuario (O(1)) y 2. verificar password (scrypt, fuera de este hilo)
+            usuario_encontrado = autenticacion.autenticar(email, password).result()
 
+            # Sin pausa: el panel que sigue ya saluda con el nombre
             print(f"\n👋 ¡Hola de nuevo, {usuario_encontrado.nombre}!")
-            time.sleep(1.5)  # Pausa para ver el saludo
             return usuario_encontrado
 
         except SpotipyError as e:
@@ -101,55 +180,160 @@ def sistema_login():
             input("   (Presiona Enter para intentar de nuevo...)")
 
 
-def menu_reproduccion():
-    """Sub-menú para controlar la música que suena."""
-    while True:
-        limpiar_pantalla()  # Refrescamos la interfaz del reproductor
-        print("\n--- 🎵 REPRODUCTOR SPOTIPY ---")
-
-        if reproductor.cola:
-            actual = reproductor.cola[reproductor.indice_actual]
-            # Estado visual
-            estado = "▶️  SONANDO" if reproductor.reproduciendo else "⏸️  PAUSADO"
-
-            # Decoración visual simple
-            print(f"┌──────────────────────────────────────┐")
-            print(f"│ {estado.center(37)} │")
-            print(f"│                                      │")
-            print(f"│ 🎵 {actual.titulo[:32].center(33)} │")
-            print(f"│ 👤 {actual.artista[:32].center(33)} │")
-            print(f"└──────────────────────────────────────┘")
-        else:
-            print("   (Nada reproduciéndose)")
-
-        print("\n[P] Play/Pause | [S]iguiente | [A]nterior | [V]olumen | [X] Salir")
-        opcion = input(">> Opción: ").upper()
-
-        if opcion == "P":
-            # --- LOGICA TOGGLE (INTERRUPTOR) ---
+def elegir_destino(recurso):
+    """Si ya suena algo, pregunta si reemplazarlo o sumar 'recurso' a la cola."""
+    if reproductor.actual is not None:
+        opcion = input("[Enter] Reproducir ya | [C] A continuación | [F] Al final de la cola: ").upper()
+        if opcion == "C":
+            reproductor.reproducir_a_continuacion(recurso)
+            return
+        if opcion == "F":
+            reproductor.agregar_a_cola(recurso)
+            return
+    reproductor.cargar_origen(recurso)
+
+
+def vista_reproductor(usuario, portada, mensajes, interactivo):
+    """Líneas del reproductor. El Lienzo solo reescribe las que cambian entre cuadros."""
+    lineas = ["", "--- 🎵 REPRODUCTOR SPOTIPY ---"]
+
+    actual = reproductor.actual
+    if actual is not None:
+        # Estado visual
+        estado = "▶️  SONANDO" if reproductor.reproduciendo else "⏸️  PAUSADO"
+        progreso = terminal.barra_progreso(reproductor.posicion_actual(), actual.duracion)
+
+        # Decoración visual simple
+        lineas.append(f"┌──────────────────────────────────────┐")
+        lineas.append(f"│ {estado.center(37)} │")
+        lineas.append(f"│                                      │")
+        lineas.append(f"│ 🎵 {actual.titulo[:32].center(33)} │")
+        lineas.append(f"│ 👤 {actual.artista[:32].center(33)} │")
+        if portada is not None:
+            lineas.append(f"│ 🖼️ {f'{os.path.basename(actual.img_portada)} ({len(portada) // 1024} KB)'[:32].center(33)} │")
+        if isinstance(usuario, Cliente) and usuario.le_gusta(actual):
+            lineas.append(f"│ {'💚 Me Gusta'.center(36)} │")
+        modos = f"🔀 {'Sí' if reproductor.aleatorio else 'No'}  🔁 {reproductor.repeticion}"
+        lineas.append(f"│ {modos.center(35)} │")
+        lineas.append(f"│ {progreso.center(36)} │")
+        lineas.append(f"└──────────────────────────────────────┘")
+        proximas = reproductor.proximas(5)
+        if proximas:
+            lineas.append("A continuación:")
+            for i, cancion in enumerate(proximas):
+                lineas.append(f"  {i+1}. {cancion.titulo} - {cancion.artista}")
+    else:
+        lineas.append("   (Nada reproduciéndose)")
+
+    # Últimos mensajes de los servicios (siempre 3 líneas: el menú no se mueve)
+    ultimos = mensajes.ultimas()
+    lineas += [""] + [f"   {m}" for m in ultimos] + [""] * (4 - len(ultimos))
+
+    lineas.append("[P] Play/Pause | [S]iguiente | [A]nterior | [V]olumen | [R]adio | [X] Salir")
+    lineas.append("[M]ezclar | [B]ucle (repetir todas/una/no) | [J] Saltar a | [Q] Quitar de la cola")
+    lineas.append("[T] Ir al minuto (m:ss)")
+    if isinstance(usuario, Cliente):
+        lineas.append("[G] Me Gusta")
+    if interactivo:
+        lineas.append(">> Pulsa una tecla")
+    return lineas
+
+
+def menu_reproduccion(usuario=None):
+    """
+    Sub-menú para controlar la música que suena (con [G] si es un Cliente).
+    En una terminal: teclas sin Enter y un cuadro que se refresca cada TICK_SEGUNDOS
+    reescribiendo solo lo que cambió (normalmente, la barra de progreso).
+    Fuera de una terminal (tubería), se lee una opción por línea como antes.
+    """
+    limpiar_pantalla()
+    salida = sys.stdout
+    mensajes = terminal.RegistroMensajes(maximo=3)
+    with terminal.Lienzo(salida) as lienzo, terminal.Teclado(salida=salida) as teclado, \
+            contextlib.redirect_stdout(mensajes):
+        # Desde acá los print() (también los de otros hilos) van a 'mensajes', no al cuadro
+
+        def pedir(texto):
+            respuesta = teclado.pedir(texto)
+            lienzo.invalidar()  # El prompt quedó en pantalla: el próximo cuadro se pinta entero
+            return respuesta
+
+        mostrada, portada = None, None
+        while True:
             if reproductor.reproduciendo:
-                reproductor.pausar()
+                reproductor.procesar_eventos()  # Pausado no hay fines de pista que atender
+            actual = reproductor.actual
+            if actual is not mostrada:
+                # Una vez por pista (y desde la caché de recursos), no en cada cuadro
+                mostrada, portada = actual, reproductor.portada_actual()
+            lienzo.dibujar(vista_reproductor(usuario, portada, mensajes, teclado.interactivo))
+
+            if teclado.interactivo:
+                opcion = teclado.leer(TICK_SEGUNDOS)
+                if opcion is None:
+                    continue  # Nada pulsado: otro cuadro (la barra avanza)
+                opcion = opcion.upper()
             else:
-                reproductor.despausar()
-            # No ponemos pausa aquí para que refresque rápido la pantalla
-
-        elif opcion == "S":
-            reproductor.siguiente()
-        elif opcion == "A":
-            reproductor.anterior()
-        elif opcion == "V":
-            try:
-                vol = float(input("\nNivel (0.0 a 1.0): "))
-                reproductor.cambiar_volumen(vol)
-                time.sleep(1)  # Breve pausa para leer el volumen
-            except ValueError:
-                print("❌ Ingresa un número válido.")
-                time.sleep(1)
-        elif opcion == "X":
-            break
-        else:
-            print("Opción no válida.")
-            time.sleep(0.5)
+                opcion = pedir(">> Opción: ").upper()
+
+            if opcion == "P":
+                # --- LOGICA TOGGLE (INTERRUPTOR) ---
+                if reproductor.reproduciendo:
+                    reproductor.pausar()
+                else:
+                    reproductor.despausar()
+
+            elif opcion == "S":
+                reproductor.siguiente()
+            elif opcion == "A":
+                reproductor.anterior()
+            elif opcion == "M":
+                reproductor.alternar_aleatorio()
+            elif opcion == "B":
+                reproductor.cambiar_repeticion()
+            elif opcion == "V":
+                try:
+                    vol = float(pedir("\nNivel (0.0 a 1.0): "))
+                    reproductor.cambiar_volumen(vol)
+                except ValueError:
+                    print("❌ Ingresa un número válido.")
+            elif opcion in ("J", "Q") and actual is not None:
+                entrada = pedir("\nNúmero en la cola: ")
+                try:
+                    if opcion == "J":
+                        reproductor.saltar_a(int(entrada) - 1)
+                    else:
+                        reproductor.quitar_de_cola(int(entrada) - 1)
+                except (ValueError, IndexError):
+                    print("❌ Posición no válida.")
+            elif opcion == "T" and actual is not None:
+                entrada = pedir("\nIr a (m:ss): ")
+                try:
+                    minutos, _, segundos = entrada.rpartition(":")
+                    reproductor.buscar(int(minutos or 0) * 60 + float(segundos))
+                except ValueError:
+                    print("❌ Formato no válido (ej.: 1:30).")
+            elif opcion == "R":
+                if actual is None:
+                    print("❌ Primero reproduce algo para iniciar la radio.")
+                    continue
+                preparar_radio()  # Si alguna playlist cambió, se reentrena en 2º plano
+                if not recomendador.entrenado:
+                    print("⏳ La radio se está preparando, prueba de nuevo en unos segundos.")
+                    continue
+                try:
+                    reproductor.cargar_radio(recomendador.radio(actual))
+                except SpotipyError as e:
+                    print(f"❌ {e}")
+            elif opcion == "G" and isinstance(usuario, Cliente) and actual is not None:
+                try:
+                    usuario.alternar_me_gusta(actual)
+                except SpotipyError as e:
+                    print(f"❌ {e}")
+            elif opcion == "X":
+                break
+            else:
+                print("Opción no válida.")
 
 
 def menu_principal(usuario):
@@ -166,16 +350,34 @@ def menu_principal(usuario):
                 if opcion == "1":  # Reproducir del catálogo
                     limpiar_pantalla()
                     print("\n--- 🌎 CATÁLOGO GLOBAL ---")
-                    for i, cancion in enumerate(catalogo_musica):
-                        print(f"{i+1}. {cancion.titulo} - {cancion.artista}")
+                    consulta = input("🔎 Buscar (Enter para ver todo): ").strip()
+                    if consulta:
+                        # El índice se arma en 2º plano desde el arranque: solo se espera
+                        # si se busca antes de que termine
+                        indexando = indexar_catalogo()
+                        if indexando.is_alive():
+                            print("⏳ Terminando de preparar el índice de búsqueda...")
+                            indexando.join()
+                        try:
+                            resultados = buscador.buscar(consulta)
+                        except CancionNoEncontradaError as e:
+                            print(f"❌ {e.mensaje}")
+                            input("Presiona Enter...")
+                            continue
+                    else:
+                        resultados = catalogo_musica
+
+                    for i, cancion in enumerate(resultados):
+                        marca = " 💚" if usuario.le_gusta(cancion) else ""
+                        print(f"{i+1}. {cancion.titulo} - {cancion.artista}{marca}")
                     print("--------------------------")
 
                     entrada = input("Número de canción a reproducir (0 para salir): ")
                     if entrada.isdigit():
                         idx = int(entrada) - 1
-                        if 0 <= idx < len(catalogo_musica):
-                            reproductor.cargar_origen(catalogo_musica[idx])
-                            menu_reproduccion()  # Entramos al control
+                        if 0 <= idx < len(resultados):
+                            elegir_destino(resultados[idx])
+                            menu_reproduccion(usuario)  # Entramos al control
 
                 elif opcion == "2":  # Ver Playlists
                     limpiar_pantalla()
@@ -193,8 +395,8 @@ def menu_principal(usuario):
                         if entrada.isdigit():
                             idx = int(entrada) - 1
                             if 0 <= idx < len(usuario.mis_playlists):
-                                reproductor.cargar_origen(usuario.mis_playlists[idx])
-                                menu_reproduccion()
+                                elegir_destino(usuario.mis_playlists[idx])
+                                menu_reproduccion(usuario)
 
                 elif opcion == "3":  # Crear Playlist
                     limpiar_pantalla()
@@ -220,11 +422,8 @@ def menu_principal(usuario):
                     print("\n--- ⚖️ TRIBUNAL DE ADMINISTRACIÓN ---")
                     print("Selecciona el usuario a bloquear permanentemente:")
 
-                    # Filtramos la lista para no mostrar al propio admin
-                    # (Creamos una lista temporal de candidatos)
-                    candidatos = [
-                        u for u in usuarios_db if not isinstance(u, Administrador)
-                    ]
+                    # Solo clientes (el índice por rol evita recorrer toda la base)
+                    candidatos = usuarios_db.clientes()
 
                     if not candidatos:
                         print("   (No hay clientes registrados para bloquear)")
@@ -259,6 +458,38 @@ def menu_principal(usuario):
 
                     input("\nPresiona Enter para volver...")
 
+                elif opcion == "3":  # --- ESTADÍSTICAS ---
+                    limpiar_pantalla()
+                    print("\n--- 📊 ESTADÍSTICAS DEL SISTEMA ---")
+                    print(f"Usuarios registrados: {len(usuarios_db)} "
+                          f"({len(usuarios_db.bloqueados())} bloqueados)")
+                    print(f"Canciones en catálogo: {len(catalogo_musica)}")
+                    print(f"Reproducciones: {estadisticas.total_reproducciones} "
+                          f"| Oyentes únicos: ~{estadisticas.oyentes_unicos()}")
+                    recursos = cache_compartida().estadisticas()
+                    print(f"Caché de audio y portadas: {recursos['tasa_aciertos']:.0%} aciertos "
+                          f"({recursos['aciertos']} de {recursos['aciertos'] + recursos['fallos']}), "
+                          f"{recursos['bytes_usados'] / 2**20:.1f} de {recursos['capacidad_bytes'] / 2**20:.0f} MiB")
+
+                    print("\n🎵 Más escuchadas:")
+                    for i, (titulo, artista, cuenta, oyentes) in enumerate(
+                        estadisticas.top_canciones(5)
+                    ):
+                        print(f"   {i+1}. {titulo} - {artista} ({cuenta} veces, ~{oyentes} oyentes)")
+                    artistas = ", ".join(f"{a} ({c})" for a, c in estadisticas.top_artistas(5))
+                    generos = ", ".join(f"{g} ({c})" for g, c in estadisticas.top_generos(5))
+                    print(f"👤 Artistas: {artistas or '-'}")
+                    print(f"🎸 Géneros:  {generos or '-'}")
+
+                    print("\n🕒 Reproducciones por hora (últimas 24 h):")
+                    recientes = estadisticas.reproducciones_recientes(24)
+                    maximo = max(c for _, c in recientes) or 1
+                    for inicio, cuenta in recientes:
+                        if cuenta:
+                            barra = "█" * max(1, round(20 * cuenta / maximo))
+                            print(f"   {time.strftime('%H:00', time.localtime(inicio))} {barra} {cuenta}")
+                    input("\nPresiona Enter para volver...")
+
                 elif opcion == "4":
                     break
 
@@ -275,8 +506,22 @@ def menu_principal(usuario):
 
 
 if __name__ == "__main__":
+    # 0. Métricas (solo si SPOTIPY_METRICAS=1; SPOTIPY_METRICAS_PUERTO expone /metrics)
+    metricas.iniciar_desde_entorno()
+
     # 1. Cargar datos
     inicializar_datos()
+    # 1.a Normalización de volumen en segundo plano: el login no la espera
+    threading.Thread(target=analizar_biblioteca, name="spotipy-sonoridad", daemon=True).start()
+    # 1.a' Índice de búsqueda y recomendador para la radio, también en segundo plano
+    indexar_catalogo()
+    preparar_radio()
+
+    # 1.b Bitácora: cada comando del reproductor queda anotado (escritura por lotes en 2º plano)
+    bitacora = BitacoraEventos(CARPETA_EVENTOS)
+    usuario_activo = None
+    bitacora.conectar(reproductor, lambda: usuario_activo.correo if usuario_activo else None)
+    estadisticas.conectar(reproductor, lambda: usuario_activo.correo if usuario_activo else None)
 
     # 2. Loop infinito del programa
     while True:
@@ -290,3 +535,5 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             print("\n\nApagando Spotipy... ¡Adiós!")
             break
+
+    bitacora.cerrar()
@@ -0,0 +1,242 @@
+import sys
+import os
+from array import array
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.multimedia import Cancion
+from utils.excepciones import CancionNoEncontradaError
+
+
+class _Diccionario:
+    """
+    Codificación por diccionario de una columna de texto repetitivo
+    (artista, álbum, género...): cada valor distinto se guarda UNA vez
+    y las filas solo almacenan su número (id).
+    """
+
+    __slots__ = ("valores", "ids")
+
+    def __init__(self):
+        self.valores = []  # id -> texto
+        self.ids = {}  # texto -> id
+
+    def codificar(self, texto):
+        id_valor = self.ids.get(texto)
+        if id_valor is None:
+            id_valor = self.ids[texto] = len(self.valores)
+            self.valores.append(sys.intern(texto))
+        return id_valor
+
+
+class CatalogoColumnar:
+    """
+    Almacén del catálogo orientado a columnas.
+    En vez de un objeto Cancion por pista, guarda una columna por atributo:
+    - duraciones en un array de floats,
+    - artista/álbum/género/portada codificados por diccionario (array de ids),
+    - rutas internadas (sys.intern).
+    Las canciones se entregan como vistas ligeras (CancionVista) bajo demanda.
+    """
+
+    def __init__(self):
+        self.__titulos = []
+        self.__rutas = []
+        self.__duraciones = array("d")
+        self.__artistas = array("I")
+        self.__albumes = array("I")
+        self.__generos = array("I")
+        self.__portadas = array("I")
+        self.__dic_artistas = _Diccionario()
+        self.__dic_albumes = _Diccionario()
+        self.__dic_generos = _Diccionario()
+        self.__dic_portadas = _Diccionario()
+
+    def __len__(self):
+        return len(self.__titulos)
+
+    def __getitem__(self, indice):
+        total = len(self.__titulos)
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise CancionNoEncontradaError(f"No existe la pista #{indice} en el catálogo")
+        return CancionVista(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self.__titulos)):
+            yield CancionVista(self, indice)
+
+    def agregar(
+        self,
+        titulo: str,
+        artista: str,
+        album: str,
+        genero: str,
+        ruta_archivo: str,
+        duracion: float = 0,
+        img_portada: str = "default.jpg",
+    ):
+        """Agrega una fila al catálogo y devuelve su vista (misma firma que Cancion)."""
+        self.__titulos.append(titulo)
+        self.__rutas.append(sys.intern(ruta_archivo))
+        self.__duraciones.append(duracion)
+        self.__artistas.append(self.__dic_artistas.codificar(artista))
+        self.__albumes.append(self.__dic_albumes.codificar(album))
+        self.__generos.append(self.__dic_generos.codificar(genero))
+        self.__portadas.append(self.__dic_portadas.codificar(img_portada))
+        return CancionVista(self, len(self.__titulos) - 1)
+
+    def agregar_cancion(self, cancion: Cancion):
+        """Convierte un objeto Cancion tradicional en una fila del catálogo."""
+        return self.agregar(
+            cancion.titulo,
+            cancion.artista,
+            cancion.album,
+            cancion.genero,
+            cancion.ruta_archivo,
+            cancion.duracion,
+            cancion.img_portada,
+        )
+
+    # --- Acceso por columna (lo usan las vistas) ---
+    def titulo(self, i):
+        return self.__titulos[i]
+
+    def artista(self, i):
+        return self.__dic_artistas.valores[self.__artistas[i]]
+
+    def album(self, i):
+        return self.__dic_albumes.valores[self.__albumes[i]]
+
+    def genero(self, i):
+        return self.__dic_generos.valores[self.__generos[i]]
+
+    def ruta_archivo(self, i):
+        return self.__rutas[i]
+
+    def duracion(self, i):
+        return self.__duraciones[i]
+
+    def img_portada(self, i):
+        return self.__dic_portadas.valores[self.__portadas[i]]
+
+
+class CancionVista:
+    """
+    Vista ligera (sin __dict__) de una fila de un catálogo por columnas
+    (CatalogoColumnar en RAM o CatalogoBinario sobre mmap).
+    Expone la misma API de propiedades que Cancion y pasa isinstance(x, Cancion),
+    así que Reproductor, Playlist y el buscador la aceptan tal cual.
+    """
+
+    __slots__ = ("_catalogo", "_indice")
+
+    def __init__(self, catalogo: CatalogoColumnar, indice: int):
+        self._catalogo = catalogo
+        self._indice = indice
+
+    @property
+    def indice(self):
+        return self._indice
+
+    @property
+    def titulo(self):
+        return self._catalogo.titulo(self._indice)
+
+    @property
+    def artista(self):
+        return self._catalogo.artista(self._indice)
+
+    @property
+    def album(self):
+        return self._catalogo.album(self._indice)
+
+    @property
+    def genero(self):
+        return self._catalogo.genero(self._indice)
+
+    @property
+    def ruta_archivo(self):
+        return self._catalogo.ruta_archivo(self._indice)
+
+    @property
+    def duracion(self):
+        return self._catalogo.duracion(self._indice)
+
+    @property
+    def img_portada(self):
+        return self._catalogo.img_portada(self._indice)
+
+    # Dos vistas de la misma fila son "la misma canción"
+    def __eq__(self, otra):
+        if not isinstance(otra, CancionVista):
+            return NotImplemented
+        return self._catalogo is otra._catalogo and self._indice == otra._indice
+
+    def __hash__(self):
+        return hash((id(self._catalogo), self._indice))
+
+    def __str__(self):
+        return f"{self.titulo}"
+
+    def __repr__(self):
+        return f"{self.titulo}"
+
+    def reproducir(self, silencioso=False):
+        """Igual que Cancion.reproducir(): devuelve la ruta para el motor de audio."""
+        if not silencioso:
+            print(f"   🎵 Preparando sencillo: '{self.titulo}' de {self.artista}...")
+        return self.ruta_archivo
+
+    def mostrar_detalle(self):
+        print(f"--- Info: {self.titulo} ({self.duracion} seg) ---")
+
+
+# Subclase "virtual": isinstance(vista, Cancion) es True sin heredar el __dict__
+Cancion.register(CancionVista)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import gc
+    import tracemalloc
+
+    N = 1_000_000
+    generos = ["Rock", "Pop", "Jazz", "Latino", "Metal"]
+
+    def fila(i):
+        return (
+            f"Tema {i}",
+            f"Artista {i % 5000}",
+            f"Disco {i % 20000}",
+            generos[i % 5],
+            f"assets/musica/{i % 20000}/{i}.mp3",
+            180.0 + i % 120,
+        )
+
+    # 1. Modelo clásico: un objeto Cancion por pista
+    gc.collect()
+    tracemalloc.start()
+    lista = [Cancion(*fila(i)) for i in range(N)]
+    objetos, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lista
+    gc.collect()
+
+    # 2. Modelo columnar
+    tracemalloc.start()
+    catalogo = CatalogoColumnar()
+    for i in range(N):
+        catalogo.agregar(*fila(i))
+    columnas, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"--- Memoria con {N:,} pistas ---")
+    print(f"Objeto por canción: {objetos / 2**20:8.1f} MiB ({objetos / N:.0f} B/pista)")
+    print(f"Catálogo columnar:  {columnas / 2**20:8.1f} MiB ({columnas / N:.0f} B/pista)")
+
+    vista = catalogo[42]
+    print(f"\nVista #42: {vista} - {vista.artista} | ¿Es Cancion? {isinstance(vista, Cancion)}")
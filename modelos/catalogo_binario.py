@@ -0,0 +1,211 @@
+import sys
+import os
+import mmap
+import struct
+from array import array
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.catalogo import CancionVista
+from utils.excepciones import CancionNoEncontradaError, FormatoCatalogoInvalidoError
+
+# --- FORMATO DEL ARCHIVO (.ntfy) ---
+# [Cabecera fija]
+#   magic(4s) version(H) reservado(H) n_registros(I) n_cadenas(I)
+#   offset_indice_cadenas(Q) offset_cadenas(Q) offset_registros(Q)
+# [Índice de cadenas]  (n_cadenas + 1) uint32: inicio de cada cadena dentro del bloque
+# [Bloque de cadenas]  todas las cadenas únicas en UTF-8, una detrás de otra
+# [Registros]          n_registros de tamaño fijo: ids de cadena + duración
+MAGIC = b"NTFY"
+VERSION = 1
+CABECERA = struct.Struct("<4sHHIIQQQ")
+REGISTRO = struct.Struct("<IIIIIId")  # titulo, artista, album, genero, ruta, portada, duracion
+CAMPOS = ("titulo", "artista", "album", "genero", "ruta_archivo", "img_portada")
+
+
+def escribir_catalogo(ruta, canciones):
+    """
+    Serializa cualquier iterable de canciones (Cancion, CancionVista...) al formato binario.
+    Las cadenas repetidas (artistas, géneros, portadas) se guardan una sola vez.
+    Devuelve el número de registros escritos.
+    """
+    ids = {}  # cadena -> id
+    bloque = bytearray()
+    inicios = array("I")
+    registros = bytearray()
+
+    def id_de(texto):
+        id_cadena = ids.get(texto)
+        if id_cadena is None:
+            id_cadena = ids[texto] = len(inicios)
+            inicios.append(len(bloque))
+            bloque.extend(texto.encode("utf-8"))
+        return id_cadena
+
+    total = 0
+    for cancion in canciones:
+        registros += REGISTRO.pack(
+            *(id_de(getattr(cancion, campo)) for campo in CAMPOS),
+            float(cancion.duracion),
+        )
+        total += 1
+    inicios.append(len(bloque))  # Centinela: fin de la última cadena
+
+    if sys.byteorder != "little":
+        inicios.byteswap()
+
+    offset_indice = CABECERA.size
+    offset_cadenas = offset_indice + len(inicios) * inicios.itemsize
+    offset_registros = offset_cadenas + len(bloque)
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(
+            CABECERA.pack(
+                MAGIC, VERSION, 0, total, len(ids),
+                offset_indice, offset_cadenas, offset_registros,
+            )
+        )
+        archivo.write(inicios.tobytes())
+        archivo.write(bloque)
+        archivo.write(registros)
+    return total
+
+
+class CatalogoBinario:
+    """
+    Lector del catálogo binario mediante mmap.
+    Abrirlo solo lee la cabecera: cada registro y cada cadena se decodifica
+    al pedirlo (acceso aleatorio O(1) por índice). Entrega CancionVista,
+    igual que CatalogoColumnar, así que el resto del sistema no nota la diferencia.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.__archivo = open(ruta, "rb")
+        try:
+            self.__mapa = mmap.mmap(self.__archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            self.__archivo.close()
+            raise FormatoCatalogoInvalidoError(f"'{ruta}' está vacío")
+
+        if len(self.__mapa) < CABECERA.size:
+            self.cerrar()
+            raise FormatoCatalogoInvalidoError(f"'{ruta}' es demasiado corto")
+
+        (magic, version, _, self.__total, self.__n_cadenas,
+         self.__off_indice, self.__off_cadenas, self.__off_registros) = CABECERA.unpack_from(self.__mapa, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.cerrar()
+            raise FormatoCatalogoInvalidoError(
+                f"'{ruta}' no es un catálogo Spotipy v{VERSION} (magic={magic!r}, v{version})"
+            )
+
+        fin_esperado = self.__off_registros + self.__total * REGISTRO.size
+        if len(self.__mapa) < fin_esperado:
+            self.cerrar()
+            raise FormatoCatalogoInvalidoError(f"'{ruta}' está truncado")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self.__mapa.close()
+        self.__archivo.close()
+
+    def __len__(self):
+        return self.__total
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self.__total
+        if not 0 <= indice < self.__total:
+            raise CancionNoEncontradaError(f"No existe la pista #{indice} en el catálogo")
+        return CancionVista(self, indice)
+
+    def __iter__(self):
+        for indice in range(self.__total):
+            yield CancionVista(self, indice)
+
+    # --- Lectura perezosa ---
+    def _cadena(self, id_cadena):
+        inicio, fin = struct.unpack_from("<II", self.__mapa, self.__off_indice + 4 * id_cadena)
+        base = self.__off_cadenas
+        return self.__mapa[base + inicio : base + fin].decode("utf-8")
+
+    def _campo(self, i, posicion):
+        valor = struct.unpack_from(
+            "<I", self.__mapa, self.__off_registros + i * REGISTRO.size + 4 * posicion
+        )[0]
+        return self._cadena(valor)
+
+    # --- Acceso por columna (misma interfaz que CatalogoColumnar, lo usan las vistas) ---
+    def titulo(self, i):
+        return self._campo(i, 0)
+
+    def artista(self, i):
+        return self._campo(i, 1)
+
+    def album(self, i):
+        return self._campo(i, 2)
+
+    def genero(self, i):
+        return self._campo(i, 3)
+
+    def ruta_archivo(self, i):
+        return self._campo(i, 4)
+
+    def img_portada(self, i):
+        return self._campo(i, 5)
+
+    def duracion(self, i):
+        return struct.unpack_from("<d", self.__mapa, self.__off_registros + i * REGISTRO.size + 24)[0]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+    from modelos.catalogo import CatalogoColumnar
+
+    N = 1_000_000
+    generos = ["Rock", "Pop", "Jazz", "Latino", "Metal"]
+
+    def filas():
+        for i in range(N):
+            yield (f"Tema {i}", f"Artista {i % 5000}", f"Disco {i % 20000}",
+                   generos[i % 5], f"assets/musica/{i}.mp3", 180.0 + i % 120)
+
+    # 1. Arranque "en frío" actual: reconstruir el catálogo en RAM
+    inicio = time.perf_counter()
+    en_ram = CatalogoColumnar()
+    for fila in filas():
+        en_ram.agregar(*fila)
+    t_ram = time.perf_counter() - inicio
+
+    ruta = os.path.join(tempfile.mkdtemp(), "catalogo.ntfy")
+    inicio = time.perf_counter()
+    escribir_catalogo(ruta, en_ram)
+    print(f"Escritura de {N:,} pistas: {time.perf_counter() - inicio:.2f} s "
+          f"({os.path.getsize(ruta) / 2**20:.1f} MiB)")
+
+    # 2. Arranque con mmap: abrir + leer una pista al azar
+    inicio = time.perf_counter()
+    catalogo = CatalogoBinario(ruta)
+    pista = catalogo[random.randrange(N)]
+    _ = (pista.titulo, pista.artista, pista.duracion)
+    t_mmap = time.perf_counter() - inicio
+
+    print(f"Arranque reconstruyendo en RAM: {t_ram * 1000:10.1f} ms")
+    print(f"Arranque con mmap:              {t_mmap * 1000:10.3f} ms")
+
+    assert catalogo[N - 1].titulo == en_ram[N - 1].titulo
+    print(f"Última pista: {catalogo[-1]} - {catalogo[-1].artista} ({catalogo[-1].duracion} seg)")
+    catalogo.cerrar()
+    os.remove(ruta)
@@ -8,7 +8,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # ---------------------------------------
 
 from abc import ABC, abstractmethod
-from utils.excepciones import ListaVaciaError
+from utils.excepciones import ListaVaciaError, CancionNoEncontradaError
+from utils.lista_indexada import ListaIndexada, VistaSoloLectura
+from utils import metricas
+
+_OPERACIONES_PLAYLIST = metricas.histograma(
+    "spotipy_playlist_operacion_segundos", "Duración de los mutadores de Playlist"
+)
+_ERRORES_PLAYLIST = metricas.contador(
+    "spotipy_playlist_errores_total", "Errores en los mutadores de Playlist"
+)
 
 
 class RecursoMultimedia(ABC):
@@ -39,10 +48,11 @@ class RecursoMultimedia(ABC):
         return self._imagen_portada
 
     @abstractmethod
-    def reproducir(self):
+    def reproducir(self, silencioso=False):
         """
         Método abstracto (+).
         Obliga a todas las clases hijas a definir SU propia forma de reproducirse.
+        'silencioso' omite el aviso por consola (reproductores headless).
         """
         pass
 
@@ -100,12 +110,13 @@ class Cancion(RecursoMultimedia):
         return self.__ruta_archivo
 
     # Poliformismos para metodo reproducir.
-    def reproducir(self):
+    def reproducir(self, silencioso=False):
         """
         Implementación concreta del método abstracto.
         Devuelve la ruta del archivo para que el motor de audio la use.
         """
-        print(f"   🎵 Preparando sencillo: '{self.titulo}' de {self.__artista}...")
+        if not silencioso:
+            print(f"   🎵 Preparando sencillo: '{self.titulo}' de {self.__artista}...")
         return self.__ruta_archivo
 
 
@@ -119,31 +130,81 @@ class Playlist(RecursoMultimedia):
         super().__init__(titulo, img_portada, duracion=0)
         # Atributos privados (-) propios de Playlist
         self.__descripcion = descripcion
-        self.__canciones = [] # Lista Vacia.
+        # Lista por bloques: insertar/eliminar/mover en O(log n) aunque tenga miles de pistas
+        self.__canciones = ListaIndexada()
+        # Sube con cada alta/baja: quien derive algo del contenido (ej. el recomendador)
+        # sabe si tiene que recalcularlo sin comparar las canciones
+        self.__version = 0
 
     # Getter de los atributos encapsulados.
     @property
     def descripcion(self):
         return self.__descripcion
 
+    @property
+    def version(self):
+        return self.__version
+
     @property
     def canciones(self):
-        return self.__canciones
+        # Vista de solo lectura: no copia, y nadie puede desincronizar la duración
+        return VistaSoloLectura(self.__canciones)
 
-    def agregar_cancion(self, cancion: Cancion):
+    @metricas.cronometrar(_OPERACIONES_PLAYLIST, _ERRORES_PLAYLIST, op="agregar")
+    def agregar_cancion(self, cancion: Cancion, posicion=None):
+        """Agrega al final, o antes de 'posicion' si se indica."""
         if isinstance(cancion, Cancion):
-            self.__canciones.append(cancion)
+            if posicion is None:
+                posicion = len(self.__canciones)
+            self.__canciones.insertar(posicion, cancion)
             self._duracion += cancion.duracion
+            self.__version += 1
             print(f"[+] {cancion.titulo} agregada a {self.titulo}")
 
+    @metricas.cronometrar(_OPERACIONES_PLAYLIST, _ERRORES_PLAYLIST, op="eliminar")
     def eliminar_cancion(self, cancion: Cancion):
+        """Elimina la primera aparición de la canción (si está)."""
         if cancion in self.__canciones:
-            self.__canciones.remove(cancion)
-            self._duracion -= cancion.duracion
-            print(f"[-] {cancion.titulo} eliminada de {self.titulo}")
+            self._eliminar_posicion(self.__canciones.indice(cancion))
+
+    @metricas.cronometrar(_OPERACIONES_PLAYLIST, _ERRORES_PLAYLIST, op="eliminar_en")
+    def eliminar_en(self, posicion):
+        """Elimina la pista de una posición concreta (útil con canciones repetidas)."""
+        return self._eliminar_posicion(posicion)
+
+    def _eliminar_posicion(self, posicion):
+        try:
+            cancion = self.__canciones.quitar(posicion)
+        except IndexError:
+            raise CancionNoEncontradaError(
+                f"La playlist '{self.titulo}' no tiene la posición {posicion}"
+            )
+        self._duracion -= cancion.duracion
+        self.__version += 1
+        print(f"[-] {cancion.titulo} eliminada de {self.titulo}")
+        return cancion
+
+    @metricas.cronometrar(_OPERACIONES_PLAYLIST, _ERRORES_PLAYLIST, op="mover")
+    def mover_cancion(self, origen, destino):
+        """Reordena: la pista de 'origen' pasa a ocupar 'destino'."""
+        try:
+            self.__canciones.mover(origen, destino)
+        except IndexError:
+            raise CancionNoEncontradaError(
+                f"Posiciones inválidas ({origen} -> {destino}) en '{self.titulo}'"
+            )
+
+    def posicion_de(self, cancion: Cancion):
+        """Posición (desde 0) de la primera aparición de la canción."""
+        try:
+            return self.__canciones.indice(cancion)
+        except ValueError:
+            raise CancionNoEncontradaError(
+                f"'{cancion.titulo}' no está en la playlist '{self.titulo}'"
+            )
 
     # Poliformismos para metodo reproducir.
-    def reproducir(self):
+    def reproducir(self, silencioso=False):
         """
         Versión de reproducir de Playlist.
         No retorna una ruta, sino la LISTA COMPLETA de objetos cancion, para que el REPRODUCTOR sepa que debe encolarlas todas.
@@ -151,11 +212,15 @@ class Playlist(RecursoMultimedia):
         if not self.__canciones:
             raise ListaVaciaError(f"La playlist '{self.titulo}' no tiene canciones.")
 
-        print(
-            f"   📂 Cargando Playlist: {self.titulo} ({len(self.__canciones)} pistas)"
-        )
-        # Retornamos la lista completa para que el controlador la gestione
-        return self.__canciones
+        if not silencioso:
+            print(
+                f"   📂 Cargando Playlist: {self.titulo} ({len(self.__canciones)} pistas)"
+            )
+        return self.instantanea()
+
+    def instantanea(self):
+        """Las canciones de ahora, sin copiarlas: si luego se edita la playlist, esto no cambia."""
+        return VistaSoloLectura(self.__canciones.instantanea())
 
 
 class Album(RecursoMultimedia):
@@ -168,14 +233,14 @@ class Album(RecursoMultimedia):
         super().__init__(titulo,img_portada,duracion_total)
         self.__artista = artista
         self.__año = año
-        self.__canciones = canciones
+        self.__canciones = tuple(canciones)  # Inmutable: el reproductor lo usa tal cual
 
     @property
     def artista(self):
         return self.__artista
 
     # Poliformismos para metodo reproducir.
-    def reproducir(self):
+    def reproducir(self, silencioso=False):
         """
         Versión de reproducir de Album.
         Basicamente hace lo mismo que la de Playlist, manda la lista de canciones al reproductor.
@@ -183,7 +248,8 @@ class Album(RecursoMultimedia):
         if not self.__canciones:
             raise ListaVaciaError(f"El Álbum '{self.titulo}' esta vacío (Error de datos).")
         
-        print(f"   💿 Poniendo el vinilo: {self.titulo} - {self.__artista} ({self.__año})")
+        if not silencioso:
+            print(f"   💿 Poniendo el vinilo: {self.titulo} - {self.__artista} ({self.__año})")
         return self.__canciones
 
 # --- ZONA DE PRUEBAS (Al final del archivo) ---
@@ -207,6 +273,11 @@ if __name__ == "__main__":
         mi_playlist.agregar_cancion(c2)
         print(f"\nProbando Playlist: {mi_playlist.titulo}")
         mi_playlist.reproducir()
+
+        # 5. Reordenamos y buscamos posiciones
+        mi_playlist.agregar_cancion(c1, posicion=0)
+        mi_playlist.mover_cancion(0, 1)
+        print(f"Orden tras mover: {list(mi_playlist.canciones)} | '{c1}' en posición {mi_playlist.posicion_de(c1)}")
         
     except Exception as e:
         print(f"Error durante la prueba: {e}")
@@ -7,7 +7,21 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from abc import ABC, abstractmethod
 from modelos.multimedia import Playlist, Cancion
-from utils.excepciones import ContrasenaIncorrectaError, PermisoDenegadoError
+from utils.excepciones import (
+    ContrasenaIncorrectaError,
+    PermisoDenegadoError,
+    CancionNoEncontradaError,
+)
+from utils.seguridad import generar_hash, verificar_hash, necesita_rehash
+from utils.mapa_bits import MapaBits
+from utils import metricas
+
+_LATENCIA_LOGIN = metricas.histograma(
+    "spotipy_verificar_contrasena_segundos", "Duración de Usuario.verificar_contrasena"
+)
+_FALLOS_LOGIN = metricas.contador(
+    "spotipy_login_fallos_total", "Logins rechazados por tipo de excepción"
+)
 
 
 class Usuario(ABC):
@@ -19,8 +33,11 @@ class Usuario(ABC):
     def __init__(self, nombre, correo, contraseña):
         self._nombre = nombre
         self._correo = correo
-        self.__contraseña = contraseña  # Privado: Nadie debe verla
-        self.bloqueado = False
+        # Privado: solo guardamos el hash salado (scrypt), nunca el texto plano
+        self.__hash_contraseña = generar_hash(contraseña)
+        self._bloqueado = False
+        # Callback opcional (lo asigna el UsuarioRepositorio para sus índices)
+        self.al_cambiar_bloqueo = None
 
     @property
     def nombre(self):
@@ -30,15 +47,32 @@ class Usuario(ABC):
     def correo(self):
         return self._correo
 
+    @property
+    def bloqueado(self):
+        return self._bloqueado
+
+    @bloqueado.setter
+    def bloqueado(self, valor):
+        self._bloqueado = bool(valor)
+        if self.al_cambiar_bloqueo is not None:
+            self.al_cambiar_bloqueo(self)
+
+    @metricas.cronometrar(_LATENCIA_LOGIN, errores=_FALLOS_LOGIN)
     def verificar_contrasena(self, intento):
-        """Valida login y ESTADO de la cuenta."""
+        """
+        Valida login y ESTADO de la cuenta.
+        Es costoso a propósito (scrypt): para no bloquear, usar ServicioAutenticacion.
+        """
         if self.bloqueado:
             # Si está bloqueado, lanzamos error INMEDIATAMENTE
             raise PermisoDenegadoError(
                 f"🚫 Tu cuenta ({self._correo}) ha sido SUSPENDIDA por un Administrador."
             )
 
-        if intento == self.__contraseña:
+        if verificar_hash(intento, self.__hash_contraseña):
+            # Si los parámetros del KDF cambiaron, aprovechamos para actualizar el hash
+            if necesita_rehash(self.__hash_contraseña):
+                self.__hash_contraseña = generar_hash(intento)
             return True
         else:
             raise ContrasenaIncorrectaError(f"Contraseña inválida para {self._correo}")
@@ -57,6 +91,27 @@ class Cliente(Usuario):
     def __init__(self, nombre, correo, contraseña):
         super().__init__(nombre, correo, contraseña)
         self.mis_playlists = []  # Lista de objetos Playlist
+        self.me_gusta = MapaBits()  # Índices de catálogo de las canciones que le gustan
+
+    @staticmethod
+    def _id_catalogo(cancion):
+        # Solo las canciones del catálogo (CancionVista) tienen un índice estable
+        indice = getattr(cancion, "indice", None)
+        if indice is None:
+            raise CancionNoEncontradaError(f"'{cancion.titulo}' no pertenece al catálogo")
+        return indice
+
+    def alternar_me_gusta(self, cancion):
+        """Marca o desmarca la canción como "Me Gusta". Devuelve el estado final."""
+        if self.me_gusta.alternar(self._id_catalogo(cancion)):
+            print(f"💚 '{cancion.titulo}' agregada a tus Me Gusta.")
+            return True
+        print(f"🤍 '{cancion.titulo}' quitada de tus Me Gusta.")
+        return False
+
+    def le_gusta(self, cancion):
+        indice = getattr(cancion, "indice", None)
+        return indice is not None and indice in self.me_gusta
 
     def crear_playlist(self, titulo, descripcion):
         """Crea una nueva playlist y la guarda en su perfil."""
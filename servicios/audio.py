@@ -0,0 +1,686 @@
+import sys
+import os
+import io
+import math
+import time
+import wave
+import threading
+import functools
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from utils.excepciones import MotorAudioNoDisponibleError, OpcionInvalidaError
+from utils.anillo import AnilloBytes
+from utils import metricas
+
+_INICIO_MOTOR = metricas.histograma(
+    "spotipy_inicio_motor_audio_segundos", "Tiempo de importar e iniciar el motor de audio"
+)
+_PCM_DECODIFICADOS = metricas.contador(
+    "spotipy_pcm_bytes_decodificados_total", "Bytes PCM producidos por el motor pcm"
+)
+_PCM_SUBCORRIDAS = metricas.contador(
+    "spotipy_pcm_subcorridas_total", "Periodos en que el dispositivo pcm no tuvo datos a tiempo"
+)
+_PCM_MEZCLA = metricas.histograma(
+    "spotipy_pcm_mezcla_segundos", "Costo de aplicar el volumen a un periodo de audio"
+)
+
+MOTORES = {}  # nombre -> clase de MotorAudio
+VARIABLE_MOTOR = "SPOTIPY_AUDIO"  # auto | pygame | nulo | archivo | pcm
+VARIABLE_SALIDA = "SPOTIPY_AUDIO_SALIDA"  # Destino del motor "archivo"
+VARIABLE_VELOCIDAD = "SPOTIPY_AUDIO_VELOCIDAD"  # Motor "pcm": 1 = tiempo real, 0 = sin límite
+VARIABLE_EVENTOS = "SPOTIPY_AUDIO_EVENTOS"  # Motor "pygame": 1 = publicar el endevent (levanta video)
+
+
+def registrar_motor(nombre):
+    def registrar(clase):
+        clase.nombre = nombre
+        MOTORES[nombre] = clase
+        return clase
+
+    return registrar
+
+
+class MotorAudio:
+    """
+    Interfaz de los motores de audio que usa el Reproductor.
+    Construir un motor es gratis; lo costoso (importar librerías, abrir el
+    dispositivo) va en iniciar(), que el Reproductor llama recién en la
+    primera reproducción.
+    """
+
+    nombre = None
+    simulado = False  # True: no suena nada y el reproductor lo avisa como simulación
+
+    def iniciar(self, volumen):
+        """Abre el dispositivo. Lanza MotorAudioNoDisponibleError si no se puede."""
+
+    def cargar(self, ruta, datos=None):
+        """Prepara una pista: desde 'datos' (bytes ya precargados) o leyendo 'ruta'."""
+
+    def reproducir(self):
+        pass
+
+    def pausar(self):
+        pass
+
+    def reanudar(self):
+        pass
+
+    def detener(self):
+        pass
+
+    def cambiar_volumen(self, nivel):
+        pass
+
+    def buscar(self, segundos, desplazamiento=None):
+        """
+        Salta a 'segundos' de la pista cargada sin volver a cargarla y la deja sonando.
+        'desplazamiento' es el byte del frame donde empieza ese segundo, si el
+        escáner lo indexó. Devuelve False si no puede (p. ej. la pista ya terminó).
+        """
+        return False
+
+    def posicion(self):
+        """Segundos reproducidos según el dispositivo, o None si no lo sabe (se usa el reloj)."""
+        return None
+
+    def fines_pendientes(self):
+        """Cuántos avisos de 'pista terminada' publicó el dispositivo desde la última consulta."""
+        return 0
+
+    def cerrar(self):
+        """Libera el dispositivo (hilos, archivos)."""
+
+
+@registrar_motor("nulo")
+class MotorNulo(MotorAudio):
+    """Sin audio: todo se simula con el reloj. Para servidores sin tarjeta de sonido y sesiones."""
+
+    simulado = True
+
+    def buscar(self, segundos, desplazamiento=None):
+        return True  # La posición la lleva el reloj del reproductor
+
+
+@registrar_motor("pygame")
+class MotorPygame(MotorAudio):
+    """
+    pygame.mixer.music (pygame-ce). pygame se importa recién al iniciar.
+    El fin de pista lo detecta el reloj del reproductor; el endevent de pygame
+    solo se pide con eventos=True (o SPOTIPY_AUDIO_EVENTOS=1), porque su cola
+    vive en el subsistema de video y eso no tiene sentido en una consola.
+    """
+
+    def __init__(self, eventos=None):
+        if eventos is None:
+            eventos = os.environ.get(VARIABLE_EVENTOS, "0").lower() in ("1", "si", "true")
+        self.eventos = eventos
+        self.__pygame = None
+        self.__evento_fin = None
+        self.__pista = (None, None)  # (ruta, datos) cargados, para buscar()
+        self.__recortada = False  # Lo cargado es la pista desde un frame del medio (buscar con índice)
+        self.__base = 0.0  # Segundo de la pista en el que arrancó el último play()
+        self.__sonando = False  # Sin endevent: le dimos play y no se pausó ni detuvo
+
+    def iniciar(self, volumen):
+        try:
+            import pygame
+        except ImportError:
+            raise MotorAudioNoDisponibleError("'pygame-ce' no está instalado")
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            raise MotorAudioNoDisponibleError(f"No se pudo abrir el dispositivo de audio: {e}")
+        self.__pygame = pygame
+        pygame.mixer.music.set_volume(volumen)
+        if not self.eventos:
+            return
+        # Evento que pygame publica al terminar una pista (para hosts con bucle de eventos).
+        # La cola de eventos vive en el subsistema de video: sin él no hay avisos de fin.
+        try:
+            pygame.display.init()
+        except pygame.error:
+            return
+        self.__evento_fin = pygame.USEREVENT + 1
+        pygame.mixer.music.set_endevent(self.__evento_fin)
+
+    def cargar(self, ruta, datos=None):
+        musica = self.__pygame.mixer.music
+        if datos is not None:
+            # Ya está en RAM: cargar no toca el disco
+            musica.load(io.BytesIO(datos), os.path.splitext(ruta)[1].lstrip("."))
+        else:
+            musica.load(ruta)
+        self.__pista = (ruta, datos)
+        self.__recortada = False
+        self.__base = 0.0
+        self.__sonando = False
+
+    def reproducir(self):
+        self.__pygame.mixer.music.play()
+        self.__sonando = True
+
+    def buscar(self, segundos, desplazamiento=None):
+        musica = self.__pygame.mixer.music
+        ruta, datos = self.__pista
+        if ruta is None:
+            return False
+        if self.__recortada and (segundos <= 0 or desplazamiento is None):
+            # Lo cargado empieza en un frame del medio: rebobinar o contar segundos
+            # desde ahí sería mentira, se vuelve a cargar la pista entera
+            self.cargar(ruta, datos)
+        if segundos <= 0:
+            musica.play()  # Reiniciar: el decodificador rebobina (sin recorte, no se recarga nada)
+        elif desplazamiento is not None:
+            # Cargamos desde el frame exacto: SDL_mixer no tiene que recorrer lo anterior
+            if datos is not None:
+                resto = memoryview(datos)[desplazamiento:]
+            else:
+                with open(ruta, "rb") as archivo:
+                    archivo.seek(desplazamiento)
+                    resto = archivo.read()
+            musica.load(io.BytesIO(resto), os.path.splitext(ruta)[1].lstrip("."))
+            musica.play()
+            self.__recortada = True
+        else:
+            musica.play(start=segundos)  # Sin índice: SDL_mixer avanza frame a frame
+        self.__base = max(segundos, 0.0)
+        self.__sonando = True
+        return True
+
+    def pausar(self):
+        self.__pygame.mixer.music.pause()
+        self.__sonando = False
+
+    def reanudar(self):
+        self.__pygame.mixer.music.unpause()
+        self.__sonando = True
+
+    def detener(self):
+        self.__pygame.mixer.music.stop()
+        self.__sonando = False
+
+    def cambiar_volumen(self, nivel):
+        self.__pygame.mixer.music.set_volume(nivel)
+
+    def posicion(self):
+        musica = self.__pygame.mixer.music
+        if not musica.get_busy():
+            return None
+        return self.__base + musica.get_pos() / 1000  # get_pos: milisegundos desde el play()
+
+    def fines_pendientes(self):
+        if self.__evento_fin is None:
+            # Sin endevent: la pista terminó si dejó de sonar sin que la pausáramos
+            if self.__sonando and not self.__pygame.mixer.music.get_busy():
+                self.__sonando = False
+                return 1
+            return 0
+        try:
+            return len(self.__pygame.event.get(self.__evento_fin))
+        except self.__pygame.error:
+            return 0  # Subsistema de eventos caído: no tumbamos al reproductor
+
+
+@registrar_motor("archivo")
+class MotorArchivo(MotorAudio):
+    """
+    Sumidero a archivo: cada pista que "suena" se escribe entera en 'salida'
+    (por defecto os.devnull). Ejercita la lectura de disco y la precarga igual
+    que un dispositivo real, sin necesitar uno; útil en CI y en servidores.
+    """
+
+    def __init__(self, salida=None):
+        self.salida = salida or os.environ.get(VARIABLE_SALIDA, os.devnull)
+        self.bytes_escritos = 0
+        self.pistas = 0
+        self.__archivo = None
+        self.__datos = None
+        self.__pista = None  # Bytes de la última pista, para buscar()
+
+    def iniciar(self, volumen):
+        try:
+            self.__archivo = open(self.salida, "ab")
+        except OSError as e:
+            raise MotorAudioNoDisponibleError(f"No se pudo abrir '{self.salida}': {e}")
+
+    def cargar(self, ruta, datos=None):
+        if datos is None:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+        self.__datos = self.__pista = datos
+
+    def reproducir(self):
+        if self.__datos is not None:
+            self._escribir(self.__datos)
+            self.pistas += 1
+            self.__datos = None
+
+    def buscar(self, segundos, desplazamiento=None):
+        if self.__pista is None:
+            return False
+        # Sin índice no sabemos el byte: se vuelve a "sonar" desde el principio
+        self._escribir(memoryview(self.__pista)[desplazamiento or 0 :])
+        return True
+
+    def _escribir(self, datos):
+        self.__archivo.write(datos)
+        self.__archivo.flush()
+        self.bytes_escritos += len(datos)
+
+    def cerrar(self):
+        if self.__archivo is not None:
+            self.__archivo.close()
+            self.__archivo = None
+
+
+# --- Motor PCM (sin tarjeta de sonido) ---
+TASA = 44100  # Formato PCM de las fuentes sintéticas: 44.1 kHz, estéreo, 16 bits
+CANALES = 2
+ANCHO = 2
+KBPS_SINTETICO = 128  # Duración supuesta de un archivo no-WAV: sus bytes a 128 kbps
+
+
+@functools.lru_cache(maxsize=1)
+def _tabla_tono():
+    """Un segundo de La 441 Hz estéreo ya en bytes: sintetizar es copiar tramos de acá."""
+    muestras = bytearray()
+    for i in range(TASA):
+        valor = int(8000 * math.sin(2 * math.pi * 441 * i / TASA)).to_bytes(2, "little", signed=True)
+        muestras += valor * CANALES
+    return bytes(muestras)
+
+
+class _FuenteWav:
+    """Decodifica WAV PCM de 16 bits con el módulo wave de la biblioteca estándar."""
+
+    def __init__(self, ruta, datos, segundos=0.0):
+        self.__ruta, self.__datos = ruta, datos
+        self.__wav = wave.open(io.BytesIO(datos) if datos is not None else ruta, "rb")
+        if self.__wav.getsampwidth() != ANCHO:
+            raise ValueError("Solo WAV de 16 bits")
+        self.tasa = self.__wav.getframerate()
+        self.bytes_por_frame = self.__wav.getnchannels() * ANCHO
+        if segundos > 0:
+            # WAV es PCM sin comprimir: saltar es un seek, no hace falta índice
+            self.__wav.setpos(min(int(segundos * self.tasa), self.__wav.getnframes()))
+
+    def desde(self, segundos):
+        """Otra fuente sobre la misma pista, arrancando en 'segundos'."""
+        return _FuenteWav(self.__ruta, self.__datos, segundos)
+
+    def llenar(self, vista):
+        datos = self.__wav.readframes(len(vista) // self.bytes_por_frame)
+        vista[: len(datos)] = datos
+        return len(datos)
+
+
+class _FuenteSintetica:
+    """
+    Sin decodificador MP3 en la biblioteca estándar: se sintetiza un tono con la
+    duración que tendría el archivo a KBPS_SINTETICO. El costo por byte es el de
+    copiar a memoria, así que mide el resto de la tubería (anillo, mezcla, ritmo).
+    """
+
+    tasa = TASA
+    bytes_por_frame = CANALES * ANCHO
+
+    def __init__(self, tamano_archivo, segundos=0.0):
+        self.__tamano = tamano_archivo
+        total = int(tamano_archivo * 8 / (KBPS_SINTETICO * 1000) * TASA)
+        saltados = min(max(int(segundos * TASA), 0), total)
+        self.__restantes = (total - saltados) * self.bytes_por_frame
+        self.__posicion = saltados * self.bytes_por_frame
+
+    def desde(self, segundos):
+        return _FuenteSintetica(self.__tamano, segundos)
+
+    def llenar(self, vista):
+        tabla = _tabla_tono()
+        escritos, total = 0, min(len(vista), self.__restantes)
+        while escritos < total:
+            desde = self.__posicion % len(tabla)
+            n = min(total - escritos, len(tabla) - desde)
+            vista[escritos : escritos + n] = tabla[desde : desde + n]
+            escritos += n
+            self.__posicion += n
+        self.__restantes -= escritos
+        return escritos
+
+
+def _mezclar_python(vista, ganancia):
+    muestras = vista.cast("h")
+    for i in range(len(muestras)):
+        muestras[i] = int(muestras[i] * ganancia)
+
+
+@registrar_motor("pcm")
+class MotorPCM(MotorAudio):
+    """
+    Dispositivo de audio de mentira que sí produce PCM, para medir en máquinas
+    sin tarjeta de sonido (CI, servidores):
+    - un hilo decodificador llena un AnilloBytes con frames (WAV real o tono sintético),
+    - un hilo "dispositivo" lo consume por periodos al ritmo de 'velocidad' veces el
+      tiempo real (0 = tan rápido como se pueda), aplicando el volumen en el lugar
+      sobre las memoryview del anillo (sin copias).
+    Cuenta bytes decodificados y su costo, subcorridas (el dispositivo pidió un
+    periodo y no había datos) y el costo de la mezcla. Ver estadisticas().
+    """
+
+    def __init__(self, velocidad=None, buffer_segundos=0.5, periodo_frames=1024, bloque_bytes=16384):
+        if velocidad is None:
+            velocidad = float(os.environ.get(VARIABLE_VELOCIDAD, 1.0))
+        self.velocidad = velocidad
+        self.buffer_segundos = buffer_segundos
+        self.periodo_frames = periodo_frames
+        self.bloque_bytes = bloque_bytes
+        self.__condicion = threading.Condition()
+        self.__activo = False
+        self.__generacion = 0  # Cambia en cada cargar/detener: descarta trabajo viejo
+        self.__preparada = None
+        self.__fuente = None
+        self.__formato = (TASA, CANALES * ANCHO)
+        self.__decodificada = False  # La fuente actual ya no tiene más datos
+        self.__sonando = False
+        self.__ganancia = 1.0
+        self.__frames_consumidos = 0
+        self.__fines = 0
+        self.__mezclar = _mezclar_python
+        self.__stats = dict.fromkeys(
+            ("bytes_decodificados", "segundos_audio_decodificados", "segundos_decodificando",
+             "segundos_audio_consumidos", "segundos_mezclando", "periodos", "subcorridas"), 0
+        )
+
+    def iniciar(self, volumen):
+        try:
+            import numpy as np
+
+            def mezclar_numpy(vista, ganancia):
+                muestras = np.frombuffer(vista, dtype=np.int16)  # Misma memoria que el anillo
+                np.multiply(muestras, ganancia, out=muestras, casting="unsafe")
+
+            self.__mezclar = mezclar_numpy
+        except ImportError:
+            pass  # Sin NumPy la mezcla es un bucle en Python (se nota en segundos_mezclando)
+        self.__ganancia = volumen
+        # Al menos dos periodos; el decodificador escribe de a medio anillo como mucho
+        capacidad = max(int(self.buffer_segundos * TASA), 2 * self.periodo_frames) * CANALES * ANCHO
+        self.__anillo = AnilloBytes(capacidad)
+        self.__bloque = min(self.bloque_bytes, capacidad // 2)
+        self.__activo = True
+        for nombre, destino in (("decodificador", self._decodificar), ("dispositivo", self._consumir)):
+            threading.Thread(target=destino, name=f"spotipy-pcm-{nombre}", daemon=True).start()
+
+    # --- Control (hilo del reproductor) ---
+    def cargar(self, ruta, datos=None):
+        if datos is None:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+        try:
+            fuente = _FuenteWav(ruta, datos)
+        except (wave.Error, EOFError, ValueError):
+            fuente = _FuenteSintetica(len(datos))
+        with self.__condicion:
+            self._cortar()
+            self.__preparada = fuente
+
+    def reproducir(self):
+        with self.__condicion:
+            if self.__preparada is None:
+                return
+            self.__fuente, self.__preparada = self.__preparada, None
+            self.__formato = (self.__fuente.tasa, self.__fuente.bytes_por_frame)
+            self.__frames_consumidos = 0
+            self.__sonando = True
+            self.__condicion.notify_all()
+
+    def pausar(self):
+        with self.__condicion:
+            self.__sonando = False
+
+    def reanudar(self):
+        with self.__condicion:
+            if self.__fuente is not None or len(self.__anillo):
+                self.__sonando = True
+                self.__condicion.notify_all()
+
+    def detener(self):
+        with self.__condicion:
+            self._cortar()
+
+    def _cortar(self):
+        self.__generacion += 1
+        self.__anillo.vaciar()
+        self.__fuente = None
+        self.__decodificada = False
+        self.__sonando = False
+        self.__fines = 0  # Los avisos de la pista cortada ya no son de nadie
+        self.__condicion.notify_all()
+
+    def cambiar_volumen(self, nivel):
+        self.__ganancia = nivel
+
+    def buscar(self, segundos, desplazamiento=None):
+        with self.__condicion:
+            fuente = self.__fuente
+            if fuente is None:
+                return False  # Terminó o se detuvo: el reproductor recarga
+            # Fuente nueva en vez de mover la actual: el decodificador puede estar
+            # llenando con la vieja fuera del candado (su trabajo se descarta por generación)
+            nueva = fuente.desde(segundos)
+            self._cortar()
+            self.__fuente = nueva
+            self.__frames_consumidos = int(segundos * nueva.tasa)
+            self.__sonando = True
+            self.__condicion.notify_all()
+        return True
+
+    def posicion(self):
+        return self.__frames_consumidos / self.__formato[0] if self.__sonando else None
+
+    def fines_pendientes(self):
+        with self.__condicion:
+            fines, self.__fines = self.__fines, 0
+            return fines
+
+    def cerrar(self):
+        with self.__condicion:
+            self.__activo = False
+            self._cortar()
+
+    def estadisticas(self):
+        """Throughput de decodificación (x tiempo real), subcorridas y costo de mezcla."""
+        with self.__condicion:
+            stats = dict(self.__stats)
+        stats["x_tiempo_real_decodificando"] = (
+            stats["segundos_audio_decodificados"] / max(stats["segundos_decodificando"], 1e-9)
+        )
+        stats["mezcla_ms_por_segundo_audio"] = (
+            stats["segundos_mezclando"] * 1000 / max(stats["segundos_audio_consumidos"], 1e-9)
+        )
+        return stats
+
+    # --- Hilos ---
+    def _decodificar(self):
+        while True:
+            with self.__condicion:
+                while self.__activo and (
+                    self.__fuente is None or self.__decodificada
+                    or self.__anillo.libre() < self.__bloque
+                ):
+                    self.__condicion.wait()
+                if not self.__activo:
+                    return
+                fuente, generacion = self.__fuente, self.__generacion
+                vistas = self.__anillo.reservar(self.__bloque)
+
+            # Fuera del candado: el dispositivo sigue leyendo otra zona del anillo
+            inicio = time.perf_counter()
+            escritos, agotada = 0, False
+            for vista in vistas:
+                pedido = len(vista) - len(vista) % fuente.bytes_por_frame  # Solo frames enteros
+                n = fuente.llenar(vista[:pedido])
+                escritos += n
+                if n < pedido:
+                    agotada = True
+                    break
+                if pedido < len(vista):
+                    break
+            segundos = time.perf_counter() - inicio
+
+            with self.__condicion:
+                if generacion != self.__generacion:
+                    continue  # Cambió la pista mientras decodificábamos
+                self.__anillo.confirmar(escritos)
+                self.__decodificada = agotada
+                self.__stats["bytes_decodificados"] += escritos
+                self.__stats["segundos_audio_decodificados"] += escritos / (fuente.tasa * fuente.bytes_por_frame)
+                self.__stats["segundos_decodificando"] += segundos
+                self.__condicion.notify_all()
+            _PCM_DECODIFICADOS.inc(escritos)
+
+    def _consumir(self):
+        limite = None  # Momento en que el dispositivo pide el próximo periodo
+        while True:
+            with self.__condicion:
+                while self.__activo and not self.__sonando:
+                    limite = None
+                    self.__condicion.wait()
+                if not self.__activo:
+                    return
+                tasa, bytes_por_frame = self.__formato
+                periodo = self.periodo_frames * bytes_por_frame
+
+            if self.velocidad > 0:
+                ahora = time.perf_counter()
+                if limite is None or ahora - limite > self.buffer_segundos:
+                    limite = ahora  # Recién arrancamos (o volvimos de una pausa)
+                elif limite > ahora:
+                    time.sleep(limite - ahora)
+                limite += self.periodo_frames / tasa / self.velocidad
+
+            with self.__condicion:
+                if not self.__sonando:
+                    continue
+                if len(self.__anillo) < periodo and not self.__decodificada:
+                    if self.velocidad > 0:
+                        # Un dispositivo real reproduciría silencio: lo contamos
+                        self.__stats["subcorridas"] += 1
+                        _PCM_SUBCORRIDAS.inc()
+                    else:
+                        self.__condicion.wait()  # Sin ritmo: esperamos al decodificador
+                        continue
+                generacion = self.__generacion
+                vistas = self.__anillo.leer(periodo)
+                ganancia = self.__ganancia
+
+            leidos = sum(len(v) for v in vistas)
+            if ganancia != 1.0:
+                inicio = time.perf_counter()
+                for vista in vistas:
+                    self.__mezclar(vista, ganancia)
+                segundos = time.perf_counter() - inicio
+                _PCM_MEZCLA.observar(segundos)
+            else:
+                segundos = 0.0
+
+            with self.__condicion:
+                if generacion != self.__generacion:
+                    continue
+                self.__anillo.liberar(leidos)
+                self.__frames_consumidos += leidos // bytes_por_frame
+                self.__stats["segundos_audio_consumidos"] += leidos / (tasa * bytes_por_frame)
+                self.__stats["segundos_mezclando"] += segundos
+                self.__stats["periodos"] += 1
+                if self.__decodificada and not len(self.__anillo):
+                    # Fin de pista: lo publicamos como el endevent de pygame
+                    self.__fuente = None
+                    self.__sonando = False
+                    self.__fines += 1
+                self.__condicion.notify_all()
+
+
+def crear_motor(nombre=None, volumen=0.5):
+    """
+    Construye e inicia el motor 'nombre' (por defecto, el de SPOTIPY_AUDIO).
+    "auto" prueba pygame. Si el motor elegido no se puede iniciar se avisa y se
+    sigue con el nulo (simulación): el programa no se cae por falta de audio.
+    """
+    nombre = validar_motor(nombre)
+    candidato = "pygame" if nombre == "auto" else nombre
+    inicio = time.perf_counter()
+    motor = MOTORES[candidato]()
+    try:
+        motor.iniciar(volumen)
+    except MotorAudioNoDisponibleError as e:
+        print(f"⚠️ ADVERTENCIA: {e.mensaje}. El audio será 100% simulado.")
+        motor = MotorNulo()
+    _INICIO_MOTOR.observar(time.perf_counter() - inicio, motor=motor.nombre)
+    return motor
+
+
+def validar_motor(nombre=None):
+    """Devuelve el nombre normalizado o lanza OpcionInvalidaError (sin iniciar nada)."""
+    nombre = (nombre or os.environ.get(VARIABLE_MOTOR) or "auto").lower()
+    if nombre != "auto" and nombre not in MOTORES:
+        raise OpcionInvalidaError(
+            f"Motor de audio desconocido: '{nombre}'. Opciones: auto, {', '.join(MOTORES)}"
+        )
+    return nombre
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import tempfile
+
+    print(f"Motores registrados: {list(MOTORES)}")
+    motor = crear_motor("auto")
+    print(f"auto -> {motor.nombre} (simulado={motor.simulado})")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        pista = os.path.join(carpeta, "pista.mp3")
+        with open(pista, "wb") as archivo:
+            archivo.write(os.urandom(256 * 1024))
+        sumidero = crear_motor("archivo")
+        for _ in range(3):
+            sumidero.cargar(pista)
+            sumidero.reproducir()
+        print(f"archivo -> {sumidero.pistas} pistas, {sumidero.bytes_escritos:,} bytes a {sumidero.salida}")
+
+        # PCM: un WAV real (30 s) y el MP3 de mentira (256 KiB ≈ 16 s sintéticos)
+        wav = os.path.join(carpeta, "tono.wav")
+        with wave.open(wav, "wb") as salida:
+            salida.setnchannels(CANALES)
+            salida.setsampwidth(ANCHO)
+            salida.setframerate(TASA)
+            salida.writeframes(_tabla_tono() * 30)
+
+        def escuchar(motor, rutas):
+            inicio = time.perf_counter()
+            for ruta in rutas:
+                motor.cargar(ruta)
+                motor.reproducir()
+                while not motor.fines_pendientes():
+                    time.sleep(0.001)
+            return time.perf_counter() - inicio
+
+        for velocidad, buffer_segundos in ((0, 0.5), (20, 0.5), (200, 0.05)):
+            pcm = MotorPCM(velocidad=velocidad, buffer_segundos=buffer_segundos)
+            pcm.iniciar(volumen=0.5)
+            segundos = escuchar(pcm, [wav, pista] * 2)
+            stats = pcm.estadisticas()
+            pcm.cerrar()
+            print(f"pcm x{velocidad or '∞'} (buffer {buffer_segundos * 1000:.0f} ms): "
+                  f"{stats['segundos_audio_consumidos']:.0f} s de audio en {segundos:.2f} s | "
+                  f"decodificación x{stats['x_tiempo_real_decodificando']:,.0f} | "
+                  f"mezcla {stats['mezcla_ms_por_segundo_audio']:.1f} ms/s | "
+                  f"subcorridas {stats['subcorridas']}")
+
+    try:
+        validar_motor("alsa")
+    except OpcionInvalidaError as e:
+        print(f"✅ {e.mensaje}")
@@ -0,0 +1,105 @@
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from servicios.repositorio_usuarios import UsuarioRepositorio
+
+
+class ServicioAutenticacion:
+    """
+    Verifica contraseñas fuera del hilo que llama.
+    scrypt libera el GIL mientras calcula, así que un pool de hilos
+    aprovecha todos los núcleos sin el costo de un pool de procesos.
+    El número de verificaciones en vuelo está acotado (contrapresión).
+    """
+
+    def __init__(self, repositorio: UsuarioRepositorio, hilos=None, max_pendientes=None):
+        self.repositorio = repositorio
+        self.hilos = hilos or os.cpu_count() or 1
+        self.__pool = ThreadPoolExecutor(
+            max_workers=self.hilos, thread_name_prefix="spotipy-auth"
+        )
+        self.__cupos = threading.BoundedSemaphore(max_pendientes or self.hilos * 4)
+
+    def _verificar(self, correo, contraseña):
+        try:
+            usuario = self.repositorio.buscar_por_correo(correo)
+            usuario.verificar_contrasena(contraseña)
+            return usuario
+        finally:
+            self.__cupos.release()
+
+    def autenticar(self, correo, contraseña):
+        """
+        Encola la verificación y devuelve un Future.
+        future.result() entrega el Usuario o relanza el SpotipyError correspondiente
+        (UsuarioNoEncontradoError, ContrasenaIncorrectaError, PermisoDenegadoError).
+        Solo bloquea si ya hay 'max_pendientes' verificaciones en curso.
+        """
+        self.__cupos.acquire()
+        try:
+            return self.__pool.submit(self._verificar, correo, contraseña)
+        except BaseException:
+            self.__cupos.release()
+            raise
+
+    async def autenticar_async(self, correo, contraseña):
+        """Versión para asyncio: await servicio.autenticar_async(correo, clave)."""
+        import asyncio  # Diferido: el login de consola no lo necesita y cuesta ~40 ms importarlo
+
+        return await asyncio.wrap_future(self.autenticar(correo, contraseña))
+
+    def cerrar(self):
+        self.__pool.shutdown(wait=True)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import asyncio
+    import time
+    from modelos.usuario import Cliente
+    from utils import seguridad
+    from utils.excepciones import ContrasenaIncorrectaError
+
+    repo = UsuarioRepositorio()
+    repo.registrar(Cliente("Carlos", "carlos@gmail.com", "1234"))
+
+    servicio = ServicioAutenticacion(repo)
+    print(f"Login correcto: {servicio.autenticar('carlos@gmail.com', '1234').result().nombre}")
+    try:
+        servicio.autenticar("carlos@gmail.com", "0000").result()
+    except ContrasenaIncorrectaError as e:
+        print(f"Error esperado capturado: {e}")
+
+    # Rehash: endurecemos los parámetros y el próximo login actualiza el hash
+    seguridad.PARAMETROS_KDF["n"] = 2**15
+    servicio.autenticar("carlos@gmail.com", "1234").result()
+    servicio.autenticar("carlos@gmail.com", "1234").result()
+    print("Rehash aplicado con n=2**15")
+    seguridad.PARAMETROS_KDF["n"] = 2**14
+
+    # Benchmark de throughput: logins por segundo (1 hilo vs todos los núcleos)
+    repo.registrar(Cliente("Bench", "bench@spotipy.com", "clave"))
+    LOGINS = 200
+    for hilos in sorted({1, os.cpu_count() or 1}):
+        pool = ServicioAutenticacion(repo, hilos=hilos)
+        inicio = time.perf_counter()
+        futuros = [pool.autenticar("bench@spotipy.com", "clave") for _ in range(LOGINS)]
+        for f in futuros:
+            f.result()
+        total = time.perf_counter() - inicio
+        pool.cerrar()
+        print(f"{hilos:>2} hilo(s): {LOGINS / total:7.1f} logins/s "
+              f"({LOGINS / total / hilos:.1f} por núcleo)")
+
+    async def demo_async():
+        usuario = await servicio.autenticar_async("carlos@gmail.com", "1234")
+        print(f"Login asyncio: {usuario.nombre}")
+
+    asyncio.run(demo_async())
+    servicio.cerrar()
@@ -0,0 +1,309 @@
+import sys
+import os
+import json
+import time
+import threading
+from collections import deque
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from servicios.reproductor import EVENTOS
+from utils import metricas
+
+_EVENTOS_ESCRITOS = metricas.contador(
+    "spotipy_bitacora_eventos_total", "Eventos de reproducción escritos en la bitácora"
+)
+_EVENTOS_DESCARTADOS = metricas.contador(
+    "spotipy_bitacora_descartados_total", "Eventos descartados por cola de escritura llena"
+)
+_ERRORES_ESCRITURA = metricas.contador(
+    "spotipy_bitacora_errores_total", "Lotes que no se pudieron escribir o sincronizar (se reintentan)"
+)
+_LATENCIA_LOTE = metricas.histograma(
+    "spotipy_bitacora_lote_segundos", "Duración de escribir + fsync un lote de eventos"
+)
+
+PREFIJO = "eventos-"
+EXTENSION = ".jsonl"
+
+
+def _segmentos(carpeta):
+    """Rutas de los segmentos de la carpeta, del más viejo al más nuevo."""
+    try:
+        nombres = os.listdir(carpeta)
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(carpeta, nombre)
+        for nombre in sorted(nombres)
+        if nombre.startswith(PREFIJO) and nombre.endswith(EXTENSION)
+    ]
+
+
+class BitacoraEventos:
+    """
+    Registro de solo-anexado (append-only) de lo que se reproduce.
+    - registrar() solo agrega una tupla a una cola en memoria: no toca el disco
+      ni serializa, así que no frena los comandos del reproductor.
+    - Un hilo escritor vacía la cola por lotes cada 'intervalo' segundos:
+      escribe JSONL, hace fsync una vez por lote y rota de segmento al
+      superar 'tam_segmento' bytes.
+    Si el disco no da abasto y la cola llega a 'max_pendientes', los eventos
+    nuevos se descartan (y se cuentan) en vez de bloquear al reproductor.
+    Si escribir o hacer fsync falla (disco lleno, USB desconectado), el lote se
+    guarda para el próximo intento y el hilo sigue vivo; el error se avisa una vez.
+    """
+
+    def __init__(self, carpeta, tam_segmento=16 * 2**20, intervalo=0.5, max_pendientes=100_000):
+        self.carpeta = carpeta
+        self.tam_segmento = tam_segmento
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        os.makedirs(carpeta, exist_ok=True)
+
+        self.__pendientes = deque()  # append/popleft son atómicos: no hace falta candado
+        self.__candado_archivo = threading.Lock()
+        self.__despertar = threading.Event()
+        self.__activo = True
+        self.__cerrada = False
+        self.__sin_escribir = []  # Líneas de un lote que falló: van primero en el próximo
+        self.__fallando = False  # Ya se avisó del error (no repetirlo en cada lote)
+        self.__error_lote = None  # Error del lote en curso (para saber si se recuperó)
+
+        # Continuamos el último segmento si aún tiene espacio
+        existentes = _segmentos(carpeta)
+        self.__numero = len(existentes) and int(os.path.basename(existentes[-1])[len(PREFIJO):-len(EXTENSION)])
+        self.__archivo = None
+        self._abrir_segmento(nuevo=not existentes)
+
+        self.__hilo = threading.Thread(target=self._trabajar, name="spotipy-bitacora", daemon=True)
+        self.__hilo.start()
+
+    # --- Productores (hilo del reproductor) ---
+    def registrar(self, usuario, evento, cancion, posicion=0.0):
+        """Encola un evento. Coste: un append a una deque."""
+        if len(self.__pendientes) >= self.max_pendientes:
+            _EVENTOS_DESCARTADOS.inc()
+            return False
+        self.__pendientes.append((time.time(), usuario, evento, cancion, posicion))
+        return True
+
+    def conectar(self, reproductor, usuario):
+        """
+        Suscribe la bitácora a todos los eventos de un Reproductor.
+        'usuario' es el correo o una función que lo devuelve (si el reproductor
+        lo comparten varias sesiones de login, como en main.py).
+        """
+        obtener_usuario = usuario if callable(usuario) else (lambda: usuario)
+
+        def anotar(evento):
+            return lambda r, cancion: self.registrar(
+                obtener_usuario(), evento, cancion, r.posicion_actual()
+            )
+
+        for evento in EVENTOS:
+            reproductor.suscribir(evento, anotar(evento))
+
+    # --- Escritor (hilo de fondo) ---
+    def _abrir_segmento(self, nuevo):
+        if self.__archivo is not None:
+            archivo, self.__archivo = self.__archivo, None  # Si falla el open, se reabre en el próximo lote
+            archivo.close()
+        if nuevo:
+            self.__numero += 1
+        ruta = os.path.join(self.carpeta, f"{PREFIJO}{self.__numero:06d}{EXTENSION}")
+        self.__archivo = open(ruta, "ab")
+
+    def _trabajar(self):
+        while self.__activo:
+            self.__despertar.wait(self.intervalo)
+            self.__despertar.clear()
+            self.vaciar()
+        self.vaciar()  # Lo que quedó al cerrar
+
+    def vaciar(self):
+        """Escribe y sincroniza (fsync) todo lo pendiente. Devuelve cuántos eventos escribió."""
+        with self.__candado_archivo:
+            if self.__cerrada:
+                return 0
+            lineas = self.__sin_escribir
+            while self.__pendientes:
+                lineas.append(self._serializar(*self.__pendientes.popleft()))
+            if not lineas:
+                return 0
+            self.__sin_escribir = []
+            escritos = 0
+            self.__error_lote = None
+            try:
+                with _LATENCIA_LOTE.medir():
+                    if self.__archivo is None:
+                        self._abrir_segmento(nuevo=False)  # Falló al rotar: reintentamos el open
+                    lote, tamano = [], self.__archivo.tell()
+                    for linea in lineas:
+                        if tamano and tamano + len(linea) > self.tam_segmento:
+                            self._escribir(lote)
+                            escritos += len(lote)
+                            self._abrir_segmento(nuevo=True)
+                            lote, tamano = [], 0
+                        lote.append(linea)
+                        tamano += len(linea)
+                    self._escribir(lote)
+                    escritos += len(lote)
+            except OSError as e:
+                self._fallo(lineas[escritos:], e)
+                self._descartar_archivo()
+            else:
+                if self.__fallando and self.__error_lote is None:
+                    self.__fallando = False
+                    print("✅ Bitácora: la escritura volvió a funcionar")
+            _EVENTOS_ESCRITOS.inc(escritos)
+            return escritos
+
+    @staticmethod
+    def _serializar(ts, usuario, evento, cancion, posicion):
+        return json.dumps({
+            "ts": round(ts, 3),
+            "usuario": usuario,
+            "evento": evento,
+            "ruta": cancion.ruta_archivo if cancion is not None else None,
+            "titulo": cancion.titulo if cancion is not None else None,
+            "posicion": round(posicion, 3),
+        }, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def _fallo(self, lineas, error):
+        """Guarda lo no escrito para el próximo lote (acotado a max_pendientes) y avisa una vez."""
+        _ERRORES_ESCRITURA.inc()
+        sobrantes = len(lineas) - self.max_pendientes
+        if sobrantes > 0:
+            _EVENTOS_DESCARTADOS.inc(sobrantes)
+            lineas = lineas[sobrantes:]
+        # Un write a medias pudo dejar una línea cortada: el "\n" la cierra (el lector
+        # ignora la línea rota) y así no se pega al primer evento del reintento
+        if lineas and not lineas[0].startswith(b"\n"):
+            lineas = [b"\n" + lineas[0]] + lineas[1:]
+        self.__sin_escribir = lineas
+        self._avisar(error, "se reintenta en el próximo lote")
+
+    def _avisar(self, error, consecuencia):
+        self.__error_lote = error
+        if not self.__fallando:
+            self.__fallando = True
+            print(f"⚠️ Bitácora: no se pudo escribir ({error}); {consecuencia}")
+
+    def _descartar_archivo(self):
+        """Tras un error el buffer del archivo puede quedar a medias: se cierra y se reabre luego."""
+        if self.__archivo is not None:
+            archivo, self.__archivo = self.__archivo, None
+            try:
+                archivo.close()
+            except OSError:
+                pass
+
+    def _escribir(self, lineas):
+        """Un write y un fsync por lote (o por segmento si el lote cruza una rotación)."""
+        if lineas:
+            self.__archivo.write(b"".join(lineas))
+            self.__archivo.flush()
+            try:
+                os.fsync(self.__archivo.fileno())
+            except OSError as e:
+                # Los datos ya están en el sistema operativo: reescribirlos los duplicaría
+                _ERRORES_ESCRITURA.inc()
+                self._avisar(e, "los eventos quedan sin sincronizar")
+
+    def cerrar(self):
+        """Detiene el escritor tras volcar lo pendiente."""
+        self.__activo = False
+        self.__despertar.set()
+        self.__hilo.join(timeout=5)
+        with self.__candado_archivo:
+            self.__cerrada = True
+            if self.__sin_escribir:
+                print(f"⚠️ Bitácora: {len(self.__sin_escribir)} eventos sin escribir al cerrar")
+            if self.__archivo is not None:
+                self.__archivo.close()
+                self.__archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def leer_eventos(carpeta, desde=None, evento=None):
+    """
+    Lector en streaming para análisis: recorre los segmentos en orden y entrega
+    un dict por evento sin cargar los archivos enteros en memoria.
+    Filtros opcionales: 'desde' (timestamp mínimo) y 'evento' (tipo).
+    Una línea final incompleta (corte de luz a mitad de escritura) se ignora.
+    """
+    for ruta in _segmentos(carpeta):
+        with open(ruta, "rb") as archivo:
+            for linea in archivo:
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    continue
+                if desde is not None and registro["ts"] < desde:
+                    continue
+                if evento is not None and registro["evento"] != evento:
+                    continue
+                yield registro
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import tempfile
+    from collections import Counter
+    from modelos.multimedia import Cancion, Playlist
+    from servicios.reproductor import Reproductor
+    from servicios.reloj import RelojVirtual
+
+    canciones = [Cancion(f"Tema {i}", "Artista", "Disco", "Pop", f"/no/existe/{i}.mp3", 180) for i in range(20)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        playlist = Playlist("Mix", "bitácora")
+        for cancion in canciones:
+            playlist.agregar_cancion(cancion)
+
+    def navegar(dj, reloj, pasos):
+        for i in range(pasos):
+            reloj.avanzar(7)
+            if i % 3 == 0:
+                dj.siguiente()
+            elif i % 3 == 1:
+                dj.pausar()
+            else:
+                dj.despausar()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        # Comandos a ráfaga (mucho más rápido que un humano): el peor caso para la bitácora
+        pasos = 30_000
+        for con_bitacora in (False, True):
+            reloj = RelojVirtual()
+            dj = Reproductor(reloj=reloj, con_audio=False)
+            bitacora = None
+            if con_bitacora:
+                # Segmentos pequeños para ver la rotación
+                bitacora = BitacoraEventos(carpeta, tam_segmento=512 * 1024)
+                bitacora.conectar(dj, "demo@spotipy.com")
+            with contextlib.redirect_stdout(io.StringIO()):
+                dj.cargar_origen(playlist)
+                inicio = time.perf_counter()
+                navegar(dj, reloj, pasos)
+                por_comando = (time.perf_counter() - inicio) / pasos * 1e6
+                dj.detener()
+            print(f"Bitácora={con_bitacora!s:<5}: {por_comando:.1f} µs por comando")
+
+        inicio = time.perf_counter()
+        bitacora.cerrar()
+        print(f"Volcado final (JSON + fsync): {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+        inicio = time.perf_counter()
+        tipos = Counter(r["evento"] for r in leer_eventos(carpeta))
+        print(f"Leídos {sum(tipos.values())} eventos de {len(_segmentos(carpeta))} segmentos "
+              f"en {time.perf_counter() - inicio:.2f} s: {dict(tipos)}")
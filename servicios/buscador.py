@@ -0,0 +1,242 @@
+import sys
+import os
+import heapq
+import unicodedata
+from bisect import bisect_left, insort
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.multimedia import Cancion
+from utils.excepciones import CancionNoEncontradaError, OpcionInvalidaError
+
+# Peso de cada campo en el ranking: un acierto en el título vale más que en el género
+PESOS_CAMPOS = {"titulo": 3.0, "artista": 2.0, "album": 1.5, "genero": 1.0}
+
+
+def tokenizar(texto):
+    """
+    Normaliza y parte un texto en palabras.
+    'Canción Número 1' -> ['cancion', 'numero', '1'] (sin tildes ni mayúsculas).
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    limpio = "".join(
+        c if c.isalnum() else " "
+        for c in descompuesto
+        if not unicodedata.combining(c)
+    )
+    return limpio.split()
+
+
+class BuscadorCatalogo:
+    """
+    Motor de búsqueda sobre el catálogo con un índice invertido:
+    palabra -> canciones agrupadas por peso. Soporta búsqueda por prefijo y
+    resultados ordenados por relevancia. Se actualiza de forma incremental.
+    Como cada palabra tiene pocos pesos distintos (combinaciones de PESOS_CAMPOS),
+    las publicaciones se recorren de mayor a menor peso sin ordenar nada: una
+    palabra que aparece en todo el catálogo cuesta lo mismo que una rara.
+    """
+
+    def __init__(self, max_expansiones=64):
+        self.__indice = {}  # token -> {peso: {Cancion: None}} (publicaciones por peso)
+        self.__vocabulario = []  # Tokens ordenados (para buscar prefijos con bisect)
+        self.__pesos_por_cancion = {}  # Cancion -> {token: peso} (para puntuar y eliminar)
+        # Límite de palabras que puede abarcar un prefijo corto ("a" -> miles de palabras)
+        self.max_expansiones = max_expansiones
+
+    def __len__(self):
+        return len(self.__pesos_por_cancion)
+
+    def agregar(self, cancion: Cancion):
+        """Indexa una canción (si ya estaba indexada no hace nada)."""
+        self._indexar(cancion, insort)
+
+    def agregar_lote(self, canciones):
+        """Carga masiva: indexa todo y ordena el vocabulario una sola vez al final."""
+        for cancion in canciones:
+            self._indexar(cancion, list.append)
+        self.__vocabulario.sort()
+
+    def _indexar(self, cancion, registrar_token):
+        if cancion in self.__pesos_por_cancion:
+            return
+
+        pesos = {}
+        for campo, peso in PESOS_CAMPOS.items():
+            for token in tokenizar(getattr(cancion, campo)):
+                pesos[token] = pesos.get(token, 0.0) + peso
+
+        for token, peso in pesos.items():
+            niveles = self.__indice.get(token)
+            if niveles is None:
+                niveles = self.__indice[token] = {}
+                registrar_token(self.__vocabulario, token)
+            nivel = niveles.get(peso)
+            if nivel is None:
+                nivel = niveles[peso] = {}
+            nivel[cancion] = None
+
+        self.__pesos_por_cancion[cancion] = pesos
+
+    def eliminar(self, cancion: Cancion):
+        """Quita una canción del índice sin reconstruirlo."""
+        pesos = self.__pesos_por_cancion.pop(cancion, None)
+        if pesos is None:
+            raise CancionNoEncontradaError(f"'{cancion.titulo}' no está en el índice")
+
+        for token, peso in pesos.items():
+            niveles = self.__indice[token]
+            nivel = niveles[peso]
+            del nivel[cancion]
+            if not nivel:
+                del niveles[peso]
+                if not niveles:
+                    del self.__indice[token]
+                    self.__vocabulario.pop(bisect_left(self.__vocabulario, token))
+
+    def _expandir(self, prefijo):
+        """Devuelve las palabras del vocabulario que empiezan por 'prefijo'."""
+        inicio = bisect_left(self.__vocabulario, prefijo)
+        encontrados = []
+        for token in self.__vocabulario[inicio : inicio + self.max_expansiones]:
+            if not token.startswith(prefijo):
+                break
+            encontrados.append(token)
+        return encontrados
+
+    def _factores_termino(self, termino):
+        """{token: factor} que abarca un término de la consulta (exacto o por prefijo)."""
+        candidatos = self._expandir(termino)
+        if len(candidatos) == 1 and candidatos[0] == termino:
+            return {termino: 1.0}  # Caso rápido: solo la palabra exacta
+        # Un acierto exacto puntúa completo, un prefijo puntúa la mitad
+        return {token: 1.0 if token == termino else 0.5 for token in candidatos}
+
+    def _tamano(self, factores):
+        """Cantidad de publicaciones de un término (cota: una canción puede repetirse)."""
+        return sum(len(nivel) for token in factores for nivel in self.__indice[token].values())
+
+    def _recorrer(self, factores):
+        """
+        (puntaje, cancion) de un término, de mayor a menor puntaje y sin repetir
+        canciones. Perezoso: cortar a los k primeros cuesta O(k), no O(publicaciones).
+        """
+        grupos = sorted(
+            ((peso * factor, nivel) for token, factor in factores.items()
+             for peso, nivel in self.__indice[token].items()),
+            key=lambda grupo: grupo[0], reverse=True,
+        )
+        if len(factores) == 1:
+            for puntaje, nivel in grupos:
+                for cancion in nivel:
+                    yield puntaje, cancion
+            return
+        # Varias palabras: una canción sale con su mejor puntaje (el primero en aparecer)
+        vistas = set()
+        for puntaje, nivel in grupos:
+            for cancion in nivel:
+                if cancion not in vistas:
+                    vistas.add(cancion)
+                    yield puntaje, cancion
+
+    def _puntaje(self, cancion, factores):
+        """Puntaje de 'cancion' para un término, o None si no lo contiene."""
+        puntaje = None
+        for token, peso in self.__pesos_por_cancion[cancion].items():
+            factor = factores.get(token)
+            if factor is not None and (puntaje is None or peso * factor > puntaje):
+                puntaje = peso * factor
+        return puntaje
+
+    def buscar(self, consulta, limite=10):
+        """
+        Busca canciones que contengan TODAS las palabras de la consulta
+        (la coincidencia por prefijo vale). Devuelve una lista ordenada por relevancia.
+        Lanza CancionNoEncontradaError si no hay resultados y OpcionInvalidaError
+        si 'limite' no es positivo.
+        """
+        if limite < 1:
+            raise OpcionInvalidaError(f"El límite de resultados debe ser positivo (se pidió {limite})")
+        terminos = tokenizar(consulta)
+        if not terminos:
+            raise CancionNoEncontradaError("La búsqueda está vacía")
+
+        # El término más selectivo guía el recorrido; los demás solo se consultan
+        factores = sorted((self._factores_termino(t) for t in terminos), key=self._tamano)
+        guia, otros = factores[0], factores[1:]
+        if not guia:  # Alguna palabra no está en el vocabulario
+            raise CancionNoEncontradaError(f"Sin resultados para '{consulta}'")
+        # Lo máximo que pueden sumar los demás términos a cualquier canción
+        techo_otros = sum(
+            max(peso * factor for token, factor in f.items() for peso in self.__indice[token])
+            for f in otros
+        )
+
+        mejores = []  # Montículo de mínimos: (puntaje, -orden, cancion)
+        for orden, (puntaje, cancion) in enumerate(self._recorrer(guia)):
+            # Corte temprano: lo que queda no puede superar al peor de los 'limite' mejores
+            if len(mejores) == limite and puntaje + techo_otros <= mejores[0][0]:
+                break
+            total = puntaje
+            for f in otros:
+                extra = self._puntaje(cancion, f)
+                if extra is None:
+                    break
+                total += extra
+            else:
+                entrada = (total, -orden, cancion)
+                if len(mejores) < limite:
+                    heapq.heappush(mejores, entrada)
+                elif entrada[:2] > mejores[0][:2]:
+                    heapq.heapreplace(mejores, entrada)
+
+        if not mejores:
+            raise CancionNoEncontradaError(f"Sin resultados para '{consulta}'")
+
+        mejores.sort(key=lambda entrada: entrada[:2], reverse=True)
+        return [cancion for _, _, cancion in mejores]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import time
+
+    buscador = BuscadorCatalogo()
+    c1 = Cancion("Canción del Mariachi", "Antonio Banderas", "Desperado", "Latino", "x.mp3")
+    c2 = Cancion("Bohemian Rhapsody", "Queen", "A Night at the Opera", "Rock", "y.mp3")
+    buscador.agregar(c1)
+    buscador.agregar(c2)
+
+    print(f"Buscar 'cancion': {buscador.buscar('cancion')}")
+    print(f"Buscar 'que rock' (prefijo): {buscador.buscar('que rock')}")
+
+    buscador.eliminar(c2)
+    try:
+        buscador.buscar("queen")
+    except CancionNoEncontradaError as e:
+        print(f"Error esperado capturado: {e}")
+
+    # Mini benchmark: 1M canciones sintéticas
+    generos = ["Rock", "Pop", "Jazz", "Latino", "Metal"]
+    inicio = time.perf_counter()
+    buscador.agregar_lote(
+        Cancion(f"Tema {i}", f"Artista {i % 5000}", f"Disco {i % 20000}",
+                generos[i % 5], f"{i}.mp3")
+        for i in range(1_000_000)
+    )
+    print(f"Indexadas {len(buscador)} canciones en {time.perf_counter() - inicio:.1f} s")
+
+    inicio = time.perf_counter()
+    for i in range(1000):
+        buscador.buscar(f"tema {i * 997}")
+    promedio_ms = (time.perf_counter() - inicio) * 1000 / 1000
+    print(f"Consulta promedio: {promedio_ms:.3f} ms")
+
+    # Términos amplios: "tema" está en todo el catálogo, "t" se expande a 64 palabras
+    for consulta in ("rock", "tema", "t", "tema rock"):
+        inicio = time.perf_counter()
+        for _ in range(100):
+            buscador.buscar(consulta)
+        print(f"'{consulta}': {(time.perf_counter() - inicio) * 1000 / 100:.3f} ms")
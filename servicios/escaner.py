@@ -0,0 +1,440 @@
+import sys
+import os
+import json
+import base64
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.multimedia import Cancion, Album
+
+DESCONOCIDO = "Desconocido"
+
+# --- Tablas del estándar MPEG audio (kbps / Hz) ---
+BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+BITRATES[(2, 3)] = BITRATES[(2, 2)]
+FRECUENCIAS = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+# Frames ID3v2 que nos interesan (v2.3/v2.4 y sus equivalentes de 3 letras en v2.2)
+FRAMES_ID3 = {
+    "TIT2": "titulo", "TT2": "titulo",
+    "TPE1": "artista", "TP1": "artista",
+    "TALB": "album", "TAL": "album",
+    "TCON": "genero", "TCO": "genero",
+    "TYER": "anio", "TDRC": "anio", "TYE": "anio",
+}
+CODIFICACIONES = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+FRAMES_POR_ENTRADA = 16  # Índice de búsqueda: una entrada cada 16 frames (~0.4 s a 44.1 kHz)
+
+
+def _syncsafe(datos):
+    """Entero 'syncsafe' de ID3 (7 bits útiles por byte)."""
+    valor = 0
+    for byte in datos:
+        valor = (valor << 7) | (byte & 0x7F)
+    return valor
+
+
+def _texto_id3(cuerpo):
+    if not cuerpo:
+        return ""
+    codificacion = CODIFICACIONES.get(cuerpo[0], "latin-1")
+    texto = cuerpo[1:].decode(codificacion, errors="replace")
+    return texto.split("\x00")[0].strip()
+
+
+def _leer_id3v2(cabecera, archivo):
+    """Devuelve (tags, tamaño total del bloque ID3v2) o ({}, 0) si no hay etiqueta."""
+    if cabecera[:3] != b"ID3":
+        return {}, 0
+    version, flags = cabecera[3], cabecera[5]
+    tamano = _syncsafe(cabecera[6:10]) + 10 + (10 if flags & 0x10 else 0)  # +footer
+    bloque = archivo.read(_syncsafe(cabecera[6:10]))
+
+    tags = {}
+    pos = 0
+    if flags & 0x40 and version >= 3:  # Cabecera extendida: la saltamos
+        pos = _syncsafe(bloque[:4]) if version == 4 else struct.unpack(">I", bloque[:4])[0] + 4
+
+    largo_id = 3 if version == 2 else 4
+    largo_cab = 6 if version == 2 else 10
+    while pos + largo_cab <= len(bloque):
+        id_frame = bloque[pos : pos + largo_id]
+        if not id_frame.strip(b"\x00"):
+            break  # Relleno (padding)
+        if version == 2:
+            tam = int.from_bytes(bloque[pos + 3 : pos + 6], "big")
+        elif version == 4:
+            tam = _syncsafe(bloque[pos + 4 : pos + 8])
+        else:
+            tam = struct.unpack(">I", bloque[pos + 4 : pos + 8])[0]
+        campo = FRAMES_ID3.get(id_frame.decode("latin-1"))
+        if campo and campo not in tags:
+            tags[campo] = _texto_id3(bloque[pos + largo_cab : pos + largo_cab + tam])
+        pos += largo_cab + tam
+    return tags, tamano
+
+
+def _leer_id3v1(archivo, tamano_archivo):
+    """Etiqueta ID3v1 (últimos 128 bytes). Se usa como respaldo."""
+    if tamano_archivo < 128:
+        return {}, 0
+    archivo.seek(tamano_archivo - 128)
+    datos = archivo.read(128)
+    if datos[:3] != b"TAG":
+        return {}, 0
+
+    def campo(a, b):
+        return datos[a:b].split(b"\x00")[0].decode("latin-1").strip()
+
+    tags = {"titulo": campo(3, 33), "artista": campo(33, 63), "album": campo(63, 93), "anio": campo(93, 97)}
+    return {k: v for k, v in tags.items() if v}, 128
+
+
+def _cabecera_mpeg(datos, pos):
+    """Decodifica la cabecera de frame MPEG en 'pos' o devuelve None."""
+    if pos + 4 > len(datos) or datos[pos] != 0xFF or (datos[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = datos[pos + 1], datos[pos + 2], datos[pos + 3]
+    version = {3: 1, 2: 2, 0: 25}.get((b1 >> 3) & 0x03)
+    capa = {3: 1, 2: 2, 1: 3}.get((b1 >> 1) & 0x03)
+    indice_bitrate, indice_frec = b2 >> 4, (b2 >> 2) & 0x03
+    if version is None or capa is None or indice_bitrate in (0, 15) or indice_frec == 3:
+        return None
+
+    familia = 1 if version == 1 else 2
+    bitrate = BITRATES[(familia, capa)][indice_bitrate] * 1000
+    frecuencia = FRECUENCIAS[version][indice_frec]
+    relleno = (b2 >> 1) & 0x01
+    if capa == 1:
+        muestras = 384
+        tamano = (12 * bitrate // frecuencia + relleno) * 4
+    elif capa == 3 and version != 1:
+        muestras = 576
+        tamano = 72 * bitrate // frecuencia + relleno
+    else:
+        muestras = 1152
+        tamano = 144 * bitrate // frecuencia + relleno
+    return {
+        "version": version,
+        "bitrate": bitrate,
+        "frecuencia": frecuencia,
+        "muestras": muestras,
+        "mono": (b3 >> 6) == 3,
+        "tamano": tamano,
+    }
+
+
+def _es_frame_vbr(datos, pos, cab):
+    """¿El frame en 'pos' es la cabecera Xing/Info/VBRI? (no lleva audio)."""
+    if cab["version"] == 1:
+        lado = 17 if cab["mono"] else 32
+    else:
+        lado = 9 if cab["mono"] else 17
+    xing = pos + 4 + lado
+    return datos[xing : xing + 4] in (b"Xing", b"Info") or datos[pos + 36 : pos + 40] == b"VBRI"
+
+
+def _duracion_mpeg(archivo, inicio_audio, fin_audio):
+    """
+    Duración en segundos SIN decodificar audio:
+    1) cabecera Xing/Info o VBRI del primer frame (archivos VBR),
+    2) si no existe, se asume CBR: bytes de audio / bitrate.
+    """
+    archivo.seek(inicio_audio)
+    datos = archivo.read(16 * 1024)
+
+    pos = 0
+    while pos < len(datos) - 4:
+        cab = _cabecera_mpeg(datos, pos)
+        if cab:
+            break
+        pos += 1
+    else:
+        return 0.0
+
+    # Desplazamiento de la cabecera Xing según versión y canales
+    if cab["version"] == 1:
+        lado = 17 if cab["mono"] else 32
+    else:
+        lado = 9 if cab["mono"] else 17
+    xing = pos + 4 + lado
+    if datos[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", datos[xing + 4 : xing + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack(">I", datos[xing + 8 : xing + 12])[0]
+            return frames * cab["muestras"] / cab["frecuencia"]
+
+    vbri = pos + 4 + 32
+    if datos[vbri : vbri + 4] == b"VBRI":
+        frames = struct.unpack(">I", datos[vbri + 14 : vbri + 18])[0]
+        return frames * cab["muestras"] / cab["frecuencia"]
+
+    bytes_audio = fin_audio - (inicio_audio + pos)
+    return bytes_audio * 8 / cab["bitrate"]
+
+
+class IndiceBusqueda:
+    """
+    Tabla de saltos de un MP3: byte donde empieza el frame de cada 'paso' segundos.
+    Todos los frames de un archivo tienen las mismas muestras, así que la entrada i
+    corresponde exactamente a i * paso segundos (también en VBR).
+    Ubicar un segundo es una división y un acceso al array: O(1).
+    """
+
+    def __init__(self, paso, desplazamientos):
+        self.paso = paso
+        self.desplazamientos = desplazamientos  # array("I")
+
+    def __len__(self):
+        return len(self.desplazamientos)
+
+    def ubicar(self, segundos):
+        """(segundo real de la entrada, byte) de la última entrada en o antes de 'segundos'."""
+        i = max(0, min(int(segundos / self.paso), len(self.desplazamientos) - 1))
+        return i * self.paso, self.desplazamientos[i]
+
+    def a_dict(self):
+        desplazamientos = array("I", self.desplazamientos)
+        if sys.byteorder == "big":
+            desplazamientos.byteswap()  # En disco, siempre little-endian
+        return {"paso": self.paso, "desplazamientos": base64.b64encode(desplazamientos.tobytes()).decode("ascii")}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        desplazamientos = array("I", base64.b64decode(datos["desplazamientos"]))
+        if sys.byteorder == "big":
+            desplazamientos.byteswap()
+        return cls(datos["paso"], desplazamientos)
+
+
+def _indice_busqueda(archivo, inicio_audio, fin_audio):
+    """Recorre las cabeceras de todos los frames (sin decodificar audio) y arma el índice."""
+    if fin_audio <= inicio_audio:
+        return None  # El tamaño del ID3 dice más de lo que mide el archivo
+    archivo.seek(inicio_audio)
+    datos = archivo.read(fin_audio - inicio_audio)
+    desplazamientos = array("I")
+    paso = None
+    frames = 0
+    pos = datos.find(b"\xff")
+    while 0 <= pos and pos + 4 <= len(datos):
+        cab = _cabecera_mpeg(datos, pos)
+        if cab is None or cab["tamano"] <= 0:
+            pos = datos.find(b"\xff", pos + 1)  # Basura entre frames: resincronizamos
+            continue
+        if paso is None:
+            paso = FRAMES_POR_ENTRADA * cab["muestras"] / cab["frecuencia"]
+            if _es_frame_vbr(datos, pos, cab):
+                pos += cab["tamano"]
+                continue
+        if frames % FRAMES_POR_ENTRADA == 0:
+            desplazamientos.append(inicio_audio + pos)
+        frames += 1
+        pos += cab["tamano"]
+    if not desplazamientos:
+        return None
+    return IndiceBusqueda(paso, desplazamientos)
+
+
+def leer_metadatos(ruta):
+    """
+    Lee etiquetas ID3, duración e índice de búsqueda de un MP3 leyendo solo
+    cabeceras (las de ID3 y las de cada frame; el audio no se decodifica).
+    Función de módulo (no método) para que el pool de procesos pueda enviarla.
+    """
+    tamano_archivo = os.path.getsize(ruta)
+    with open(ruta, "rb") as archivo:
+        tags, inicio_audio = _leer_id3v2(archivo.read(10), archivo)
+        tags_v1, cola = _leer_id3v1(archivo, tamano_archivo)
+        duracion = _duracion_mpeg(archivo, inicio_audio, tamano_archivo - cola)
+        indice = _indice_busqueda(archivo, inicio_audio, tamano_archivo - cola)
+
+    for campo, valor in tags_v1.items():
+        tags.setdefault(campo, valor)
+    return {
+        "titulo": tags.get("titulo") or os.path.splitext(os.path.basename(ruta))[0],
+        "artista": tags.get("artista") or DESCONOCIDO,
+        "album": tags.get("album") or DESCONOCIDO,
+        "genero": tags.get("genero") or DESCONOCIDO,
+        "anio": tags.get("anio", "")[:4],
+        "duracion": round(duracion, 3),
+        "indice": indice.a_dict() if indice else None,
+    }
+
+
+def _leer_o_error(ruta):
+    """(meta, None) o (None, motivo): un archivo dañado no tumba el escaneo del resto."""
+    try:
+        return leer_metadatos(ruta), None
+    except (struct.error, ValueError, IndexError, OSError) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class EscanerBiblioteca:
+    """
+    Escanea una carpeta de MP3 y construye objetos Cancion y Album.
+    - Los archivos se leen en paralelo con un pool de procesos.
+    - Caché en disco por (ruta, tamaño, mtime): un re-escaneo solo relee lo que cambió.
+    - De paso arma el índice de búsqueda de cada archivo (ver indice_busqueda()).
+    """
+
+    def __init__(self, carpeta="assets/musica", ruta_cache=None, procesos=None):
+        self.carpeta = carpeta
+        self.ruta_cache = ruta_cache or os.path.join(carpeta, ".escaner_cache.json")
+        self.procesos = procesos
+        self.__cache = self._cargar_cache()
+        self.__indices = {}  # ruta -> IndiceBusqueda ya decodificado de la caché
+
+    def _cargar_cache(self):
+        try:
+            with open(self.ruta_cache, encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar_cache(self):
+        try:
+            with open(self.ruta_cache, "w", encoding="utf-8") as archivo:
+                json.dump(self.__cache, archivo, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché del escáner: {e}")
+
+    def _listar_mp3(self):
+        for raiz, _, archivos in os.walk(self.carpeta):
+            for nombre in sorted(archivos):
+                if nombre.lower().endswith(".mp3"):
+                    yield os.path.join(raiz, nombre)
+
+    def escanear(self):
+        """Devuelve (canciones, albumes). Solo relee los archivos nuevos o modificados."""
+        vigentes = {}
+        cambiados = []
+        for ruta in self._listar_mp3():
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue  # Se borró entre el listado y ahora
+            huella = [info.st_size, info.st_mtime_ns]
+            vigentes[ruta] = huella
+            entrada = self.__cache.get(ruta)
+            # Cachés de antes del índice de búsqueda: se releen una vez
+            if entrada is None or entrada["huella"] != huella or "indice" not in entrada["meta"]:
+                cambiados.append(ruta)
+
+        leidos = len(cambiados)
+        if cambiados:
+            # Para pocos archivos no compensa arrancar procesos
+            if len(cambiados) < 8:
+                resultados = map(_leer_o_error, cambiados)
+                leidos -= self._actualizar(cambiados, resultados, vigentes)
+            else:
+                with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                    resultados = pool.map(_leer_o_error, cambiados, chunksize=16)
+                    leidos -= self._actualizar(cambiados, resultados, vigentes)
+
+        # Los archivos borrados salen de la caché
+        eliminados = set(self.__cache) - set(vigentes)
+        for ruta in eliminados:
+            del self.__cache[ruta]
+        if cambiados or eliminados:
+            self._guardar_cache()
+
+        print(f"🔍 Escáner: {len(vigentes)} archivos ({leidos} leídos, "
+              f"{len(vigentes) - leidos} desde caché)")
+        return self._construir(vigentes)
+
+    def _actualizar(self, rutas, resultados, vigentes):
+        """Guarda en la caché lo leído. Devuelve cuántos archivos se omitieron por ilegibles."""
+        ilegibles = []
+        for ruta, (meta, error) in zip(rutas, resultados):
+            self.__indices.pop(ruta, None)
+            if meta is None:
+                # Ni se cachea ni entra al catálogo; se reintenta en el próximo escaneo
+                del vigentes[ruta]
+                ilegibles.append((ruta, error))
+                continue
+            self.__cache[ruta] = {"huella": vigentes[ruta], "meta": meta}
+        for ruta, error in ilegibles:
+            print(f"⚠️ Escáner: se omite '{ruta}' ({error})")
+        return len(ilegibles)
+
+    def indice_busqueda(self, ruta):
+        """IndiceBusqueda de 'ruta' (de la caché, sin tocar el archivo) o None si no hay."""
+        indice = self.__indices.get(ruta)
+        if indice is None:
+            entrada = self.__cache.get(ruta)
+            if entrada is None or not entrada["meta"].get("indice"):
+                return None
+            indice = self.__indices[ruta] = IndiceBusqueda.desde_dict(entrada["meta"]["indice"])
+        return indice
+
+    def _construir(self, rutas):
+        canciones = []
+        por_album = {}  # (album, artista) -> [canciones], año
+        for ruta in rutas:
+            meta = self.__cache[ruta]["meta"]
+            cancion = Cancion(
+                meta["titulo"], meta["artista"], meta["album"], meta["genero"],
+                ruta, meta["duracion"],
+            )
+            canciones.append(cancion)
+            if meta["album"] != DESCONOCIDO:
+                grupo = por_album.setdefault((meta["album"], meta["artista"]), [[], meta["anio"]])
+                grupo[0].append(cancion)
+
+        albumes = [
+            Album(titulo, artista, anio, pistas)
+            for (titulo, artista), (pistas, anio) in por_album.items()
+        ]
+        return canciones, albumes
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    def mp3_sintetico(titulo, artista, album, frames):
+        """ID3v2.3 + un frame MPEG1 Layer III (128 kbps, 44.1 kHz) con cabecera Xing."""
+        def frame_texto(id_frame, texto):
+            cuerpo = b"\x03" + texto.encode("utf-8")
+            return id_frame + struct.pack(">I", len(cuerpo)) + b"\x00\x00" + cuerpo
+
+        frames_id3 = frame_texto(b"TIT2", titulo) + frame_texto(b"TPE1", artista) + frame_texto(b"TALB", album)
+        tam = len(frames_id3)
+        syncsafe = bytes([(tam >> 21) & 0x7F, (tam >> 14) & 0x7F, (tam >> 7) & 0x7F, tam & 0x7F])
+        id3 = b"ID3\x03\x00\x00" + syncsafe + frames_id3
+        audio = bytearray(417)
+        audio[0:4] = b"\xff\xfb\x90\x00"
+        xing = bytearray(audio)
+        xing[36:48] = b"Xing" + struct.pack(">II", 1, frames)
+        return id3 + bytes(xing) + bytes(audio) * 40
+
+    carpeta = tempfile.mkdtemp()
+    for i in range(40):
+        with open(os.path.join(carpeta, f"pista{i:02}.mp3"), "wb") as f:
+            f.write(mp3_sintetico(f"Canción {i}", "Artista Sintético", f"Disco {i % 4}", 10000 + i))
+
+    escaner = EscanerBiblioteca(carpeta)
+    inicio = time.perf_counter()
+    canciones, albumes = escaner.escanear()
+    print(f"Primer escaneo: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    print(f"{canciones[0].titulo} - {canciones[0].artista} ({canciones[0].duracion} seg)")
+    print(f"Álbumes: {[(a.titulo, a.duracion) for a in albumes]}")
+    indice = escaner.indice_busqueda(os.path.join(carpeta, "pista00.mp3"))
+    print(f"Índice de búsqueda: {len(indice)} entradas cada {indice.paso:.3f} s -> {indice.ubicar(0)}")
+
+    inicio = time.perf_counter()
+    EscanerBiblioteca(carpeta).escanear()
+    print(f"Re-escaneo incremental: {(time.perf_counter() - inicio) * 1000:.1f} ms")
@@ -0,0 +1,129 @@
+import sys
+import os
+import time
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.multimedia import Cancion
+from utils.aproximados import TopKAproximado, HyperLogLog, SerieTemporal
+
+
+class EstadisticasReproduccion:
+    """
+    Agregados en streaming para el panel "Estadísticas del Sistema".
+    Cada reproducción actualiza, en O(1) y sin guardar el historial:
+    - top-k aproximado de canciones, artistas y géneros (Space-Saving),
+    - oyentes únicos totales y por canción (HyperLogLog); estos últimos solo para
+      las canciones que vigila el top-k, así que son como mucho k,
+    - reproducciones por hora de la última semana (anillo de cubetas).
+    La memoria queda acotada por k y la precisión de los HLL (como mucho
+    k * 2**precision_cancion bytes para los oyentes por canción), no por el
+    tamaño del catálogo ni por la cantidad de reproducciones.
+    """
+
+    def __init__(self, k=100, precision_cancion=8, precision_global=14, ancho=3600, cubetas=168):
+        self.precision_cancion = precision_cancion
+        self.canciones = TopKAproximado(k)
+        self.artistas = TopKAproximado(k)
+        self.generos = TopKAproximado(k)
+        self.oyentes = HyperLogLog(precision_global)
+        self.__oyentes_cancion = {}  # (titulo, artista) vigilada por 'canciones' -> HyperLogLog pequeño
+        self.por_hora = SerieTemporal(ancho, cubetas)
+
+    @property
+    def total_reproducciones(self):
+        return self.canciones.total
+
+    @staticmethod
+    def _clave(cancion):
+        return (cancion.titulo, cancion.artista)
+
+    def registrar(self, usuario, cancion: Cancion, instante=None):
+        """Anota una reproducción de 'cancion' por 'usuario' (correo)."""
+        clave = self._clave(cancion)
+        desalojada = self.canciones.agregar(clave)
+        if desalojada is not None:
+            # Sale del top-k: sus oyentes dejan de contarse junto con su cuenta
+            self.__oyentes_cancion.pop(desalojada, None)
+        self.artistas.agregar(cancion.artista)
+        self.generos.agregar(cancion.genero)
+        self.por_hora.agregar(time.time() if instante is None else instante)
+        if usuario is not None:
+            self.oyentes.agregar(usuario)
+            hll = self.__oyentes_cancion.get(clave)
+            if hll is None:
+                hll = self.__oyentes_cancion[clave] = HyperLogLog(self.precision_cancion)
+            hll.agregar(usuario)
+
+    def conectar(self, reproductor, usuario):
+        """Cuenta cada 'pista_iniciada' del reproductor ('usuario': correo o función que lo da)."""
+        obtener_usuario = usuario if callable(usuario) else (lambda: usuario)
+        reproductor.suscribir(
+            "pista_iniciada", lambda r, cancion: self.registrar(obtener_usuario(), cancion)
+        )
+
+    # --- Consultas (tiempo constante respecto del historial) ---
+    def top_canciones(self, n=10):
+        """[(titulo, artista, reproducciones, oyentes únicos), ...]"""
+        return [
+            (titulo, artista, cuenta, self._oyentes_de((titulo, artista)))
+            for (titulo, artista), cuenta, _ in self.canciones.mas_frecuentes(n)
+        ]
+
+    def top_artistas(self, n=10):
+        return [(artista, cuenta) for artista, cuenta, _ in self.artistas.mas_frecuentes(n)]
+
+    def top_generos(self, n=10):
+        return [(genero, cuenta) for genero, cuenta, _ in self.generos.mas_frecuentes(n)]
+
+    def oyentes_unicos(self, cancion=None):
+        """Oyentes distintos de una canción (o de todo el sistema si no se indica)."""
+        if cancion is None:
+            return self.oyentes.estimar()
+        return self._oyentes_de(self._clave(cancion))
+
+    def canciones_con_oyentes(self):
+        """Cuántos HLL por canción hay en memoria (nunca más que k)."""
+        return len(self.__oyentes_cancion)
+
+    def _oyentes_de(self, clave):
+        hll = self.__oyentes_cancion.get(clave)
+        return hll.estimar() if hll is not None else 0
+
+    def reproducciones_recientes(self, horas=24, ahora=None):
+        """[(inicio de la hora, reproducciones), ...] de las últimas 'horas'."""
+        return self.por_hora.ultimas(horas, time.time() if ahora is None else ahora)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+
+    azar = random.Random(4)
+    generos = ["Rock", "Pop", "Jazz", "Latino"]
+    catalogo = [
+        Cancion(f"Tema {i}", f"Artista {i % 400}", "Disco", generos[i % 4], f"{i}.mp3", 200)
+        for i in range(20_000)
+    ]
+    pesos = [1 / (i + 1) for i in range(len(catalogo))]
+    usuarios = [f"u{i}@spotipy.com" for i in range(50_000)]
+
+    stats = EstadisticasReproduccion()
+    n = 500_000
+    elegidas = azar.choices(catalogo, weights=pesos, k=n)
+    ahora = time.time()
+    inicio = time.perf_counter()
+    for i, cancion in enumerate(elegidas):
+        stats.registrar(azar.choice(usuarios), cancion, ahora - (n - i) * 0.5)
+    print(f"{n:,} reproducciones: {(time.perf_counter() - inicio) / n * 1e6:.1f} µs cada una")
+
+    inicio = time.perf_counter()
+    print(f"Top canciones: {stats.top_canciones(3)}")
+    print(f"Top géneros:   {stats.top_generos(4)}")
+    print(f"Oyentes únicos: {stats.oyentes_unicos():,} (reales: {len(set(usuarios)):,})")
+    print(f"Oyentes de {catalogo[0]}: {stats.oyentes_unicos(catalogo[0]):,}")
+    print(f"HLL por canción: {stats.canciones_con_oyentes()} (k = {stats.canciones.k})")
+    print(f"Últimas 3 horas: {[c for _, c in stats.reproducciones_recientes(3, ahora)]}")
+    print(f"Consultas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
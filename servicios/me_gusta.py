@@ -0,0 +1,155 @@
+import sys
+import os
+import heapq
+import struct
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.usuario import Cliente
+from utils.mapa_bits import MapaBits, contar_por_valor
+from utils.excepciones import FormatoMeGustaInvalidoError, UsuarioNoEncontradoError
+
+# --- FORMATO DEL ARCHIVO ---
+# magic(4s) version(H) n_usuarios(I)
+# por usuario: largo_correo(H) correo(UTF-8) + MapaBits serializado
+MAGIC = b"NTFL"
+VERSION = 1
+CABECERA = struct.Struct("<4sHI")
+LARGO_CORREO = struct.Struct("<H")
+
+
+class AlmacenMeGusta:
+    """
+    Consultas sobre los "Me Gusta" de muchos clientes a la vez.
+    Cada Cliente guarda los suyos en un MapaBits (índices del catálogo);
+    aquí se cruzan entre usuarios, con géneros del catálogo y se persisten.
+    """
+
+    def __init__(self, catalogo):
+        self.__catalogo = catalogo
+        self.__generos = {}  # género -> (filas del catálogo al construirlo, MapaBits)
+
+    def mapa_genero(self, genero):
+        """Índices del catálogo con ese género (se calcula una vez por tamaño de catálogo)."""
+        total = len(self.__catalogo)
+        filas, mapa = self.__generos.get(genero, (0, None))
+        if mapa is None or filas != total:
+            mapa = MapaBits(i for i in range(total) if self.__catalogo.genero(i) == genero)
+            self.__generos[genero] = (total, mapa)
+        return mapa
+
+    def _canciones(self, mapa):
+        return [self.__catalogo[i] for i in mapa if i < len(self.__catalogo)]
+
+    def en_comun(self, cliente_a: Cliente, cliente_b: Cliente):
+        """Canciones que les gustan a ambos clientes."""
+        return self._canciones(cliente_a.me_gusta & cliente_b.me_gusta)
+
+    def del_genero(self, cliente: Cliente, genero):
+        """Canciones de un género que le gustan al cliente."""
+        return self._canciones(cliente.me_gusta & self.mapa_genero(genero))
+
+    def conteos(self, clientes):
+        """Cantidad de "Me Gusta" de cada canción del catálogo (array indexado por fila)."""
+        return contar_por_valor((c.me_gusta for c in clientes), len(self.__catalogo))
+
+    def mas_gustadas(self, clientes, k=10):
+        """Las k canciones con más "Me Gusta": [(cancion, cantidad), ...]."""
+        conteos = self.conteos(clientes)
+        mejores = heapq.nlargest(k, (i for i in range(len(conteos)) if conteos[i]),
+                                 key=conteos.__getitem__)
+        return [(self.__catalogo[i], conteos[i]) for i in mejores]
+
+    # --- Persistencia ---
+    @staticmethod
+    def guardar(ruta, clientes):
+        """Escribe los "Me Gusta" de los clientes (de forma atómica). Devuelve cuántos guardó."""
+        partes = []
+        for cliente in clientes:
+            correo = cliente.correo.encode("utf-8")
+            partes += [LARGO_CORREO.pack(len(correo)), correo, cliente.me_gusta.a_bytes()]
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(CABECERA.pack(MAGIC, VERSION, len(partes) // 3))
+            archivo.write(b"".join(partes))
+        os.replace(temporal, ruta)
+        return len(partes) // 3
+
+    @staticmethod
+    def cargar(ruta, repositorio):
+        """
+        Restaura los "Me Gusta" en los clientes del repositorio.
+        Los correos que ya no existen se ignoran. Devuelve cuántos clientes actualizó.
+        """
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        try:
+            magic, version, n = CABECERA.unpack_from(datos)
+            if magic != MAGIC or version != VERSION:
+                raise FormatoMeGustaInvalidoError(f"'{ruta}' no es un archivo de Me Gusta")
+            posicion = CABECERA.size
+            restaurados = 0
+            for _ in range(n):
+                (largo,) = LARGO_CORREO.unpack_from(datos, posicion)
+                posicion += LARGO_CORREO.size
+                correo = datos[posicion : posicion + largo].decode("utf-8")
+                mapa, posicion = MapaBits.desde_bytes(datos, posicion + largo)
+                try:
+                    cliente = repositorio.buscar_por_correo(correo)
+                except UsuarioNoEncontradoError:
+                    continue
+                if isinstance(cliente, Cliente):
+                    cliente.me_gusta = mapa
+                    restaurados += 1
+        except (struct.error, ValueError) as e:  # UnicodeDecodeError es un ValueError
+            raise FormatoMeGustaInvalidoError(f"'{ruta}' está dañado: {e}") from None
+        return restaurados
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import tempfile
+    import time
+    from modelos.catalogo import CatalogoColumnar
+    from servicios.repositorio_usuarios import UsuarioRepositorio
+    from utils import seguridad
+
+    seguridad.PARAMETROS_KDF.update(n=2, r=1)  # Aquí no medimos scrypt
+    azar = random.Random(8)
+    generos = ["Rock", "Pop", "Jazz", "Latino"]
+
+    catalogo = CatalogoColumnar()
+    for i in range(200_000):
+        catalogo.agregar(f"Tema {i}", f"Artista {i % 500}", "Disco", generos[i % 4], f"{i}.mp3", 200)
+
+    repo = UsuarioRepositorio()
+    clientes = [Cliente(f"U{i}", f"u{i}@spotipy.com", "x") for i in range(10_000)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for cliente in clientes:
+            repo.registrar(cliente)
+            # Gustos concentrados en una "zona" del catálogo, con canciones populares en común
+            for i in azar.sample(range(200), 20) + azar.sample(range(len(catalogo)), 30):
+                cliente.alternar_me_gusta(catalogo[i])
+
+    almacen = AlmacenMeGusta(catalogo)
+    print(f"En común U0/U1: {almacen.en_comun(clientes[0], clientes[1])}")
+    print(f"Jazz de U0: {len(almacen.del_genero(clientes[0], 'Jazz'))} canciones")
+
+    inicio = time.perf_counter()
+    top = almacen.mas_gustadas(clientes, k=3)
+    print(f"Top 3: {top} ({time.perf_counter() - inicio:.2f} s)")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "me_gusta.ntfl")
+        AlmacenMeGusta.guardar(ruta, clientes)
+        antes = [c.me_gusta for c in clientes]
+        print(f"Archivo: {os.path.getsize(ruta) / 1024:.0f} KiB para {len(clientes)} clientes")
+        restaurados = AlmacenMeGusta.cargar(ruta, repo)
+        assert restaurados == len(clientes)
+        assert all(a == c.me_gusta for a, c in zip(antes, clientes))
+        print("✅ Guardado y carga coinciden")
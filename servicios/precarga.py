@@ -0,0 +1,244 @@
+import sys
+import os
+import mmap
+import threading
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from utils.cache_arc import CacheARC
+from utils import metricas
+
+VARIABLE_CACHE = "SPOTIPY_CACHE_MB"  # Presupuesto de la caché de recursos (audio + portadas)
+VARIABLE_MMAP = "SPOTIPY_CACHE_MMAP"  # 1 = mapear los archivos en memoria en vez de leerlos
+CACHE_MB = 128
+EXTENSIONES_IMAGEN = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+_ACIERTOS = metricas.contador(
+    "spotipy_cache_recursos_aciertos_total", "Pedidos a la caché de recursos servidos desde memoria, por tipo"
+)
+_FALLOS = metricas.contador(
+    "spotipy_cache_recursos_fallos_total", "Pedidos a la caché de recursos que fueron al disco, por tipo"
+)
+_BYTES_DISCO = metricas.contador(
+    "spotipy_cache_recursos_bytes_leidos_total", "Bytes leídos de disco por la caché de recursos"
+)
+
+
+def _tipo(ruta):
+    return "portada" if ruta.lower().endswith(EXTENSIONES_IMAGEN) else "audio"
+
+
+class CacheRecursos:
+    """
+    Caché compartida de archivos (pistas y portadas) con presupuesto en bytes y
+    expulsión ARC (ver utils/cache_arc.py): lo que se repite no vuelve al disco.
+    - obtener(ruta): desde memoria (acierto) o leyendo el archivo (fallo), que queda guardado.
+    - precargar(ruta): lo mismo, pero sin contar como uso (lo llama el hilo de precarga).
+    Con usar_mmap el archivo se mapea en memoria y se entrega un memoryview: el kernel
+    lee las páginas bajo demanda y puede reclamarlas, no ocupan el heap de Python.
+    """
+
+    def __init__(self, capacidad_bytes=None, usar_mmap=None):
+        if capacidad_bytes is None:
+            capacidad_bytes = int(float(os.environ.get(VARIABLE_CACHE, CACHE_MB)) * 2**20)
+        if usar_mmap is None:
+            usar_mmap = os.environ.get(VARIABLE_MMAP) == "1"
+        self.usar_mmap = usar_mmap
+        self.__arc = CacheARC(capacidad_bytes)
+        self.__candado = threading.Lock()
+        self.__precargadas = set()  # Guardadas por la precarga y todavía sin pedir
+        self.__stats = dict.fromkeys(("aciertos", "fallos", "precargas", "bytes_leidos"), 0)
+
+    @property
+    def capacidad_bytes(self):
+        return self.__arc.capacidad
+
+    def __contains__(self, ruta):
+        with self.__candado:
+            return ruta in self.__arc
+
+    def _leer(self, ruta):
+        with open(ruta, "rb") as archivo:
+            if not self.usar_mmap:
+                return archivo.read()
+            try:
+                return memoryview(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:
+                return b""  # Archivo vacío: no se puede mapear
+
+    def obtener(self, ruta):
+        """Contenido de 'ruta' (bytes, o memoryview con mmap). Lanza OSError si no se puede leer."""
+        with self.__candado:
+            # Lo precargado entra como "visto una vez": el primer pedido real no lo asciende a frecuente
+            precargada = ruta in self.__precargadas
+            datos = self.__arc.obtener(ruta, recencia=not precargada)
+            if datos is not None:
+                self.__precargadas.discard(ruta)
+                self.__stats["aciertos"] += 1
+        if datos is not None:
+            _ACIERTOS.inc(tipo=_tipo(ruta))
+            return datos
+
+        # La lectura se hace FUERA del candado para no frenar a los demás hilos
+        datos = self._leer(ruta)
+        with self.__candado:
+            self.__stats["fallos"] += 1
+            self.__stats["bytes_leidos"] += len(datos)
+            self.__arc.guardar(ruta, datos, len(datos))
+        _FALLOS.inc(tipo=_tipo(ruta))
+        _BYTES_DISCO.inc(len(datos))
+        return datos
+
+    def precargar(self, ruta):
+        """Deja 'ruta' en memoria sin contarla como uso. Devuelve False si no se pudo leer."""
+        if ruta in self:
+            return True
+        try:
+            datos = self._leer(ruta)
+        except OSError:
+            return False
+        with self.__candado:
+            if ruta not in self.__arc:
+                self.__arc.guardar(ruta, datos, len(datos))
+                self.__precargadas.add(ruta)
+                self.__stats["precargas"] += 1
+                self.__stats["bytes_leidos"] += len(datos)
+                if len(self.__precargadas) > 2 * len(self.__arc) + 16:
+                    # Las expulsadas sin haberse pedido nunca ya no cuentan
+                    self.__precargadas = {r for r in self.__precargadas if r in self.__arc}
+        _BYTES_DISCO.inc(len(datos))
+        return True
+
+    def estadisticas(self):
+        """Aciertos, fallos, bytes leídos de disco y ocupación."""
+        with self.__candado:
+            stats = dict(self.__stats)
+            stats.update(
+                entradas=len(self.__arc),
+                bytes_usados=self.__arc.bytes_usados,
+                capacidad_bytes=self.__arc.capacidad,
+                expulsiones=self.__arc.expulsiones,
+                objetivo_recientes_bytes=round(self.__arc.p),
+            )
+        pedidos = stats["aciertos"] + stats["fallos"]
+        stats["tasa_aciertos"] = stats["aciertos"] / pedidos if pedidos else 0.0
+        return stats
+
+    def vaciar(self):
+        with self.__candado:
+            self.__arc.vaciar()
+            self.__precargadas.clear()
+
+
+_cache_compartida = None
+_candado_cache = threading.Lock()
+
+
+def cache_compartida():
+    """La caché de recursos del proceso (todos los reproductores la comparten)."""
+    global _cache_compartida
+    if _cache_compartida is None:
+        with _candado_cache:
+            if _cache_compartida is None:
+                _cache_compartida = CacheRecursos()
+    return _cache_compartida
+
+
+class PrecargadorAudio:
+    """
+    Etapa de precarga (prefetch) en segundo plano.
+    Un hilo trabajador lee de disco las próximas pistas de la cola (y sus portadas)
+    y las deja en la caché de recursos. Así, al cambiar de canción el reproductor
+    carga desde RAM y no espera al disco.
+    """
+
+    def __init__(self, cache=None, pistas_adelante=2):
+        self.cache = cache or cache_compartida()
+        self.pistas_adelante = pistas_adelante
+        self.__pendientes = []  # Rutas que el hilo debe leer, en orden de prioridad
+        self.__condicion = threading.Condition()
+        self.__activo = True
+        self.__hilo = threading.Thread(
+            target=self._trabajar, name="spotipy-precarga", daemon=True
+        )
+        self.__hilo.start()
+
+    def programar(self, rutas, portadas=()):
+        """
+        Indica qué pistas vienen a continuación (reemplaza el plan anterior).
+        Solo se leen las primeras 'pistas_adelante' que no estén ya en memoria;
+        las portadas van después de las pistas.
+        """
+        pendientes = list(rutas)[: self.pistas_adelante] + list(portadas)
+        pendientes = [r for r in dict.fromkeys(pendientes) if r not in self.cache]
+        with self.__condicion:
+            self.__pendientes = pendientes
+            self.__condicion.notify()
+
+    def obtener(self, ruta):
+        """Contenido de 'ruta' desde la caché (si la precarga no llegó, se lee ahora)."""
+        return self.cache.obtener(ruta)
+
+    def detener(self):
+        with self.__condicion:
+            self.__activo = False
+            self.__condicion.notify()
+        self.__hilo.join(timeout=1)
+
+    def _trabajar(self):
+        while True:
+            with self.__condicion:
+                while self.__activo and not self.__pendientes:
+                    self.__condicion.wait()
+                if not self.__activo:
+                    return
+                ruta = self.__pendientes.pop(0)
+
+            # Si no se puede leer, el reproductor caerá a modo simulación por su cuenta
+            self.cache.precargar(ruta)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    carpeta = tempfile.mkdtemp()
+    rutas = []
+    for i in range(12):
+        rutas.append(os.path.join(carpeta, f"pista{i:02}.mp3"))
+        with open(rutas[-1], "wb") as archivo:
+            archivo.write(os.urandom(4 * 2**20))  # 4 MiB, como un MP3 de ~4 min
+    portada = os.path.join(carpeta, "album.jpg")
+    with open(portada, "wb") as archivo:
+        archivo.write(os.urandom(200 * 1024))
+
+    for usar_mmap in (False, True):
+        cache = CacheRecursos(capacidad_bytes=32 * 2**20, usar_mmap=usar_mmap)
+        inicio = time.perf_counter()
+        # Tres favoritas que vuelven una y otra vez entre pistas que suenan una sola vez
+        for vuelta in range(30):
+            for ruta in rutas[:3]:
+                cache.obtener(ruta)
+                cache.obtener(portada)
+            cache.obtener(rutas[3 + vuelta % 9])
+        segundos = time.perf_counter() - inicio
+        stats = cache.estadisticas()
+        assert stats["bytes_usados"] <= stats["capacidad_bytes"]
+        print(
+            f"{'mmap' if usar_mmap else 'read'}: {stats['tasa_aciertos']:.0%} aciertos, "
+            f"{stats['bytes_leidos'] / 2**20:.0f} MiB de disco para "
+            f"{(stats['aciertos'] + stats['fallos'])} pedidos, {segundos * 1000:.0f} ms"
+        )
+
+    # Precarga: la pista ya está en memoria cuando se la pide
+    cache = CacheRecursos(capacidad_bytes=32 * 2**20)
+    precarga = PrecargadorAudio(cache)
+    precarga.programar(rutas[:2], [portada])
+    while rutas[1] not in cache or portada not in cache:
+        time.sleep(0.001)
+    precarga.obtener(rutas[0])
+    print(f"Tras precargar: {cache.estadisticas()['aciertos']} acierto(s), {cache.estadisticas()['fallos']} fallo(s)")
+    precarga.detener()
@@ -0,0 +1,319 @@
+import sys
+import os
+import math
+import random
+from collections import deque
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+# NumPy/SciPy son opcionales: sin ellos usamos una versión en Python puro (más lenta)
+try:
+    import numpy as np
+    from scipy import sparse
+
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    NUMPY_DISPONIBLE = False
+
+from modelos.multimedia import Cancion, Playlist
+from utils.excepciones import CancionNoEncontradaError, ListaVaciaError
+
+
+class Recomendador:
+    """
+    Recomendaciones a partir de las playlists de los usuarios.
+    - Co-ocurrencia: dos canciones son "parecidas" si aparecen juntas en muchas
+      playlists (matriz dispersa canción x canción, normalizada tipo coseno).
+    - Contenido: bonus por mismo artista y mismo género.
+    Con NumPy/SciPy el puntaje se calcula vectorizado sobre todo el catálogo.
+    """
+
+    PESO_ARTISTA = 0.3
+    PESO_GENERO = 0.1
+    # Dos canciones co-ocurren si están a menos de VENTANA posiciones en la playlist:
+    # una playlist de L pistas aporta O(L * VENTANA) pares y no O(L²)
+    VENTANA = 50
+
+    def __init__(self):
+        self.__canciones = []  # id -> Cancion
+        self.__ids = {}  # Cancion -> id
+        self.__entrenado = False
+        self.__firma = None  # Con qué playlists (y versión) y qué catálogo se entrenó
+
+    def __len__(self):
+        return len(self.__canciones)
+
+    @property
+    def entrenado(self):
+        return self.__entrenado
+
+    def _id(self, cancion):
+        id_cancion = self.__ids.get(cancion)
+        if id_cancion is None:
+            id_cancion = self.__ids[cancion] = len(self.__canciones)
+            self.__canciones.append(cancion)
+        return id_cancion
+
+    def _id_existente(self, cancion):
+        id_cancion = self.__ids.get(cancion)
+        if id_cancion is None:
+            raise CancionNoEncontradaError(f"'{cancion.titulo}' no está en el modelo de recomendaciones")
+        return id_cancion
+
+    def entrenar(self, playlists, catalogo=()):
+        """
+        Construye el modelo desde cero con todas las playlists (y opcionalmente el catálogo).
+        Acepta Playlist o secuencias de canciones (ej.: Playlist.instantanea()).
+        """
+        self.__canciones, self.__ids = [], {}
+        for cancion in catalogo:
+            self._id(cancion)
+        # Cada playlist cuenta una vez por canción (sin duplicados)
+        listas = [
+            list(dict.fromkeys(self._id(c) for c in (pl.canciones if isinstance(pl, Playlist) else pl)))
+            for pl in playlists
+        ]
+
+        artistas, generos = {}, {}
+        self.__artista_de = [artistas.setdefault(c.artista, len(artistas)) for c in self.__canciones]
+        self.__genero_de = [generos.setdefault(c.genero, len(generos)) for c in self.__canciones]
+
+        if NUMPY_DISPONIBLE:
+            self._entrenar_numpy(listas, len(artistas), len(generos))
+        else:
+            self._entrenar_python(listas)
+        self.__entrenado = True
+        self.__firma = None
+
+    @staticmethod
+    def _firma(playlists, catalogo):
+        return len(catalogo), [(pl, pl.version) for pl in playlists]
+
+    def _firma_vigente(self, firma):
+        if self.__firma is None or firma[0] != self.__firma[0] or len(firma[1]) != len(self.__firma[1]):
+            return False
+        return all(
+            pl is anterior and version == version_anterior
+            for (pl, version), (anterior, version_anterior) in zip(firma[1], self.__firma[1])
+        )
+
+    def actualizar(self, playlists, catalogo=()):
+        """
+        Entrena solo si hace falta: la primera vez, o si desde el último actualizar()
+        se creó, borró o editó alguna playlist o cambió el tamaño del catálogo.
+        Comprobarlo es O(playlists), sin recorrer canciones. Devuelve True si reentrenó.
+        """
+        playlists = list(playlists)
+        firma = self._firma(playlists, catalogo)
+        if self.__entrenado and self._firma_vigente(firma):
+            return False
+        self.entrenar(playlists, catalogo)
+        self.__firma = firma
+        return True
+
+    def preparar(self, playlists, catalogo=()):
+        """
+        Para entrenar fuera del hilo de la interfaz. Devuelve None si el modelo está al
+        día; si no, una función sin argumentos que entrena y devuelve un Recomendador
+        NUEVO con las playlists tal como están ahora (instantáneas O(1)). Mientras
+        tanto este sigue respondiendo, y las radios ya creadas siguen con él.
+        """
+        playlists = list(playlists)
+        firma = self._firma(playlists, catalogo)
+        if self.__entrenado and self._firma_vigente(firma):
+            return None
+        fotos = [pl.instantanea() for pl in playlists]
+
+        def entrenar():
+            nuevo = Recomendador()
+            nuevo.entrenar(fotos, catalogo)
+            nuevo.__firma = firma
+            return nuevo
+
+        return entrenar
+
+    def _entrenar_numpy(self, listas, n_artistas, n_generos):
+        n = len(self.__canciones)
+        filas = np.repeat(np.arange(len(listas)), [len(l) for l in listas])
+        columnas = np.fromiter((i for l in listas for i in l), dtype=np.int64, count=len(filas))
+        # Pares a distancia 1..VENTANA dentro de la misma playlist (en ambos sentidos)
+        origenes, destinos = [], []
+        for d in range(1, self.VENTANA + 1):
+            misma = filas[:-d] == filas[d:]
+            if not misma.any():
+                break  # Ninguna playlist es tan larga
+            origenes += [columnas[:-d][misma], columnas[d:][misma]]
+            destinos += [columnas[d:][misma], columnas[:-d][misma]]
+        origenes = np.concatenate(origenes) if origenes else np.zeros(0, dtype=np.int64)
+        destinos = np.concatenate(destinos) if destinos else np.zeros(0, dtype=np.int64)
+        cooc = sparse.csr_matrix(
+            (np.ones(len(origenes), dtype=np.float32), (origenes, destinos)), shape=(n, n)
+        )  # Los pares repetidos se suman
+        # Normalización coseno: C[i,j] / sqrt(frecuencia_i * frecuencia_j)
+        frecuencia = np.bincount(columnas, minlength=n).astype(np.float32)
+        inversa = np.zeros(n, dtype=np.float32)
+        np.divide(1.0, np.sqrt(frecuencia), out=inversa, where=frecuencia > 0)
+        escala = sparse.diags(inversa)
+        cooc = (escala @ cooc @ escala).tocsr()  # Sin diagonal: los pares son de canciones distintas
+        self.__cooc = cooc
+        self.__artistas_np = np.asarray(self.__artista_de, dtype=np.int64)
+        self.__generos_np = np.asarray(self.__genero_de, dtype=np.int64)
+        self.__n_artistas, self.__n_generos = n_artistas, n_generos
+
+    def _entrenar_python(self, listas):
+        cooc = {}
+        frecuencia = [0] * len(self.__canciones)
+        ventana = self.VENTANA
+        for lista in listas:
+            for posicion, i in enumerate(lista):
+                frecuencia[i] += 1
+                vecinos = cooc.setdefault(i, {})
+                for j in lista[max(0, posicion - ventana) : posicion + ventana + 1]:
+                    if i != j:
+                        vecinos[j] = vecinos.get(j, 0) + 1
+        self.__cooc = {
+            i: {j: c / math.sqrt(frecuencia[i] * frecuencia[j]) for j, c in vecinos.items()}
+            for i, vecinos in cooc.items()
+        }
+        self.__por_artista, self.__por_genero = {}, {}
+        for i in range(len(self.__canciones)):
+            self.__por_artista.setdefault(self.__artista_de[i], []).append(i)
+            self.__por_genero.setdefault(self.__genero_de[i], []).append(i)
+
+    # --- Puntajes ---
+    def _top(self, semillas, excluir, k):
+        """Los k ids mejor puntuados para un conjunto de canciones semilla."""
+        if not self.__entrenado:
+            raise ListaVaciaError("El recomendador no ha sido entrenado")
+        if NUMPY_DISPONIBLE:
+            return self._top_numpy(semillas, excluir, k)
+        return self._top_python(semillas, excluir, k)
+
+    def _top_numpy(self, semillas, excluir, k):
+        semillas = np.asarray(semillas, dtype=np.int64)
+        puntajes = np.asarray(self.__cooc[semillas].sum(axis=0)).ravel()
+        # Bonus de contenido proporcional a cuántas semillas comparten artista/género
+        peso_artista = np.bincount(self.__artistas_np[semillas], minlength=self.__n_artistas)
+        peso_genero = np.bincount(self.__generos_np[semillas], minlength=self.__n_generos)
+        puntajes += self.PESO_ARTISTA * peso_artista[self.__artistas_np] / len(semillas)
+        puntajes += self.PESO_GENERO * peso_genero[self.__generos_np] / len(semillas)
+        if excluir:
+            puntajes[np.fromiter(excluir, dtype=np.int64)] = -np.inf
+
+        k = min(k, int(np.isfinite(puntajes).sum()))
+        if k <= 0:
+            return []
+        mejores = np.argpartition(-puntajes, k - 1)[:k]
+        return mejores[np.argsort(-puntajes[mejores], kind="stable")].tolist()
+
+    def _top_python(self, semillas, excluir, k):
+        artistas = {}
+        generos = {}
+        for s in semillas:
+            artistas[self.__artista_de[s]] = artistas.get(self.__artista_de[s], 0) + 1
+            generos[self.__genero_de[s]] = generos.get(self.__genero_de[s], 0) + 1
+
+        # Candidatos: vecinos por co-ocurrencia y canciones de los mismos artistas
+        puntajes = {}
+        for s in semillas:
+            for j, valor in self.__cooc.get(s, {}).items():
+                puntajes[j] = puntajes.get(j, 0.0) + valor
+        for artista in artistas:
+            for j in self.__por_artista[artista]:
+                puntajes.setdefault(j, 0.0)
+        # Si faltan candidatos, completamos con canciones del mismo género
+        for genero in generos:
+            for j in self.__por_genero[genero]:
+                if len(puntajes) >= k + len(excluir):
+                    break
+                puntajes.setdefault(j, 0.0)
+
+        total = len(semillas)
+        candidatos = []
+        for j, valor in puntajes.items():
+            if j in excluir:
+                continue
+            valor += self.PESO_ARTISTA * artistas.get(self.__artista_de[j], 0) / total
+            valor += self.PESO_GENERO * generos.get(self.__genero_de[j], 0) / total
+            candidatos.append((-valor, j))
+        candidatos.sort()
+        return [j for _, j in candidatos[:k]]
+
+    # --- API pública ---
+    def similares(self, cancion: Cancion, k=10):
+        """Las k canciones más parecidas a una canción."""
+        i = self._id_existente(cancion)
+        return [self.__canciones[j] for j in self._top([i], {i}, k)]
+
+    def continuar_playlist(self, playlist: Playlist, k=10, ultimas=50):
+        """Sugerencias para seguir una playlist (según sus últimas 'ultimas' pistas)."""
+        ids = [self.__ids[c] for c in playlist.canciones if c in self.__ids]
+        if not ids:
+            raise ListaVaciaError(f"La playlist '{playlist.titulo}' no tiene canciones conocidas")
+        return [self.__canciones[j] for j in self._top(ids[-ultimas:], set(ids), k)]
+
+    def radio(self, semilla: Cancion, memoria=50, variedad=5, azar=None):
+        """
+        Generador infinito para el modo radio: cada canción se elige (con algo de azar
+        entre las 'variedad' mejores) a partir de las últimas escuchadas, sin repetir
+        las 'memoria' más recientes.
+        """
+        azar = azar or random.Random()
+        recientes = deque([self._id_existente(semilla)], maxlen=memoria)
+        yield semilla
+        while True:
+            ultimas = list(recientes)[-3:]
+            opciones = self._top(ultimas, set(recientes), variedad)
+            if not opciones:
+                # Catálogo agotado: permitimos repetir todo menos la actual
+                recientes = deque([recientes[-1]], maxlen=memoria)
+                opciones = self._top(ultimas, set(recientes), variedad)
+                if not opciones:
+                    opciones = [recientes[-1]]  # Solo existe una canción
+            elegida = azar.choice(opciones)
+            recientes.append(elegida)
+            yield self.__canciones[elegida]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import time
+    from itertools import islice
+
+    print(f"Backend: {'NumPy/SciPy' if NUMPY_DISPONIBLE else 'Python puro'}")
+    azar = random.Random(3)
+    generos = ["Rock", "Pop", "Jazz", "Latino"]
+    catalogo = [
+        Cancion(f"Tema {i}", f"Artista {i % 300}", "Disco", generos[i % 4], f"{i}.mp3", 200)
+        for i in range(20_000)
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        playlists = []
+        for p in range(2_000):
+            pl = Playlist(f"PL {p}", "sintética")
+            # Cada playlist se concentra en una "zona" del catálogo (gustos parecidos)
+            base = azar.randrange(len(catalogo) - 500)
+            for c in azar.sample(catalogo[base : base + 500], 40):
+                pl.agregar_cancion(c)
+            playlists.append(pl)
+
+    rec = Recomendador()
+    inicio = time.perf_counter()
+    rec.actualizar(playlists, catalogo)
+    print(f"Entrenamiento: {time.perf_counter() - inicio:.2f} s")
+    inicio = time.perf_counter()
+    assert not rec.actualizar(playlists, catalogo)  # Nada cambió: no se reentrena
+    print(f"Sin cambios: {(time.perf_counter() - inicio) * 1000:.2f} ms")
+    with contextlib.redirect_stdout(io.StringIO()):
+        playlists[0].agregar_cancion(catalogo[0])
+    assert rec.actualizar(playlists, catalogo)  # Una playlist editada sí
+
+    inicio = time.perf_counter()
+    similares = rec.similares(catalogo[1234], k=5)
+    print(f"Similares a {catalogo[1234]}: {similares} ({(time.perf_counter() - inicio) * 1000:.1f} ms)")
+    print(f"Continuar '{playlists[0].titulo}': {rec.continuar_playlist(playlists[0], k=5)}")
+    print(f"Radio: {list(islice(rec.radio(catalogo[1234]), 8))}")
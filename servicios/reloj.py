@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class RelojReal:
+    """Reloj de pared: el tiempo avanza solo y las tareas corren en hilos Timer."""
+
+    def ahora(self):
+        return time.monotonic()
+
+    def programar(self, segundos, callback, *args):
+        """Ejecuta callback(*args) dentro de 'segundos'. Devuelve un objeto con .cancel()."""
+        temporizador = threading.Timer(segundos, callback, args=args)
+        temporizador.daemon = True
+        temporizador.start()
+        return temporizador
+
+
+class _TareaVirtual:
+    __slots__ = ("callback", "args", "cancelada")
+
+    def __init__(self, callback, args):
+        self.callback = callback
+        self.args = args
+        self.cancelada = False
+
+    def cancel(self):
+        self.cancelada = True
+
+
+class RelojVirtual:
+    """
+    Reloj simulado: el tiempo solo avanza cuando se llama a avanzar().
+    Las tareas vencidas se ejecutan en orden, en el mismo hilo, así que
+    miles de horas de escucha se simulan en milisegundos y de forma determinista.
+    """
+
+    def __init__(self, inicio=0.0):
+        self.__ahora = inicio
+        self.__agenda = []  # heap de (momento, secuencia, tarea)
+        self.__secuencia = itertools.count()  # Desempate estable entre tareas simultáneas
+
+    def ahora(self):
+        return self.__ahora
+
+    def programar(self, segundos, callback, *args):
+        tarea = _TareaVirtual(callback, args)
+        heapq.heappush(
+            self.__agenda, (self.__ahora + max(0.0, segundos), next(self.__secuencia), tarea)
+        )
+        return tarea
+
+    def avanzar(self, segundos):
+        """Mueve el reloj 'segundos' hacia adelante disparando todo lo que venza por el camino."""
+        destino = self.__ahora + segundos
+        while self.__agenda and self.__agenda[0][0] <= destino:
+            momento, _, tarea = heapq.heappop(self.__agenda)
+            if tarea.cancelada:
+                continue
+            self.__ahora = momento
+            tarea.callback(*tarea.args)
+        self.__ahora = destino
+
+    def pendientes(self):
+        return sum(1 for _, _, tarea in self.__agenda if not tarea.cancelada)
+
+
+class RelojAsyncio:
+    """
+    Reloj sobre un event loop de asyncio: todas las tareas de todas las sesiones
+    se multiplexan con loop.call_later() en un solo hilo.
+    Solo debe usarse desde el hilo que corre el loop.
+    """
+
+    def __init__(self, loop=None):
+        if loop is None:
+            import asyncio  # Diferido: solo las sesiones lo usan y cuesta ~40 ms importarlo
+
+            loop = asyncio.get_running_loop()
+        self.__loop = loop
+
+    def ahora(self):
+        return self.__loop.time()
+
+    def programar(self, segundos, callback, *args):
+        return self.__loop.call_later(segundos, callback, *args)  # TimerHandle tiene .cancel()
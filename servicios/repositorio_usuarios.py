@@ -0,0 +1,125 @@
+import sys
+import os
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.usuario import Usuario, Cliente, Administrador
+from utils.excepciones import UsuarioNoEncontradoError, UsuarioYaRegistradoError
+
+
+def normalizar_correo(correo):
+    """Los correos no distinguen mayúsculas ni espacios sobrantes."""
+    return correo.strip().lower()
+
+
+class UsuarioRepositorio:
+    """
+    Base de datos de usuarios en RAM con índices hash.
+    - Índice principal: correo normalizado -> Usuario (búsqueda O(1)).
+    - Índices secundarios: por rol (Cliente/Administrador) y por estado bloqueado.
+    """
+
+    def __init__(self):
+        self.__por_correo = {}  # correo normalizado -> Usuario
+        # Usamos dicts (y no sets) para conservar el orden de registro en los menús
+        self.__por_rol = {Cliente: {}, Administrador: {}}
+        self.__bloqueados = {}
+
+    def __len__(self):
+        return len(self.__por_correo)
+
+    def __iter__(self):
+        return iter(self.__por_correo.values())
+
+    def __contains__(self, correo):
+        return normalizar_correo(correo) in self.__por_correo
+
+    def registrar(self, usuario: Usuario):
+        """Agrega un usuario. Lanza UsuarioYaRegistradoError si el correo existe."""
+        clave = normalizar_correo(usuario.correo)
+        if clave in self.__por_correo:
+            raise UsuarioYaRegistradoError(
+                f"Ya existe una cuenta registrada con {usuario.correo}"
+            )
+
+        self.__por_correo[clave] = usuario
+        self.__por_rol.setdefault(type(usuario), {})[clave] = usuario
+        if usuario.bloqueado:
+            self.__bloqueados[clave] = usuario
+
+        # El usuario nos avisa cuando un admin lo bloquea/desbloquea
+        usuario.al_cambiar_bloqueo = self._actualizar_bloqueo
+        return usuario
+
+    def eliminar(self, correo):
+        """Quita al usuario de todos los índices y lo devuelve."""
+        clave = normalizar_correo(correo)
+        usuario = self.__por_correo.pop(clave, None)
+        if usuario is None:
+            raise UsuarioNoEncontradoError(f"No existe cuenta con {correo}")
+
+        self.__por_rol[type(usuario)].pop(clave, None)
+        self.__bloqueados.pop(clave, None)
+        usuario.al_cambiar_bloqueo = None
+        return usuario
+
+    def buscar_por_correo(self, correo):
+        """Búsqueda O(1). Lanza UsuarioNoEncontradoError si no existe."""
+        usuario = self.__por_correo.get(normalizar_correo(correo))
+        if usuario is None:
+            raise UsuarioNoEncontradoError(f"No existe cuenta con {correo}")
+        return usuario
+
+    def listar_por_rol(self, rol):
+        """Usuarios de un rol exacto (Cliente o Administrador), en orden de registro."""
+        return list(self.__por_rol.get(rol, {}).values())
+
+    def clientes(self):
+        return self.listar_por_rol(Cliente)
+
+    def administradores(self):
+        return self.listar_por_rol(Administrador)
+
+    def bloqueados(self):
+        return list(self.__bloqueados.values())
+
+    def _actualizar_bloqueo(self, usuario):
+        """Callback interno: mantiene el índice de bloqueados sincronizado."""
+        clave = normalizar_correo(usuario.correo)
+        if usuario.bloqueado:
+            self.__bloqueados[clave] = usuario
+        else:
+            self.__bloqueados.pop(clave, None)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import time
+
+    repo = UsuarioRepositorio()
+    repo.registrar(Administrador("Jefa", "admin@spotipy.com", "admin123"))
+    carlos = repo.registrar(Cliente("Carlos", "Carlos@Gmail.com", "1234"))
+
+    print(f"Buscar 'carlos@gmail.com ': {repo.buscar_por_correo(' carlos@gmail.com ').nombre}")
+
+    try:
+        repo.registrar(Cliente("Impostor", "CARLOS@gmail.com", "0000"))
+    except UsuarioYaRegistradoError as e:
+        print(f"Error esperado capturado: {e}")
+
+    repo.administradores()[0].bloquear_usuario(carlos)
+    print(f"Bloqueados: {[u.nombre for u in repo.bloqueados()]}")
+
+    # Mini benchmark: 200k cuentas (KDF mínimo: aquí medimos el índice, no scrypt)
+    from utils import seguridad
+
+    seguridad.PARAMETROS_KDF.update(n=2, r=1)
+    for i in range(200_000):
+        repo.registrar(Cliente(f"User {i}", f"user{i}@spotipy.com", "x"))
+    inicio = time.perf_counter()
+    for i in range(0, 200_000, 2):
+        repo.buscar_por_correo(f"user{i}@spotipy.com")
+    total = time.perf_counter() - inicio
+    print(f"100k búsquedas en {len(repo)} usuarios: {total*1000:.1f} ms")
@@ -1,44 +1,201 @@
 import sys
 import os
+import math
 import time
+import statistics
+import threading
+import functools
+import itertools
+from bisect import bisect_right, insort
+from collections import deque
 
 # --- CONFIGURACIÓN DE RUTA ---
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # -----------------------------
 
-# Intentamos importar pygame. Si falla, avisamos pero no rompemos el programa inmediatamente
-try:
-    import pygame
-
-    PYGAME_DISPONIBLE = True
-except ImportError:
-    PYGAME_DISPONIBLE = False
-    print("⚠️ ADVERTENCIA: 'pygame-ce' no está instalado. El audio será 100% simulado.")
-
 from modelos.multimedia import Cancion, Playlist, Album
 from utils.excepciones import ListaVaciaError
+from servicios.audio import MotorAudio, crear_motor, validar_motor
+from servicios.precarga import PrecargadorAudio
+from servicios.reloj import RelojReal
+from utils.permutacion import PermutacionPerezosa
+from utils.cola_segmentada import ColaSegmentada
+from utils import metricas
+
+_LATENCIA_CARGA = metricas.histograma(
+    "spotipy_carga_audio_segundos", "Tiempo de cargar + reproducir en el motor de audio"
+)
+_REPRODUCCIONES = metricas.contador(
+    "spotipy_reproducciones_total", "Pistas iniciadas por modo (audio/simulacion)"
+)
+_FALLBACK_SIMULACION = metricas.contador(
+    "spotipy_fallback_simulacion_total", "Veces que se cayó a modo simulación, por motivo"
+)
+
+EVENTOS = (
+    "pista_iniciada",
+    "pista_terminada",
+    # Comandos del usuario (para la bitácora de reproducción)
+    "pausa",
+    "reanudacion",
+    "salto_siguiente",
+    "salto_anterior",
+    "busqueda",
+    "detenido",
+)
+REPETICIONES = ("todas", "una", "no")  # Repetir la cola, la pista actual o nada
+HISTORIAL_MAXIMO = 500  # Pistas recordadas para anterior()
+CARPETA_PORTADAS = "assets/portadas"  # Donde se buscan las img_portada que no son rutas absolutas
+
+
+def _sincronizado(metodo):
+    """Serializa el método con el candado del reproductor (el fin de pista llega desde otro hilo)."""
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado:
+            return metodo(self, *args, **kwargs)
+
+    return envoltura
 
 
 class Reproductor:
     """
     Fachada (Facade) para controlar la reproducción de audio.
-    Gestiona la cola de canciones y la interacción con la librería Pygame.
+    Gestiona la cola de canciones y la interacción con el motor de audio
+    (servicios/audio.py), que se elige e inicia recién en la primera reproducción.
     """
 
-    def __init__(self):
-        self.cola = []  # Lista de objetos Cancion
-        self.indice_actual = 0  # Cuál canción de la cola está sonando
+    def __init__(self, reloj=None, con_audio=True, motor=None, silencioso=False):
+        # Reloj enchufable: RelojReal (por defecto) o RelojVirtual para simular sin esperar
+        self.reloj = reloj or RelojReal()
+        # Motor: instancia de MotorAudio o nombre del registro (None -> SPOTIPY_AUDIO o "auto").
+        # Sin audio (headless): motor nulo, no lanza hilos; solo simula. Lo usan las sesiones.
+        if isinstance(motor, MotorAudio):
+            self.__motor, self.__nombre_motor = motor, motor.nombre
+        else:
+            self.__motor = None
+            self.__nombre_motor = validar_motor("nulo" if not con_audio else motor)
+        # Silencioso: no anuncia nada por consola (sesiones headless); los avisos ⚠️ sí salen
+        self.silencioso = silencioso
+        self.cola = []  # Contexto: canciones del origen cargado (Cancion, Playlist o Album)
+        self.indice_actual = 0  # Última posición del contexto que empezó a sonar
+        self.__actual = None  # Canción sonando (puede venir del contexto o de la cola del usuario)
         self.reproduciendo = False  # Estado del reproductor.
         global start_time
+        # Precarga en segundo plano de las próximas pistas (se crea junto con un motor real)
+        self.precarga = None
+        if self.__motor is not None and not self.__motor.simulado:
+            self.precarga = PrecargadorAudio()  # Motor ya iniciado que nos pasaron
+        # Métricas de latencia en ms (las últimas 1000 muestras)
+        self.metricas = {
+            "primer_audio_ms": deque(maxlen=1000),
+            "hueco_ms": deque(maxlen=1000),
+            "busqueda_ms": deque(maxlen=1000),
+        }
+        self._inicio_transicion = None  # Cuándo se pidió el cambio de pista
+        # Fin de pista por eventos: un temporizador (sin sondeo) dispara siguiente()
+        self._candado = threading.RLock()
+        self.__temporizador = None
+        self.__fin_previsto = None  # Momento (según self.reloj) en el que acabará la pista
+        self.__restante = None  # Segundos que faltaban al pausar
+        self.__posicion_pausa = None  # Segundos escuchados al pausar
+        self.start_time = self.reloj.ahora()
+        self.__observadores = {evento: [] for evento in EVENTOS}
+        self.__radio = None  # Generador de canciones del modo radio (si está activo)
+        # Orden de reproducción: la cola nunca se reordena, solo se recorre en otro orden
+        self.aleatorio = False
+        self.repeticion = "todas"
+        self.__orden = None  # PermutacionPerezosa de índices de la cola (modo aleatorio)
+        self.__paso = 0  # Posición dentro del orden
+        # Quitado de la cola por el usuario (aún pendiente): paso del orden -> índice del contexto,
+        # más los pasos ordenados para ubicar posiciones con bisect
+        self.__omitidos = {}
+        self.__pasos_omitidos = []
+        self.__omitidos_atras = []  # Índices quitados que quedaron detrás al salir del aleatorio
+        self.__historial = deque(maxlen=HISTORIAL_MAXIMO)  # Canciones ya sonadas (para anterior)
+        # Cola del usuario por segmentos (sin aplanar playlists):
+        # "a continuación" suena antes que el resto del contexto, "agregadas" después
+        self.__a_continuacion = ColaSegmentada()
+        self.__agregadas = ColaSegmentada()
+        self.volumen = 0.5
+        # Normalización por pista (ej.: AnalizadorSonoridad): algo con .factor(ruta).
+        # Se consulta al cargar; el análisis nunca corre en el camino de reproducción.
+        self.normalizacion = None
+        self.__factor_pista = 1.0
+        # Índices de búsqueda de los MP3 (ej.: EscanerBiblioteca): algo con .indice_busqueda(ruta)
+        self.indices_busqueda = None
+
+    # --- Motor de audio (perezoso) ---
+    @property
+    def motor(self):
+        """El motor de audio, iniciado la primera vez que se pide (no al construir)."""
+        if self.__motor is None:
+            with self._candado:
+                if self.__motor is None:
+                    motor = crear_motor(self.__nombre_motor, self.volumen)
+                    if not motor.simulado and self.precarga is None:
+                        self.precarga = PrecargadorAudio()
+                    self.__motor = motor
+        return self.__motor
+
+    # --- Observadores ---
+    def suscribir(self, evento, callback):
+        """Registra callback(reproductor, cancion) para uno de los EVENTOS."""
+        if evento not in self.__observadores:
+            raise ValueError(f"Evento desconocido: {evento}. Opciones: {EVENTOS}")
+        self.__observadores[evento].append(callback)
+
+    def _emitir(self, evento, cancion):
+        for callback in self.__observadores[evento]:
+            try:
+                callback(self, cancion)
+            except Exception as e:
+                print(f"⚠️ Observador de '{evento}' falló: {e}")
+
+    def _mostrar(self, *texto):
+        if not self.silencioso:
+            print(*texto)
+
+    # --- Fin de pista ---
+    def _programar_fin(self, segundos):
+        """Agenda el fin de la pista actual en el reloj. Esperar no consume CPU."""
+        self._cancelar_fin()
+        if segundos <= 0:
+            return  # Duración desconocida: dependemos del aviso de fin del motor
+        self.__fin_previsto = self.reloj.ahora() + segundos
+        self.__temporizador = self.reloj.programar(
+            segundos, self._al_terminar_pista, self.__fin_previsto
+        )
+
+    def _cancelar_fin(self):
+        if self.__temporizador is not None:
+            self.__temporizador.cancel()
+        self.__temporizador = None
+        self.__fin_previsto = None
+
+    def _al_terminar_pista(self, fin_previsto=None):
+        """La pista terminó: avisamos a los observadores y avanzamos solos."""
+        with self._candado:
+            # Ignoramos temporizadores viejos (la pista cambió o se pausó entretanto)
+            if fin_previsto is not None and fin_previsto != self.__fin_previsto:
+                return
+            if self.__actual is None or not self.reproduciendo:
+                return
+            self.__fin_previsto = None
+            self._emitir("pista_terminada", self.__actual)
+            self._avanzar(automatico=True)
 
-        # Inicializar motor de audio si es posible
-        if PYGAME_DISPONIBLE:
-            pygame.mixer.init()
-            self.volumen = 0.5
-            pygame.mixer.music.set_volume(self.volumen)
-        else:
-            self.volumen = 0.0
+    def procesar_eventos(self):
+        """
+        Para aplicaciones con bucle de eventos: atiende los avisos de fin de pista
+        del motor para pistas cuya duración no conocemos (duracion == 0).
+        """
+        if self.__motor is not None and self.__temporizador is None:
+            for _ in range(self.__motor.fines_pendientes()):
+                self._al_terminar_pista()
 
+    @_sincronizado
     def cargar_origen(self, recurso):
         """
         Recibe un objeto (Cancion, Playlist o Album) y prepara la cola.
@@ -46,159 +203,637 @@ class Reproductor:
         self.detener()  # Limpiamos lo anterior
         self.cola = []
         self.indice_actual = 0
+        self.__actual = None
+        self.__radio = None
+        self._limpiar_omitidos()
+        self.__historial.clear()
+        self.__a_continuacion.vaciar()
+        self.__agregadas.vaciar()
 
         # POLIMORFISMO: Detectamos qué nos mandaron
         if isinstance(recurso, Cancion):
             self.cola.append(recurso)
-            print(f"💿 Reproductor: Cargado sencillo '{recurso.titulo}'")
+            self._mostrar(f"💿 Reproductor: Cargado sencillo '{recurso.titulo}'")
 
         elif isinstance(recurso, (Playlist, Album)):
             # Usamos el método reproducir() de la clase para obtener la lista
             try:
-                lista_canciones = recurso.reproducir()  # Esto devuelve la lista
+                # Instantánea inmutable (sin copiar): aleatorio no toca la playlist del usuario
+                lista_canciones = recurso.reproducir(self.silencioso)
                 self.cola = lista_canciones
-                print(
+                self._mostrar(
                     f"📚 Reproductor: Cargada lista '{recurso.titulo}' ({len(self.cola)} canciones)"
                 )
             except ListaVaciaError as e:
-                print(f"❌ Error: {e}")
+                self._mostrar(f"❌ Error: {e}")
                 return
 
         # Iniciamos automáticamente
         if self.cola:
+            self._reiniciar_orden()
+            self.indice_actual = self._indice_en_orden(0)
+            self.__actual = self.cola[self.indice_actual]
             self._reproducir_actual()
 
+    @_sincronizado
     def _reproducir_actual(self):
-        """Método interno para procesar la canción actual de la cola."""
-        if not self.cola:
+        """Método interno para procesar la canción actual."""
+        if self.__actual is None:
             return
 
-        cancion_actual = self.cola[self.indice_actual]
+        t0 = time.perf_counter()
+        cancion_actual = self.__actual
         ruta = cancion_actual.ruta_archivo
 
-        print(f"\n▶️ REPRODUCIENDO: {cancion_actual.titulo} - {cancion_actual.artista}")
+        self._mostrar(f"\n▶️ REPRODUCIENDO: {cancion_actual.titulo} - {cancion_actual.artista}")
 
         # --- Lógica Híbrida ---
         # Guardamos el tiempo de inicio (para el modo simulación o fallback)
-        self.start_time = time.time()
+        self.start_time = self.reloj.ahora()
+        self.__posicion_pausa = None
+        self.__restante = None  # Lo que faltaba de una pista pausada antes no aplica a esta
 
-        if PYGAME_DISPONIBLE and os.path.exists(ruta):
+        motor = self.motor
+        if not motor.simulado and os.path.exists(ruta):
             try:
-                pygame.mixer.music.load(ruta)
-                pygame.mixer.music.play()
+                precargada = ruta in self.precarga.cache
+                datos = self.precarga.obtener(ruta)  # Desde la caché de recursos; un fallo va al disco
+                with _LATENCIA_CARGA.medir(precargada=precargada):
+                    motor.cargar(ruta, datos)
+                    self.__factor_pista = self.normalizacion.factor(ruta) if self.normalizacion else 1.0
+                    motor.cambiar_volumen(self._volumen_efectivo())
+                    motor.fines_pendientes()  # Descartamos avisos de fin de pistas anteriores
+                    motor.reproducir()
                 self.reproduciendo = True
+                _REPRODUCCIONES.inc(modo="audio")
             except Exception as e:
-                print(f"⚠️ Error técnico con Pygame: {e}. Pasando a modo simulación.")
+                print(f"⚠️ Error técnico con el motor '{motor.nombre}': {e}. Pasando a modo simulación.")
                 self.reproduciendo = True
+                _REPRODUCCIONES.inc(modo="simulacion")
+                _FALLBACK_SIMULACION.inc(motivo=type(e).__name__)
         else:
             # Modo Simulación
-            print(f"   (Modo Simulación: Archivo no encontrado o Pygame ausente)")
-            print("   🎶 [Suena música imaginaria] 🎶")
+            _REPRODUCCIONES.inc(modo="simulacion")
+            _FALLBACK_SIMULACION.inc(motivo="sin_audio" if motor.simulado else "sin_archivo")
+            self._mostrar(f"   (Modo Simulación: Archivo no encontrado o motor sin audio)")
+            self._mostrar("   🎶 [Suena música imaginaria] 🎶")
             self.reproduciendo = True
 
+        self._registrar_latencias(t0)
+        self._programar_fin(cancion_actual.duracion)
+        self._programar_precarga()
+        self._emitir("pista_iniciada", cancion_actual)
+
+    def _registrar_latencias(self, t0):
+        """Guarda el tiempo hasta el primer audio y, si hubo cambio de pista, el hueco."""
+        ahora = time.perf_counter()
+        self.metricas["primer_audio_ms"].append((ahora - t0) * 1000)
+        if self._inicio_transicion is not None:
+            self.metricas["hueco_ms"].append((ahora - self._inicio_transicion) * 1000)
+            self._inicio_transicion = None
+
+    def _programar_precarga(self):
+        """Pide al hilo de precarga las próximas pistas (y sus portadas), en el orden en que van a sonar."""
+        if self.precarga is None:
+            return
+        proximas = self.proximas(self.precarga.pistas_adelante)
+        actual = [self.__actual] if self.__actual is not None else []
+        self.precarga.programar(
+            (c.ruta_archivo for c in proximas),
+            portadas=[self._ruta_portada(c) for c in actual + proximas],
+        )
+
+    @staticmethod
+    def _ruta_portada(cancion):
+        return os.path.join(CARPETA_PORTADAS, cancion.img_portada)
+
+    def portada_actual(self):
+        """Bytes de la portada de la pista actual (de la caché de recursos) o None si no hay."""
+        if self.__actual is None or self.precarga is None:
+            return None
+        try:
+            return self.precarga.obtener(self._ruta_portada(self.__actual))
+        except OSError:
+            return None
+
+    def resumen_latencias(self):
+        """Mediana y p95 (ms) de cada métrica de latencia."""
+        resumen = {}
+        for nombre, muestras in self.metricas.items():
+            if muestras:
+                ordenadas = sorted(muestras)
+                resumen[nombre] = {
+                    "p50": statistics.median(ordenadas),
+                    "p95": ordenadas[math.ceil(0.95 * len(ordenadas)) - 1],
+                    "n": len(ordenadas),
+                }
+        return resumen
+
+    @_sincronizado
     def pausar(self):
-        if PYGAME_DISPONIBLE and self.reproduciendo:
-            pygame.mixer.music.pause()
-            self.reproduciendo = False
-            print("⏸️ Pausado")
+        if not self.reproduciendo:
+            return
+        # Guardamos lo que falta y soltamos el temporizador: pausado no consume CPU
+        if self.__fin_previsto is not None:
+            self.__restante = max(0.0, self.__fin_previsto - self.reloj.ahora())
+        self.__posicion_pausa = self.reloj.ahora() - self.start_time
+        self._cancelar_fin()
+        self.reproduciendo = False
+        self._emitir("pausa", self.__actual)
+        if not self.motor.simulado:
+            self.motor.pausar()
+            self._mostrar("⏸️ Pausado")
         else:
-            print("⏸️ (Simulación) Pausado")
+            self._mostrar("⏸️ (Simulación) Pausado")
 
+    @_sincronizado
     def despausar(self):
-        if PYGAME_DISPONIBLE and not self.reproduciendo:
-            pygame.mixer.music.unpause()
-            self.reproduciendo = True
-            print("▶️ Reanudando")
+        if self.reproduciendo or self.__actual is None:
+            return
+        self.reproduciendo = True
+        if self.__posicion_pausa is not None:
+            # El tiempo en pausa no cuenta como escuchado
+            self.start_time = self.reloj.ahora() - self.__posicion_pausa
+            self.__posicion_pausa = None
+        if self.__restante is not None:
+            self._programar_fin(self.__restante)
+            self.__restante = None
+        self._emitir("reanudacion", self.__actual)
+        if not self.motor.simulado:
+            self.motor.reanudar()
+            self._mostrar("▶️ Reanudando")
         else:
-            print("▶️ (Simulación) Reanudando")
+            self._mostrar("▶️ (Simulación) Reanudando")
 
+    @_sincronizado
     def detener(self):
-        if PYGAME_DISPONIBLE:
-            pygame.mixer.music.stop()
+        if self.__actual is not None and (self.reproduciendo or self.__posicion_pausa is not None):
+            self._emitir("detenido", self.__actual)
+        self._cancelar_fin()
+        self.__restante = None
+        self.__posicion_pausa = None
+        self._inicio_transicion = None  # Un cambio pedido que terminó en stop no es un hueco
+        if self.__motor is not None:  # Si nunca sonó nada, no hace falta iniciar el motor
+            self.__motor.detener()
         self.reproduciendo = False
-        print("⏹️ Detenido")
+        self._mostrar("⏹️ Detenido")
 
+    @_sincronizado
+    def cargar_radio(self, generador):
+        """
+        Modo radio: la cola no termina nunca. Las canciones se piden de una en una
+        al generador (ej.: Recomendador.radio) en vez de volver al índice 0.
+        """
+        self.detener()
+        self.__radio = iter(generador)
+        primera = next(self.__radio, None)
+        if primera is None:
+            self.__radio = None
+            self._mostrar("❌ Error: La radio no tiene canciones para sonar.")
+            return
+        self.cola = [primera]
+        self.indice_actual = 0
+        self.__actual = primera
+        self.__orden = None  # La radio ya elige el orden: no se mezcla
+        self.__paso = 0
+        self._limpiar_omitidos()
+        self.__historial.clear()
+        self.__a_continuacion.vaciar()
+        self.__agregadas.vaciar()
+        self._mostrar(f"📻 Reproductor: Radio iniciada desde '{primera.titulo}'")
+        self._reproducir_actual()
+
+    @_sincronizado
     def siguiente(self):
-        """Pasa a la siguiente canción de la cola."""
-        if self.indice_actual < len(self.cola) - 1:
-            self.indice_actual += 1
+        """Pasa a la siguiente canción de la cola (salto pedido por el usuario)."""
+        if self.__actual is not None:
+            self._emitir("salto_siguiente", self.__actual)
+        self._avanzar()
+
+    def _avanzar(self, automatico=False):
+        self._inicio_transicion = time.perf_counter()
+        if automatico and self.repeticion == "una":
             self._reproducir_actual()
+        elif self.__a_continuacion:
+            self._cambiar_a(self.__a_continuacion.quitar(0))
+        elif (indice := self._siguiente_del_contexto()) is not None:
+            self._cambiar_a(self.cola[indice], indice)
+        elif self.__agregadas:
+            self._cambiar_a(self.__agregadas.quitar(0))
+        elif self.__radio is not None and (proxima := next(self.__radio, None)) is not None:
+            self.cola.append(proxima)
+            # Historial acotado: olvidamos lo más viejo para no crecer sin límite
+            if len(self.cola) > 1000:
+                del self.cola[:500]
+            self.__paso = len(self.cola) - 1
+            self._cambiar_a(proxima, self.__paso)
+        elif self.repeticion == "no" or not self.cola:
+            self._mostrar("End of Playlist.")
+            self.detener()
+        else:
+            self._mostrar("End of Playlist. Volviendo al inicio...")
+            self._limpiar_omitidos()
+            if self.aleatorio:
+                self._reiniciar_orden()  # Cada vuelta, una mezcla nueva
+            self.__paso = -1  # Loop
+            indice = self._siguiente_del_contexto()
+            self._cambiar_a(self.cola[indice], indice)
+
+    def _siguiente_del_contexto(self):
+        """Avanza el orden del contexto saltando lo quitado. None si se terminó."""
+        while self.__paso < len(self.cola) - 1:
+            self.__paso += 1
+            if self.__paso in self.__omitidos:
+                self._olvidar_omitidos_hasta(self.__paso)
+                continue
+            return self._indice_en_orden(self.__paso)
+        return None
+
+    def _cambiar_a(self, cancion, indice_contexto=None):
+        """Cambia de pista recordando la actual para anterior()."""
+        if self.__actual is not None:
+            self.__historial.append(self.__actual)
+        self.__actual = cancion
+        if indice_contexto is not None:
+            self.indice_actual = indice_contexto
+        self._reproducir_actual()
+
+    @property
+    def actual(self):
+        """La canción que está sonando (o en pausa), None si no hay nada cargado."""
+        return self.__actual
+
+    # --- Orden de reproducción ---
+    def _reiniciar_orden(self, primero=None, al_final=()):
+        """
+        Nuevo orden desde el paso 0: permutación perezosa O(1) o el orden natural.
+        'al_final' (índices quitados) quedan en los últimos pasos de la mezcla.
+        """
+        if self.aleatorio and self.__radio is None and self.cola:
+            self.__orden = PermutacionPerezosa(len(self.cola), primero=primero, al_final=al_final)
+        else:
+            self.__orden = None
+        self.__paso = 0
+
+    def _indice_en_orden(self, paso):
+        return self.__orden[paso] if self.__orden is not None else paso
+
+    # --- Lo quitado del contexto ---
+    def _limpiar_omitidos(self):
+        self.__omitidos.clear()
+        self.__pasos_omitidos.clear()
+        self.__omitidos_atras.clear()
+
+    def _omitir(self, paso):
+        self.__omitidos[paso] = self._indice_en_orden(paso)
+        insort(self.__pasos_omitidos, paso)
+
+    def _olvidar_omitidos_hasta(self, paso):
+        """Lo quitado en pasos <= 'paso' ya quedó atrás. O(quitados que se olvidan)."""
+        hasta = bisect_right(self.__pasos_omitidos, paso)
+        for viejo in self.__pasos_omitidos[:hasta]:
+            del self.__omitidos[viejo]
+        del self.__pasos_omitidos[:hasta]
+
+    def _pasos_pendientes(self):
+        """Pasos del orden que faltan sonar en el contexto, saltando los omitidos (perezoso)."""
+        for paso in range(self.__paso + 1, len(self.cola)):
+            if paso not in self.__omitidos:
+                yield paso
+
+    def _paso_visible(self, k):
+        """
+        Paso del orden del k-ésimo elemento pendiente del contexto: sin nada quitado es
+        una suma; si no, se corre por los quitados anteriores (bisect, O(log² quitados)).
+        """
+        paso = self.__paso + 1 + k
+        if not self.__pasos_omitidos:
+            return paso
+        while True:
+            corrido = self.__paso + 1 + k + bisect_right(self.__pasos_omitidos, paso)
+            if corrido == paso:
+                return paso
+            paso = corrido
+
+    def _ubicar_en_cola(self, posicion):
+        """Posición en la cola visible -> (zona, posición dentro de la zona)."""
+        if posicion < 0:
+            raise IndexError("Posición fuera de rango")
+        if posicion < len(self.__a_continuacion):
+            return "a_continuacion", posicion
+        posicion -= len(self.__a_continuacion)
+        pendientes = max(0, len(self.cola) - 1 - self.__paso - len(self.__omitidos))
+        if posicion < pendientes:
+            return "contexto", self._paso_visible(posicion)
+        posicion -= pendientes
+        if posicion < len(self.__agregadas):
+            return "agregadas", posicion
+        raise IndexError("Posición fuera de rango")
+
+    def proximas(self, n):
+        """
+        Las próximas n canciones en el orden en que van a sonar (sin contar la vuelta
+        al inicio): primero "a continuación", luego el contexto y al final lo agregado.
+        No materializa la cola: solo recorre n elementos.
+        """
+        proximas = []
+        for cancion in self.__a_continuacion:
+            if len(proximas) == n:
+                return proximas
+            proximas.append(cancion)
+        for paso in itertools.islice(self._pasos_pendientes(), n - len(proximas)):
+            proximas.append(self.cola[self._indice_en_orden(paso)])
+        for cancion in self.__agregadas:
+            if len(proximas) == n:
+                break
+            proximas.append(cancion)
+        return proximas
+
+    def proximos_indices(self, n):
+        """Índices del contexto de las próximas n pistas que saldrán de él."""
+        return [self._indice_en_orden(paso) for paso in itertools.islice(self._pasos_pendientes(), n)]
+
+    # --- Cola del usuario ---
+    def _fuente(self, recurso):
+        """Cancion -> tupla de una; Playlist/Album -> su lista (instantánea, sin aplanar)."""
+        if isinstance(recurso, Cancion):
+            return (recurso,)
+        if isinstance(recurso, (Playlist, Album)):
+            return recurso.reproducir(self.silencioso)
+        raise TypeError(f"No se puede encolar {type(recurso).__name__}")
+
+    @_sincronizado
+    def reproducir_a_continuacion(self, recurso):
+        """'Reproducir a continuación': suena justo después de la pista actual."""
+        self.__a_continuacion.insertar(0, self._fuente(recurso))
+        self._mostrar(f"⏭️ A continuación: {recurso.titulo}")
+        self._programar_precarga()
+
+    @_sincronizado
+    def agregar_a_cola(self, recurso):
+        """'Agregar a la cola': suena cuando termine el contexto actual."""
+        self.__agregadas.agregar(self._fuente(recurso))
+        self._mostrar(f"➕ Agregado a la cola: {recurso.titulo}")
+        self._programar_precarga()
+
+    @_sincronizado
+    def quitar_de_cola(self, posicion):
+        """Quita la pista en 'posicion' de proximas() (0 = la que sigue)."""
+        zona, donde = self._ubicar_en_cola(posicion)
+        if zona == "a_continuacion":
+            cancion = self.__a_continuacion.quitar(donde)
+        elif zona == "agregadas":
+            cancion = self.__agregadas.quitar(donde)
         else:
-            print("End of Playlist. Volviendo al inicio...")
-            self.indice_actual = 0  # Loop
+            cancion = self.cola[self._indice_en_orden(donde)]
+            self._omitir(donde)
+        self._mostrar(f"🗑️ Quitada de la cola: {cancion.titulo}")
+        self._programar_precarga()
+        return cancion
+
+    @_sincronizado
+    def saltar_a(self, posicion):
+        """Salta directo a la pista en 'posicion' de proximas(); lo que había antes se descarta."""
+        zona, donde = self._ubicar_en_cola(posicion)
+        self._inicio_transicion = time.perf_counter()
+        if zona == "a_continuacion":
+            self.__a_continuacion.descartar(donde)
+            self._cambiar_a(self.__a_continuacion.quitar(0))
+            return
+        self.__a_continuacion.vaciar()
+        if zona == "contexto":
+            self._olvidar_omitidos_hasta(donde)  # Lo quitado antes del destino ya no está pendiente
+            if self.__orden is not None:
+                self.__orden.descartar_hasta(donde)  # Lo salteado de la mezcla no se sortea
+            self.__paso = donde
+            indice = self._indice_en_orden(donde)
+            self._cambiar_a(self.cola[indice], indice)
+        else:
+            self.__paso = len(self.cola) - 1  # El contexto queda consumido
+            self._limpiar_omitidos()
+            self.__agregadas.descartar(donde)
+            self._cambiar_a(self.__agregadas.quitar(0))
+
+    @_sincronizado
+    def alternar_aleatorio(self):
+        """Activa/desactiva el modo aleatorio en O(1). La pista actual sigue sonando."""
+        self.aleatorio = not self.aleatorio
+        # Lo quitado sobrevive al cambio de orden: se recalcula su paso en el orden nuevo
+        quitados = list(self.__omitidos.values()) + self.__omitidos_atras
+        self._limpiar_omitidos()
+        if self.aleatorio:
+            # La mezcla nueva deja lo quitado en los últimos pasos: no suena y no hay que buscarlo
+            self._reiniciar_orden(primero=self.indice_actual, al_final=quitados)
+            pasos = range(len(self.cola) - len(quitados), len(self.cola))
+        else:
+            self.__orden = None
+            self.__paso = self.indice_actual  # Seguimos en orden desde donde estamos
+            pasos = sorted(i for i in quitados if i > self.indice_actual)  # Paso = índice
+            # Lo que quedó detrás no está pendiente, pero si se vuelve a mezclar sigue quitado
+            self.__omitidos_atras = [i for i in quitados if i < self.indice_actual]
+        for paso in pasos:
+            self._omitir(paso)
+        self._mostrar(f"🔀 Aleatorio {'activado' if self.aleatorio else 'desactivado'}")
+        self._programar_precarga()
+        return self.aleatorio
+
+    @_sincronizado
+    def cambiar_repeticion(self, modo=None):
+        """Fija el modo de repetición o, sin argumento, pasa al siguiente de REPETICIONES."""
+        if modo is None:
+            modo = REPETICIONES[(REPETICIONES.index(self.repeticion) + 1) % len(REPETICIONES)]
+        if modo not in REPETICIONES:
+            raise ValueError(f"Modo de repetición desconocido: {modo}. Opciones: {REPETICIONES}")
+        self.repeticion = modo
+        self._mostrar(f"🔁 Repetir: {modo}")
+        self._programar_precarga()
+        return modo
+
+    @_sincronizado
+    def buscar(self, segundos):
+        """
+        Salta a 'segundos' de la pista actual sin recargarla. Con índice de búsqueda
+        el byte del frame sale de una tabla (O(1)); si la pista estaba pausada sigue
+        pausada, y si estaba detenida arranca desde ahí (reanudar desde una posición).
+        """
+        if self.__actual is None:
+            return
+        t0 = time.perf_counter()
+        self._inicio_transicion = None
+        duracion = self.__actual.duracion
+        segundos = max(0.0, min(segundos, duracion) if duracion else segundos)
+        desplazamiento = None
+        indice = self.indices_busqueda.indice_busqueda(self.__actual.ruta_archivo) if self.indices_busqueda else None
+        if indice is not None and segundos > 0:
+            segundos, desplazamiento = indice.ubicar(segundos)
+        pausada = not self.reproduciendo and self.__posicion_pausa is not None
+
+        motor = self.motor
+        if not motor.buscar(segundos, desplazamiento):
+            # El motor ya soltó la pista (terminó o se detuvo): la cargamos y reintentamos
             self._reproducir_actual()
+            motor.buscar(segundos, desplazamiento)
+        if pausada:
+            motor.pausar()
+            self.reproduciendo = False
+            self._cancelar_fin()
+            self.__posicion_pausa = segundos
+            self.__restante = duracion - segundos if duracion else None
+        else:
+            self.reproduciendo = True
+            self.start_time = self.reloj.ahora() - segundos
+            self._programar_fin(duracion - segundos if duracion else 0)
+        self.metricas["busqueda_ms"].append((time.perf_counter() - t0) * 1000)
+        self._mostrar(f"   ⏩ {int(segundos) // 60}:{int(segundos) % 60:02d}")
+        self._emitir("busqueda", self.__actual)
 
+    @_sincronizado
     def anterior(self):
         """
         Regresa a la canción anterior si han pasado menos de 5 segundos.
         Si han pasado más de 5 segundos, reinicia la canción actual.
         """
-        segundos_transcurridos = 0
-
-        # 1. Calcular cuánto tiempo lleva sonando
-        if PYGAME_DISPONIBLE and pygame.mixer.music.get_busy():
-            # get_pos devuelve milisegundos, dividimos por 1000
-            segundos_transcurridos = pygame.mixer.music.get_pos() / 1000
-        else:
-            # Fallback para modo simulación: Usamos time.time()
-            segundos_transcurridos = time.time() - self.start_time
+        self._inicio_transicion = time.perf_counter()
+        # 1. Calcular cuánto tiempo lleva sonando (según el dispositivo, si lo sabe)
+        segundos_transcurridos = self.__motor.posicion() if self.__motor is not None else None
+        if segundos_transcurridos is None:
+            # Fallback para modo simulación: usamos el reloj (real o virtual)
+            segundos_transcurridos = self.posicion_actual()
 
-        print(f"   (Tiempo transcurrido: {segundos_transcurridos:.1f} seg)")
+        self._mostrar(f"   (Tiempo transcurrido: {segundos_transcurridos:.1f} seg)")
+        if self.__actual is not None:
+            self._emitir("salto_anterior", self.__actual)
 
         # 2. Lógica de decisión Spotify
         if segundos_transcurridos > 5:
             # CASO A: Ya avanzó mucho, reiniciamos la MISMA canción
-            print("   ⏮️ +5 segundos: Reiniciando canción actual...")
-            self._reproducir_actual()
+            self._mostrar("   ⏮️ +5 segundos: Reiniciando canción actual...")
+            self.buscar(0)
         else:
-            # CASO B: Lleva poco tiempo, intentamos ir atrás
-            if self.indice_actual > 0:
-                print("   ⏮️ Regresando al track anterior...")
-                self.indice_actual -= 1
+            # CASO B: Lleva poco tiempo, volvemos a lo que sonó antes (en el orden real)
+            if self.__historial:
+                self._mostrar("   ⏮️ Regresando al track anterior...")
+                # La actual vuelve a la cola: siguiente() rehace el camino ya escuchado
+                self.__a_continuacion.insertar(0, (self.__actual,))
+                self.__actual = self.__historial.pop()
                 self._reproducir_actual()
             else:
-                print("   ⛔ Estás en la primera canción (Se reinicia).")
-                self._reproducir_actual()
+                self._mostrar("   ⛔ Estás en la primera canción (Se reinicia).")
+                self.buscar(0)
+
+    def posicion_actual(self):
+        """Segundos escuchados de la pista actual según el reloj (sin contar pausas)."""
+        if self.__posicion_pausa is not None:
+            return self.__posicion_pausa
+        return self.reloj.ahora() - self.start_time
+
+    def _volumen_efectivo(self):
+        """Volumen del usuario por la ganancia de la pista (el dispositivo no pasa de 1.0)."""
+        return min(1.0, self.volumen * self.__factor_pista)
 
     def cambiar_volumen(self, nivel):
         """Nivel de 0.0 a 1.0"""
         if 0.0 <= nivel <= 1.0:
             self.volumen = nivel
-            if PYGAME_DISPONIBLE:
-                pygame.mixer.music.set_volume(self.volumen)
-            print(f"🔊 Volumen ajustado a: {int(nivel*100)}%")
+            if self.__motor is not None:
+                self.__motor.cambiar_volumen(self._volumen_efectivo())
+            self._mostrar(f"🔊 Volumen ajustado a: {int(nivel*100)}%")
         else:
             print("⚠️ Volumen debe ser entre 0.0 y 1.0")
 
 
 # --- ZONA DE PRUEBAS ---
 if __name__ == "__main__":
+    import contextlib
+    import io
+    from servicios.reloj import RelojVirtual
+
     # Creamos datos dummy para probar sin necesitar archivos reales
     c1 = Cancion(
-        "Enter Pharloom", "Artist A", "Alb 1", "Rock", "assets/01 Enter Pharloom.mp3"
+        "Enter Pharloom", "Artist A", "Alb 1", "Rock", "assets/01 Enter Pharloom.mp3", 95
     )
-    c2 = Cancion("Moss Grotto", "Artist B", "Alb 1", "Pop", "assets/02 Moss Grotto.mp3")
+    c2 = Cancion("Moss Grotto", "Artist B", "Alb 1", "Pop", "assets/02 Moss Grotto.mp3", 120)
 
     mi_playlist = Playlist("Mix Verano", "Test")
     mi_playlist.agregar_cancion(c1)
     mi_playlist.agregar_cancion(c2)
 
-    dj = Reproductor()
+    # Reloj virtual: los "sleep" se sustituyen por reloj.avanzar() (instantáneo)
+    reloj = RelojVirtual()
+    dj = Reproductor(reloj=reloj)
     dj.cambiar_volumen(1)
 
     print("--- PRUEBA: Cargar Playlist ---")
     dj.cargar_origen(mi_playlist)
 
     # Simulamos interacción de usuario
-    time.sleep(10)
+    reloj.avanzar(10)
     print("\n--- PRUEBA: Siguiente ---")
     dj.siguiente()
-    # dj.siguiente()
 
-    time.sleep(5)
-    print("\n--- PRUEBA: Anterior ---")
+    reloj.avanzar(3)
+    print("\n--- PRUEBA: Anterior (menos de 5 seg: vuelve al track anterior) ---")
     dj.anterior()
 
-    time.sleep(60)
+    reloj.avanzar(60)
+    print("\n--- PRUEBA: Anterior (más de 5 seg: reinicia) ---")
+    dj.anterior()
+
+    print("\n--- PRUEBA: Fin de pista automático y vuelta al inicio ---")
+    reloj.avanzar(95 + 120)
+    print(f"Sonando: {dj.actual} (índice {dj.indice_actual})")
+
+    print("\n--- PRUEBA: Buscar (en pausa sigue pausada; el fin se reprograma) ---")
+    dj.buscar(30)
+    dj.pausar()
+    dj.buscar(90)
+    assert not dj.reproduciendo and dj.posicion_actual() == 90
+    dj.despausar()
+    actual = dj.actual
+    reloj.avanzar(actual.duracion - 90 - 1)
+    assert dj.actual is actual  # Todavía no terminó: el temporizador se movió con la búsqueda
+    reloj.avanzar(2)
+    print(f"Tras buscar y terminar: {dj.actual.titulo}")
+
     print("\n--- PRUEBA: Stop ---")
     dj.detener()
+    print(f"Latencias: {dj.resumen_latencias()}")
+
+    print("\n--- PRUEBA: Cola (a continuación / agregar / quitar / saltar) ---")
+    grande = [Cancion(f"Tema {i}", "Artist C", "Alb 2", "Jazz", f"/no/existe/{i}.mp3", 60) for i in range(6)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        otra = Playlist("Otra", "Test")
+        for cancion in grande:
+            otra.agregar_cancion(cancion)
+        dj.cargar_origen(otra)  # Suena Tema 0
+        dj.reproducir_a_continuacion(mi_playlist)
+        dj.agregar_a_cola(c1)
+        dj.quitar_de_cola(3)  # Tema 2
+    print(f"Próximas: {[c.titulo for c in dj.proximas(10)]}")
+    assert [c.titulo for c in dj.proximas(10)] == [
+        "Enter Pharloom", "Moss Grotto", "Tema 1", "Tema 3", "Tema 4", "Tema 5", "Enter Pharloom"
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        dj.alternar_aleatorio()
+        assert "Tema 2" not in [c.titulo for c in dj.proximas(10)]  # Lo quitado no vuelve al mezclar
+        dj.alternar_aleatorio()
+    assert [c.titulo for c in dj.proximas(10)][2:6] == ["Tema 1", "Tema 3", "Tema 4", "Tema 5"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        dj.saltar_a(4)  # Tema 4: se descarta lo de "a continuación"
+        dj.siguiente()
+        dj.anterior()  # <5 s: vuelve a Tema 4 y Tema 5 queda primero en la cola
+    assert dj.actual.titulo == "Tema 4"
+    assert [c.titulo for c in dj.proximas(3)] == ["Tema 5", "Enter Pharloom"]
+    print(f"Tras saltar/siguiente/anterior: {dj.actual.titulo}, luego {[c.titulo for c in dj.proximas(3)]}")
+    dj.detener()
+
+    # Prueba de carga: 5000 horas de escucha simulada
+    cambios = []
+    dj.suscribir("pista_iniciada", lambda reproductor, cancion: cambios.append(cancion))
+    dj.silencioso = True  # Como en las sesiones: sin anuncios por consola
+    inicio = time.perf_counter()
+    dj.cargar_origen(mi_playlist)
+    reloj.avanzar(5000 * 3600)
+    total = time.perf_counter() - inicio
+    print(f"\n5000 h simuladas ({len(cambios)} pistas) en {total * 1000:.0f} ms")
+    dj.detener()
@@ -0,0 +1,137 @@
+import sys
+import os
+import asyncio
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from modelos.usuario import Usuario
+from servicios.reproductor import Reproductor
+from servicios.reloj import RelojAsyncio
+from servicios.repositorio_usuarios import normalizar_correo
+from utils.excepciones import OpcionInvalidaError, UsuarioNoEncontradoError
+
+# Métodos del Reproductor que un cliente remoto puede invocar
+COMANDOS = (
+    "cargar_origen",
+    "pausar",
+    "despausar",
+    "siguiente",
+    "anterior",
+    "buscar",
+    "detener",
+    "cambiar_volumen",
+    "alternar_aleatorio",
+    "cambiar_repeticion",
+    "reproducir_a_continuacion",
+    "agregar_a_cola",
+    "quitar_de_cola",
+    "saltar_a",
+)
+
+
+class GestorSesiones:
+    """
+    Servidor de sesiones de escucha sobre asyncio.
+    Cada Usuario tiene su propio Reproductor (cola, índice, estado, tiempos),
+    pero todos comparten UN event loop: los fines de pista de miles de sesiones
+    son simples loop.call_later(), sin un hilo por sesión.
+    Los reproductores son headless (sin pygame ni consola): el audio real no se
+    multiplexa y los anuncios de cada pista no inundan la salida del servidor.
+    """
+
+    def __init__(self, loop=None, bitacora=None):
+        self.__loop = loop
+        self.__sesiones = {}  # correo normalizado -> Reproductor
+        self.__bitacora = bitacora  # BitacoraEventos compartida (opcional)
+
+    def __len__(self):
+        return len(self.__sesiones)
+
+    def _reloj(self):
+        if self.__loop is None:
+            self.__loop = asyncio.get_running_loop()
+        return RelojAsyncio(self.__loop)
+
+    def abrir(self, usuario: Usuario):
+        """Devuelve la sesión del usuario (la crea si no existe)."""
+        clave = normalizar_correo(usuario.correo)
+        sesion = self.__sesiones.get(clave)
+        if sesion is None:
+            sesion = self.__sesiones[clave] = Reproductor(
+                reloj=self._reloj(), con_audio=False, silencioso=True
+            )
+            if self.__bitacora is not None:
+                self.__bitacora.conectar(sesion, clave)
+        return sesion
+
+    def obtener(self, usuario: Usuario):
+        sesion = self.__sesiones.get(normalizar_correo(usuario.correo))
+        if sesion is None:
+            raise UsuarioNoEncontradoError(f"{usuario.correo} no tiene una sesión abierta")
+        return sesion
+
+    def cerrar(self, usuario: Usuario):
+        """Detiene el reproductor del usuario y libera su sesión."""
+        sesion = self.__sesiones.pop(normalizar_correo(usuario.correo), None)
+        if sesion is not None:
+            sesion.detener()
+
+    async def comando(self, usuario: Usuario, nombre, *args):
+        """
+        Ejecuta un comando de reproducción en la sesión del usuario.
+        Corre dentro del loop, así que nunca compite con los temporizadores.
+        """
+        if nombre not in COMANDOS:
+            raise OpcionInvalidaError(f"Comando desconocido: '{nombre}'")
+        return getattr(self.obtener(usuario), nombre)(*args)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import time
+    from modelos.usuario import Cliente
+    from modelos.multimedia import Cancion
+    from utils import seguridad
+
+    # Benchmark: ¿cuántas sesiones puede mover un núcleo?
+    # Pistas cortas (0.5 s) para generar muchos cambios de pista por segundo.
+    SESIONES = 5000
+    SEGUNDOS = 3.0
+    seguridad.PARAMETROS_KDF.update(n=2, r=1)  # Aquí no medimos scrypt
+
+    async def benchmark():
+        gestor = GestorSesiones()
+        cambios = [0]
+        canciones = [
+            Cancion(f"Tema {i}", "Artista", "Disco", "Pop", f"/no/existe/{i}.mp3", 0.5)
+            for i in range(10)
+        ]
+        usuarios = [Cliente(f"U{i}", f"u{i}@spotipy.com", "x") for i in range(SESIONES)]
+
+        for i, usuario in enumerate(usuarios):
+            gestor.abrir(usuario).suscribir(
+                "pista_iniciada", lambda r, c: cambios.__setitem__(0, cambios[0] + 1)
+            )
+            # Arranques escalonados para que no coincidan todos los fines de pista
+            await asyncio.sleep(0)
+            await gestor.comando(usuario, "cargar_origen", canciones[i % 10])
+
+        cambios[0] = 0
+        cpu0, pared0 = time.process_time(), time.perf_counter()
+        await asyncio.sleep(SEGUNDOS)
+        cpu = time.process_time() - cpu0
+        pared = time.perf_counter() - pared0
+
+        for usuario in usuarios:
+            gestor.cerrar(usuario)
+
+        por_cpu = cambios[0] / cpu if cpu else float("inf")
+        cancion_tipica = 210  # 3.5 minutos
+        print(f"{SESIONES} sesiones, {cambios[0]} cambios de pista en {pared:.1f} s "
+              f"(CPU {cpu:.2f} s)")
+        print(f"Capacidad: {por_cpu:,.0f} cambios de pista por segundo de CPU")
+        print(f"≈ {por_cpu * cancion_tipica:,.0f} sesiones por núcleo con canciones de 3.5 min")
+
+    asyncio.run(benchmark())
@@ -0,0 +1,315 @@
+import sys
+import os
+import json
+import math
+import wave
+import hashlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+# NumPy/SciPy son opcionales: sin ellos el filtro y las energías van en Python puro (más lento)
+try:
+    import numpy as np
+    from scipy.signal import lfilter
+
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    NUMPY_DISPONIBLE = False
+
+REFERENCIA_LUFS = -18.0  # Nivel objetivo de ReplayGain 2.0
+VERSION_ANALISIS = 1  # Cambia la clave de caché si cambia el algoritmo
+SILENCIO_LUFS = -70.0  # Compuerta absoluta de BS.1770
+ANCHO_MUESTRA = 2  # Bytes por muestra (PCM de 16 bits)
+
+
+def _coeficientes_k(tasa):
+    """
+    Filtro de ponderación K (ITU-R BS.1770) para cualquier frecuencia de muestreo:
+    un shelf de +4 dB en agudos y un pasa altos a 38 Hz, como dos biquads (b, a).
+    """
+    # Etapa 1: shelf alto
+    ganancia, q, fc = 3.99984385397, 0.7071752369554193, 1681.9744509555319
+    k = math.tan(math.pi * fc / tasa)
+    vh = 10 ** (ganancia / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = (
+        ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0),
+        (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0),
+    )
+    # Etapa 2: pasa altos (RLB)
+    q, fc = 0.5003270373238773, 38.13547087602444
+    k = math.tan(math.pi * fc / tasa)
+    a0 = 1 + k / q + k * k
+    pasa_altos = ((1.0, -2.0, 1.0), (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0))
+    return shelf, pasa_altos
+
+
+def _pcm_wav(ruta):
+    try:
+        with wave.open(ruta, "rb") as wav:
+            if wav.getsampwidth() != ANCHO_MUESTRA:
+                return None
+            return wav.getframerate(), wav.getnchannels(), wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+
+def _pcm_pygame(ruta):
+    """MP3/OGG/... con el decodificador de pygame-ce (solo dentro de los procesos del pool)."""
+    try:
+        import pygame
+    except ImportError:
+        return None
+    try:
+        if not pygame.mixer.get_init():
+            # Proceso de análisis: solo decodificamos, no hace falta tarjeta de sonido
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            pygame.mixer.init(frequency=44100, size=-16, channels=2)
+        tasa, _, canales = pygame.mixer.get_init()
+        return tasa, canales, pygame.mixer.Sound(ruta).get_raw()
+    except pygame.error:
+        return None
+
+
+def _decodificar(ruta):
+    """(tasa, [muestras por canal en -1..1]) o None si ningún decodificador puede con el archivo."""
+    pcm = _pcm_wav(ruta) or _pcm_pygame(ruta)
+    if pcm is None:
+        return None
+    tasa, canales, crudo = pcm
+    if canales <= 0:
+        return None
+    # Un archivo truncado puede cortar a mitad de una muestra: solo frames enteros
+    crudo = crudo[: len(crudo) - len(crudo) % (ANCHO_MUESTRA * canales)]
+    if NUMPY_DISPONIBLE:
+        muestras = np.frombuffer(crudo, dtype="<i2").reshape(-1, canales).T / 32768.0
+        return tasa, list(muestras)
+    muestras = array("h", crudo)
+    if sys.byteorder == "big":
+        muestras.byteswap()
+    return tasa, [[m / 32768.0 for m in muestras[c::canales]] for c in range(canales)]
+
+
+def _energias_numpy(canal, tasa):
+    """Filtro K + suma de cuadrados por sub-bloques de 100 ms (vectorizado)."""
+    for b, a in _coeficientes_k(tasa):
+        canal = lfilter(b, a, canal)
+    paso = tasa // 10
+    utiles = len(canal) // paso * paso
+    return np.square(canal[:utiles]).reshape(-1, paso).sum(axis=1)
+
+
+def _energias_python(canal, tasa):
+    for (b0, b1, b2), (_, a1, a2) in _coeficientes_k(tasa):
+        filtrado = []
+        x1 = x2 = y1 = y2 = 0.0
+        for x in canal:
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            filtrado.append(y)
+            x2, x1, y2, y1 = x1, x, y1, y
+        canal = filtrado
+    paso = tasa // 10
+    return [sum(y * y for y in canal[i : i + paso]) for i in range(0, len(canal) - paso + 1, paso)]
+
+
+def sonoridad_integrada(canales, tasa):
+    """
+    Sonoridad integrada en LUFS (BS.1770): bloques de 400 ms con 75% de solape
+    (4 sub-bloques de 100 ms), compuerta absoluta a -70 LUFS y relativa a -10 LU.
+    None si todo es silencio o dura menos de un bloque.
+    """
+    energias = [(_energias_numpy if NUMPY_DISPONIBLE else _energias_python)(c, tasa) for c in canales]
+    sub_bloques = min(len(e) for e in energias)
+    muestras_bloque = 4 * (tasa // 10)
+    bloques = [
+        sum(sum(e[j : j + 4]) for e in energias) / muestras_bloque  # Suma de canales (pesos 1.0)
+        for j in range(sub_bloques - 3)
+    ]
+
+    def lufs(media):
+        return -0.691 + 10 * math.log10(media)
+
+    audibles = [z for z in bloques if z > 0 and lufs(z) > SILENCIO_LUFS]
+    if not audibles:
+        return None
+    umbral = lufs(sum(audibles) / len(audibles)) - 10
+    finales = [z for z in audibles if lufs(z) > umbral]
+    return lufs(sum(finales) / len(finales))
+
+
+def analizar_archivo(ruta):
+    """
+    Sonoridad integrada, pico y ganancia ReplayGain de un archivo.
+    Función de módulo (no método) para que el pool de procesos pueda enviarla.
+    Devuelve None si el formato no se puede decodificar (WAV de 16 bits, o lo que
+    decodifique pygame-ce si está instalado) o si el archivo está dañado: un archivo
+    malo no puede tumbar el análisis del lote entero.
+    """
+    try:
+        decodificado = _decodificar(ruta)
+        if decodificado is None:
+            return None
+        tasa, canales = decodificado
+        if NUMPY_DISPONIBLE:
+            pico = float(max((np.abs(c).max() for c in canales if len(c)), default=0.0))
+        else:
+            pico = max((max(map(abs, c)) for c in canales if c), default=0.0)
+        lufs = sonoridad_integrada(canales, tasa)
+    except Exception:
+        return None
+    ganancia = 0.0 if lufs is None else REFERENCIA_LUFS - lufs
+    return {
+        "lufs": None if lufs is None else round(lufs, 2),
+        "pico": round(pico, 5),
+        "ganancia_db": round(ganancia, 2),
+    }
+
+
+def clave_contenido(ruta):
+    """Hash del contenido del archivo (independiente de la ruta y de la fecha)."""
+    resumen = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            resumen.update(bloque)
+    return f"{VERSION_ANALISIS}:{resumen.hexdigest()}"
+
+
+class AnalizadorSonoridad:
+    """
+    Normalización de volumen estilo ReplayGain.
+    - analizar(rutas) mide los archivos nuevos en paralelo con un pool de procesos.
+    - Caché en disco por contenido: un archivo copiado, renombrado o "tocado" no se
+      vuelve a analizar. Para no hashear todo en cada arranque, (tamaño, mtime)
+      de cada ruta recuerda su clave, como la caché del escáner.
+    - factor(ruta) es lo único que usa el reproductor al cargar una pista: dos
+      búsquedas en diccionarios, sin leer el archivo.
+    """
+
+    def __init__(self, ruta_cache="assets/.sonoridad_cache.json", procesos=None):
+        self.ruta_cache = ruta_cache
+        self.procesos = procesos
+        self.__huellas = {}  # ruta -> [tamaño, mtime_ns, clave]
+        self.__resultados = {}  # clave de contenido -> resultado de analizar_archivo
+        self._cargar_cache()
+
+    def _cargar_cache(self):
+        try:
+            with open(self.ruta_cache, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            self.__huellas, self.__resultados = datos["huellas"], datos["resultados"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _guardar_cache(self):
+        try:
+            with open(self.ruta_cache, "w", encoding="utf-8") as archivo:
+                json.dump({"huellas": self.__huellas, "resultados": self.__resultados}, archivo)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché de sonoridad: {e}")
+
+    def analizar(self, rutas):
+        """Analiza lo que falte. Devuelve (analizados, desde caché)."""
+        pendientes = {}  # clave -> ruta (un mismo contenido se analiza una vez)
+        en_cache = cambios = 0
+        for ruta in rutas:
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue
+            huella = self.__huellas.get(ruta)
+            if huella is None or huella[:2] != [info.st_size, info.st_mtime_ns]:
+                try:
+                    clave = clave_contenido(ruta)
+                except OSError:
+                    continue
+                huella = self.__huellas[ruta] = [info.st_size, info.st_mtime_ns, clave]
+                cambios += 1
+            if huella[2] in self.__resultados:
+                en_cache += 1
+            else:
+                pendientes.setdefault(huella[2], ruta)
+
+        if pendientes:
+            # Siempre en procesos aparte, aunque sea un archivo: no compite por el GIL con
+            # el reproductor y el decodificador de pygame no toca el mixer de este proceso
+            with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                resultados = pool.map(analizar_archivo, pendientes.values())
+                self.__resultados.update(zip(pendientes, resultados))
+        if cambios or pendientes:
+            self._guardar_cache()
+        return len(pendientes), en_cache
+
+    def resultado(self, ruta):
+        huella = self.__huellas.get(ruta)
+        return self.__resultados.get(huella[2]) if huella else None
+
+    def factor(self, ruta):
+        """
+        Multiplicador lineal de volumen para 'ruta' (1.0 si no está analizada).
+        Se limita para que el pico no pase de 1.0 (sin recorte).
+        """
+        resultado = self.resultado(ruta)
+        if not resultado:
+            return 1.0
+        factor = 10 ** (resultado["ganancia_db"] / 20)
+        if resultado["pico"] > 0:
+            factor = min(factor, 1 / resultado["pico"])
+        return factor
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    import time
+
+    def wav_tono(ruta, amplitud, segundos=3, tasa=44100, hz=1000):
+        paso = 2 * math.pi * hz / tasa
+        muestras = array("h", (int(amplitud * 32767 * math.sin(paso * i)) for i in range(tasa * segundos)))
+        estereo = array("h", (m for m in muestras for _ in range(2)))
+        if sys.byteorder == "big":
+            estereo.byteswap()
+        with wave.open(ruta, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(tasa)
+            wav.writeframes(estereo.tobytes())
+
+    # Coeficientes de referencia de BS.1770 a 48 kHz
+    (b, a), _ = _coeficientes_k(48000)
+    assert abs(b[0] - 1.53512485958697) < 1e-6 and abs(a[1] + 1.69065929318241) < 1e-6
+    print(f"NumPy/SciPy: {NUMPY_DISPONIBLE}")
+
+    carpeta = tempfile.mkdtemp()
+    try:
+        rutas = []
+        for i, amplitud in enumerate((0.05, 0.2, 0.5, 0.9)):
+            rutas.append(os.path.join(carpeta, f"tono{i}.wav"))
+            wav_tono(rutas[-1], amplitud)
+        shutil.copy(rutas[1], os.path.join(carpeta, "copia.wav"))  # Mismo contenido
+        rutas.append(os.path.join(carpeta, "copia.wav"))
+
+        cache = os.path.join(carpeta, "cache.json")
+        inicio = time.perf_counter()
+        analizados, en_cache = AnalizadorSonoridad(cache).analizar(rutas)
+        print(f"Primer análisis: {analizados} analizados, {en_cache} desde caché "
+              f"en {time.perf_counter() - inicio:.2f} s")
+
+        analizador = AnalizadorSonoridad(cache)
+        inicio = time.perf_counter()
+        analizados, en_cache = analizador.analizar(rutas)
+        print(f"Segundo análisis: {analizados} analizados, {en_cache} desde caché "
+              f"en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+        for ruta in rutas:
+            r = analizador.resultado(ruta)
+            print(f"  {os.path.basename(ruta)}: {r['lufs']} LUFS, pico {r['pico']}, "
+                  f"{r['ganancia_db']:+.2f} dB -> x{analizador.factor(ruta):.3f}")
+        # Un seno de 1 kHz a fondo de escala mide -3.01 LUFS en un canal: en estéreo, ≈ 0 LUFS
+        assert abs(analizador.resultado(rutas[3])["lufs"] - 20 * math.log10(0.9)) < 0.1
+    finally:
+        shutil.rmtree(carpeta)
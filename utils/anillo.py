@@ -0,0 +1,97 @@
+class AnilloBytes:
+    """
+    Buffer circular de bytes de tamaño fijo para un productor y un consumidor.
+    No copia al entregar: reservar() y leer() devuelven memoryview sobre el
+    bytearray interno (una o dos, si el tramo da la vuelta al final).
+    Los contadores de escritura y lectura solo crecen; la posición real es
+    el contador módulo la capacidad.
+    Sin candado propio: quien lo comparte entre hilos lo protege (ver MotorPCM).
+    """
+
+    def __init__(self, capacidad):
+        if capacidad <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacidad = capacidad
+        self.__vista = memoryview(bytearray(capacidad))
+        self.__escritos = 0
+        self.__leidos = 0
+
+    def __len__(self):
+        """Bytes escritos y aún no leídos."""
+        return self.__escritos - self.__leidos
+
+    def libre(self):
+        return self.capacidad - len(self)
+
+    def _tramo(self, inicio, cantidad):
+        desde = inicio % self.capacidad
+        hasta = desde + cantidad
+        if hasta <= self.capacidad:
+            return [self.__vista[desde:hasta]] if cantidad else []
+        return [self.__vista[desde:], self.__vista[: hasta - self.capacidad]]
+
+    def reservar(self, cantidad):
+        """Vistas escribibles para hasta 'cantidad' bytes libres. Se publican con confirmar()."""
+        return self._tramo(self.__escritos, min(cantidad, self.libre()))
+
+    def confirmar(self, cantidad):
+        if cantidad > self.libre():
+            raise ValueError("Se confirmaron más bytes de los reservados")
+        self.__escritos += cantidad
+
+    def escribir(self, datos):
+        """Copia 'datos' (lo que entre) y devuelve cuántos bytes escribió."""
+        datos = memoryview(datos).cast("B")
+        escritos = 0
+        for vista in self.reservar(len(datos)):
+            vista[:] = datos[escritos : escritos + len(vista)]
+            escritos += len(vista)
+        self.confirmar(escritos)
+        return escritos
+
+    def leer(self, cantidad):
+        """Vistas de solo lectura lógica sobre hasta 'cantidad' bytes. Se descartan con liberar()."""
+        return self._tramo(self.__leidos, min(cantidad, len(self)))
+
+    def liberar(self, cantidad):
+        if cantidad > len(self):
+            raise ValueError("Se liberaron más bytes de los disponibles")
+        self.__leidos += cantidad
+
+    def vaciar(self):
+        self.__leidos = self.__escritos
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    azar = random.Random(5)
+    anillo, espejo = AnilloBytes(1000), bytearray()
+    for _ in range(20_000):
+        if azar.random() < 0.5:
+            datos = azar.randbytes(azar.randrange(300))
+            n = anillo.escribir(datos)
+            espejo += datos[:n]
+        else:
+            n = azar.randrange(300)
+            leido = b"".join(bytes(v) for v in anillo.leer(n))
+            assert leido == espejo[: len(leido)]
+            anillo.liberar(len(leido))
+            del espejo[: len(leido)]
+    assert len(anillo) == len(espejo)
+    print(f"✅ Coincide con bytearray ({len(espejo)} bytes pendientes)")
+
+    # Throughput: bloques de 4 KiB de ida y vuelta (vistas, sin copias al leer)
+    anillo = AnilloBytes(1 << 20)
+    bloque = bytes(4096)
+    total = 256 * 2**20
+    inicio = time.perf_counter()
+    for _ in range(total // len(bloque)):
+        anillo.escribir(bloque)
+        for vista in anillo.leer(len(bloque)):
+            pass
+        anillo.liberar(len(bloque))
+    segundos = time.perf_counter() - inicio
+    print(f"{total / 2**20:.0f} MiB en {segundos:.2f} s: {total / 2**20 / segundos:,.0f} MiB/s")
@@ -0,0 +1,179 @@
+import math
+import hashlib
+from array import array
+
+
+class TopKAproximado:
+    """
+    Los k elementos más frecuentes de un flujo, con memoria fija (algoritmo Space-Saving).
+    Guarda como mucho k contadores agrupados por valor ("stream summary"), así que
+    cada incremento es O(1). Si llega un elemento nuevo con los k ocupados, reemplaza
+    a uno de los de menor cuenta y hereda esa cuenta como posible sobreestimación
+    ('error'): la frecuencia real está entre cuenta - error y cuenta.
+    """
+
+    def __init__(self, k=100):
+        self.k = k
+        self.__cuentas = {}  # elemento -> cuenta
+        self.__errores = {}  # elemento -> sobreestimación máxima
+        self.__grupos = {}  # cuenta -> set de elementos con esa cuenta
+        self.__minimo = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.__cuentas)
+
+    def agregar(self, elemento):
+        """Cuenta una aparición; devuelve el elemento desalojado para hacerle lugar (o None)."""
+        self.total += 1
+        victima = None
+        cuenta = self.__cuentas.get(elemento)
+        if cuenta is None:
+            if len(self.__cuentas) < self.k:
+                cuenta, error = 0, 0
+                self.__minimo = 0  # El recién llegado pasa a ser el mínimo (cuenta 1)
+            else:
+                # Lleno: el nuevo ocupa el lugar de uno de los menos frecuentes
+                cuenta = error = self.__minimo
+                victima = self.__grupos[cuenta].pop()
+                del self.__cuentas[victima], self.__errores[victima]
+            self.__errores[elemento] = error
+        else:
+            self.__grupos[cuenta].discard(elemento)
+
+        if cuenta in self.__grupos and not self.__grupos[cuenta]:
+            del self.__grupos[cuenta]
+        self.__cuentas[elemento] = cuenta + 1
+        self.__grupos.setdefault(cuenta + 1, set()).add(elemento)
+        # Los incrementos son de 1: si el grupo mínimo se vació, el nuevo mínimo es cuenta + 1
+        if cuenta == self.__minimo and cuenta not in self.__grupos:
+            self.__minimo = cuenta + 1
+        return victima
+
+    def estimar(self, elemento):
+        """Cuenta estimada (0 si no está entre los vigilados)."""
+        return self.__cuentas.get(elemento, 0)
+
+    def mas_frecuentes(self, n=10):
+        """[(elemento, cuenta, error), ...] ordenados por cuenta descendente."""
+        mejores = sorted(self.__cuentas.items(), key=lambda par: par[1], reverse=True)[:n]
+        return [(e, c, self.__errores[e]) for e, c in mejores]
+
+
+def _hash64(valor):
+    """Hash estable entre procesos (hash() de Python cambia en cada ejecución)."""
+    datos = valor.encode("utf-8") if isinstance(valor, str) else repr(valor).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(datos, digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """
+    Estimador de cantidad de elementos distintos (ej.: oyentes únicos) en memoria fija:
+    2**precision registros de un byte. Error típico ≈ 1.04 / sqrt(2**precision)
+    (precision=8: 256 B, ~6.5%; precision=14: 16 KiB, ~0.8%).
+    """
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 16:
+            raise ValueError("La precisión debe estar entre 4 y 16")
+        self.precision = precision
+        self.__m = 1 << precision
+        self.__registros = bytearray(self.__m)
+        self.__alfa = {16: 0.673, 32: 0.697, 64: 0.709}.get(self.__m, 0.7213 / (1 + 1.079 / self.__m))
+
+    def agregar(self, valor):
+        h = _hash64(valor)
+        indice = h & (self.__m - 1)
+        resto = h >> self.precision
+        # Posición del primer bit en 1 de los 64 - p bits restantes
+        rango = (64 - self.precision) - resto.bit_length() + 1
+        if rango > self.__registros[indice]:
+            self.__registros[indice] = rango
+
+    def unir(self, otro):
+        """Fusiona otro HLL de la misma precisión (máximo registro a registro)."""
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden unir HyperLogLog de la misma precisión")
+        self.__registros = bytearray(map(max, self.__registros, otro.__registros))
+
+    def __len__(self):
+        return self.estimar()
+
+    def estimar(self):
+        m = self.__m
+        suma = math.fsum(2.0 ** -r for r in self.__registros)
+        estimado = self.__alfa * m * m / suma
+        ceros = self.__registros.count(0)
+        if estimado <= 2.5 * m and ceros:
+            estimado = m * math.log(m / ceros)  # Corrección para cardinalidades pequeñas
+        return round(estimado)
+
+
+class SerieTemporal:
+    """
+    Conteos por intervalos de tiempo fijos (ej.: reproducciones por hora de la última semana)
+    en un anillo de 'cubetas' posiciones: memoria fija y O(1) por evento.
+    Las cubetas más viejas que la ventana se reciclan solas.
+    """
+
+    def __init__(self, ancho=3600, cubetas=168):
+        self.ancho = ancho
+        self.cubetas = cubetas
+        self.__conteos = array("Q", bytes(8 * cubetas))
+        self.__periodos = array("q", [-1] * cubetas)  # Qué intervalo guarda cada posición
+
+    def agregar(self, instante, cantidad=1):
+        periodo = int(instante // self.ancho)
+        i = periodo % self.cubetas
+        if self.__periodos[i] != periodo:
+            if self.__periodos[i] > periodo:
+                return  # Más viejo que la ventana: ya no se puede contar
+            self.__periodos[i] = periodo
+            self.__conteos[i] = 0
+        self.__conteos[i] += cantidad
+
+    def ultimas(self, n, ahora):
+        """[(inicio del intervalo, conteo), ...] de los últimos n intervalos hasta 'ahora'."""
+        actual = int(ahora // self.ancho)
+        resultado = []
+        for periodo in range(actual - min(n, self.cubetas) + 1, actual + 1):
+            i = periodo % self.cubetas
+            conteo = self.__conteos[i] if self.__periodos[i] == periodo else 0
+            resultado.append((periodo * self.ancho, conteo))
+        return resultado
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    from collections import Counter
+
+    azar = random.Random(11)
+
+    # 1. Space-Saving frente al conteo exacto con una distribución de Zipf
+    pesos = [1 / (i + 1) for i in range(50_000)]
+    flujo = azar.choices(range(50_000), weights=pesos, k=300_000)
+    top = TopKAproximado(k=200)
+    for x in flujo:
+        top.agregar(x)
+    exactos = Counter(flujo).most_common(10)
+    aproximados = top.mas_frecuentes(10)
+    assert [e for e, _ in exactos] == [e for e, _, _ in aproximados]
+    for (e, real), (_, cuenta, error) in zip(exactos, aproximados):
+        assert cuenta - error <= real <= cuenta
+    print(f"✅ Top-10 exacto con 200 contadores: {aproximados[:3]} ...")
+
+    # 2. HyperLogLog
+    for precision, n in ((8, 1000), (14, 200_000)):
+        hll = HyperLogLog(precision)
+        for i in range(n):
+            hll.agregar(f"usuario{i}@spotipy.com")
+            hll.agregar(f"usuario{i}@spotipy.com")  # Repetidos no cuentan
+        print(f"HLL p={precision}: {hll.estimar():,} estimados para {n:,} reales "
+              f"({(hll.estimar() - n) / n:+.1%})")
+
+    # 3. Serie temporal
+    serie = SerieTemporal(ancho=60, cubetas=5)
+    for t in range(0, 600, 10):
+        serie.agregar(t)
+    print(f"Últimos 5 minutos: {serie.ultimas(5, 599)}")
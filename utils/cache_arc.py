@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+
+class CacheARC:
+    """
+    Caché ARC (Adaptive Replacement Cache) acotada en bytes, no en entradas.
+    - t1: vistas una sola vez (recientes). t2: vistas dos o más veces (frecuentes).
+    - b1/b2: "fantasmas" de lo expulsado de t1/t2 (solo clave y tamaño, sin datos).
+    Un acierto en un fantasma mueve el objetivo 'p' (bytes para t1): si vuelven las
+    recién expulsadas de t1 crece la parte reciente, si vuelven las de t2, la frecuente.
+    Así recorrer una playlist larga una vez no desaloja las pistas que se repiten
+    (con LRU puro, sí). Sin candado propio: ver CacheRecursos.
+    """
+
+    def __init__(self, capacidad_bytes):
+        if capacidad_bytes <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacidad = capacidad_bytes
+        self.expulsiones = 0
+        self.vaciar()
+
+    def vaciar(self):
+        self.p = 0  # Objetivo de bytes para t1
+        self.__t1, self.__t2 = OrderedDict(), OrderedDict()  # clave -> (valor, tamaño)
+        self.__b1, self.__b2 = OrderedDict(), OrderedDict()  # clave -> tamaño
+        self.__bytes = {"t1": 0, "t2": 0, "b1": 0, "b2": 0}
+
+    def __len__(self):
+        return len(self.__t1) + len(self.__t2)
+
+    def __contains__(self, clave):
+        return clave in self.__t1 or clave in self.__t2
+
+    @property
+    def bytes_usados(self):
+        return self.__bytes["t1"] + self.__bytes["t2"]
+
+    def obtener(self, clave, recencia=True):
+        """
+        Valor de 'clave' o None. Un acierto en t1 la pasa a t2 (ya se usó dos veces).
+        Con recencia=False solo se consulta (no cuenta como uso).
+        """
+        entrada = self.__t2.get(clave)
+        if entrada is not None:
+            if recencia:
+                self.__t2.move_to_end(clave)
+            return entrada[0]
+        entrada = self.__t1.get(clave)
+        if entrada is not None and recencia:
+            del self.__t1[clave]
+            self.__bytes["t1"] -= entrada[1]
+            self.__t2[clave] = entrada
+            self.__bytes["t2"] += entrada[1]
+        return entrada[0] if entrada is not None else None
+
+    def guardar(self, clave, valor, tamano):
+        """Agrega 'clave' (tras un fallo). Lo que no entra en la capacidad no se guarda."""
+        if tamano > self.capacidad or clave in self:
+            return
+        if clave in self.__b1:
+            # Volvió algo reciente que expulsamos: damos más espacio a t1
+            delta = max(1.0, self.__bytes["b2"] / max(self.__bytes["b1"], 1)) * tamano
+            self.p = min(self.capacidad, self.p + delta)
+            self.__bytes["b1"] -= self.__b1.pop(clave)
+            destino = "t2"
+        elif clave in self.__b2:
+            delta = max(1.0, self.__bytes["b1"] / max(self.__bytes["b2"], 1)) * tamano
+            self.p = max(0, self.p - delta)
+            self.__bytes["b2"] -= self.__b2.pop(clave)
+            destino = "t2"
+        else:
+            destino = "t1"
+        self._liberar(tamano, fantasma_frecuente=destino == "t2")
+        (self.__t1 if destino == "t1" else self.__t2)[clave] = (valor, tamano)
+        self.__bytes[destino] += tamano
+        self._recortar_fantasmas()
+
+    def descartar(self, clave):
+        for nombre, lista in (("t1", self.__t1), ("t2", self.__t2)):
+            entrada = lista.pop(clave, None)
+            if entrada is not None:
+                self.__bytes[nombre] -= entrada[1]
+
+    def _liberar(self, tamano, fantasma_frecuente=False):
+        """Expulsa (a los fantasmas) hasta que entren 'tamano' bytes."""
+        while self.bytes_usados + tamano > self.capacidad:
+            t1 = self.__bytes["t1"]
+            if self.__t1 and (t1 > self.p or (fantasma_frecuente and t1 >= self.p) or not self.__t2):
+                clave, (_, tam) = self.__t1.popitem(last=False)
+                self.__bytes["t1"] -= tam
+                self.__b1[clave] = tam
+                self.__bytes["b1"] += tam
+            else:
+                clave, (_, tam) = self.__t2.popitem(last=False)
+                self.__bytes["t2"] -= tam
+                self.__b2[clave] = tam
+                self.__bytes["b2"] += tam
+            self.expulsiones += 1
+
+    def _recortar_fantasmas(self):
+        # t1 + b1 <= c, y todo junto (reales + fantasmas) <= 2c
+        while self.__b1 and self.__bytes["t1"] + self.__bytes["b1"] > self.capacidad:
+            self.__bytes["b1"] -= self.__b1.popitem(last=False)[1]
+        while self.__b2 and sum(self.__bytes.values()) > 2 * self.capacidad:
+            self.__bytes["b2"] -= self.__b2.popitem(last=False)[1]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+
+    def simular(cache, pedidos):
+        aciertos = 0
+        for clave in pedidos:
+            if cache.obtener(clave) is not None:
+                aciertos += 1
+            else:
+                cache.guardar(clave, clave, 10)
+            assert cache.bytes_usados <= cache.capacidad
+        return aciertos / len(pedidos)
+
+    class CacheLRU:
+        """Para comparar: LRU puro sobre OrderedDict (como el buffer de precarga original)."""
+
+        def __init__(self, capacidad_bytes):
+            self.capacidad, self.bytes_usados, self.__datos = capacidad_bytes, 0, OrderedDict()
+
+        def obtener(self, clave):
+            if clave in self.__datos:
+                self.__datos.move_to_end(clave)
+            return self.__datos.get(clave)
+
+        def guardar(self, clave, valor, tamano):
+            self.__datos[clave] = (valor, tamano)
+            self.bytes_usados += tamano
+            while self.bytes_usados > self.capacidad:
+                self.bytes_usados -= self.__datos.popitem(last=False)[1][1]
+
+    # Un puñado de pistas favoritas que se repiten, mezcladas con recorridos de
+    # playlists enormes (cada pista de la playlist se escucha una sola vez)
+    azar = random.Random(4)
+    favoritas = list(range(40))
+    pedidos, barrido = [], 1000
+    for _ in range(200):
+        pedidos += azar.choices(favoritas, k=30)
+        pedidos += range(barrido, barrido + 60)
+        barrido += 60
+    for clase in (CacheLRU, CacheARC):
+        cache = clase(capacidad_bytes=50 * 10)  # Entran 50 pistas
+        print(f"{clase.__name__}: {simular(cache, pedidos):.1%} de aciertos")
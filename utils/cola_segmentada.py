@@ -0,0 +1,141 @@
+from bisect import bisect_right
+
+
+class ColaSegmentada:
+    """
+    Secuencia formada por tramos de otras secuencias, sin copiarlas.
+    Cada segmento es (fuente, inicio, fin): una referencia a la lista de una
+    Playlist/Album (o una tupla con una sola canción) y el rango que se usa.
+    Insertar, quitar o descartar una posición solo parte o recorta segmentos,
+    así que el costo depende de la cantidad de segmentos (pocos), no de pistas.
+    """
+
+    def __init__(self):
+        self.__segmentos = []  # [fuente, inicio, fin]
+        self.__acumulado = [0]  # acumulado[i] = elementos antes del segmento i
+
+    def _reindexar(self):
+        acumulado = [0]
+        for _, inicio, fin in self.__segmentos:
+            acumulado.append(acumulado[-1] + fin - inicio)
+        self.__acumulado = acumulado
+
+    def _ubicar(self, posicion, permitir_final=False):
+        """Posición -> (índice de segmento, desplazamiento dentro del segmento)."""
+        total = len(self)
+        if posicion < 0:
+            posicion += total
+        if not 0 <= posicion < total + (1 if permitir_final else 0):
+            raise IndexError("Posición fuera de rango")
+        if posicion == total:
+            return len(self.__segmentos), 0
+        si = bisect_right(self.__acumulado, posicion) - 1
+        return si, posicion - self.__acumulado[si]
+
+    def _partir(self, posicion):
+        """Garantiza que un segmento empiece en 'posicion'. Devuelve su índice."""
+        si, desplazamiento = self._ubicar(posicion, permitir_final=True)
+        if desplazamiento:
+            fuente, inicio, fin = self.__segmentos[si]
+            self.__segmentos[si] = [fuente, inicio, inicio + desplazamiento]
+            self.__segmentos.insert(si + 1, [fuente, inicio + desplazamiento, fin])
+            si += 1
+        return si
+
+    # --- API de secuencia ---
+    def __len__(self):
+        return self.__acumulado[-1]
+
+    def __bool__(self):
+        return self.__acumulado[-1] > 0
+
+    def __getitem__(self, posicion):
+        si, desplazamiento = self._ubicar(posicion)
+        fuente, inicio, _ = self.__segmentos[si]
+        return fuente[inicio + desplazamiento]
+
+    def __iter__(self):
+        for fuente, inicio, fin in self.__segmentos:
+            for i in range(inicio, fin):
+                yield fuente[i]
+
+    @property
+    def segmentos(self):
+        return len(self.__segmentos)
+
+    # --- Modificación ---
+    def insertar(self, posicion, fuente):
+        """Inserta todos los elementos de 'fuente' (sin copiarlos) antes de 'posicion'."""
+        if not len(fuente):
+            return
+        si = self._partir(posicion)
+        self.__segmentos.insert(si, [fuente, 0, len(fuente)])
+        self._reindexar()
+
+    def agregar(self, fuente):
+        self.insertar(len(self), fuente)
+
+    def quitar(self, posicion):
+        """Elimina y devuelve el elemento en 'posicion'."""
+        si, desplazamiento = self._ubicar(posicion)
+        fuente, inicio, fin = self.__segmentos[si]
+        elemento = fuente[inicio + desplazamiento]
+        if desplazamiento == 0:
+            self.__segmentos[si][1] += 1  # Caso típico (sacar el primero): solo se recorta
+        elif desplazamiento == fin - inicio - 1:
+            self.__segmentos[si][2] -= 1
+        else:
+            self.__segmentos[si] = [fuente, inicio, inicio + desplazamiento]
+            self.__segmentos.insert(si + 1, [fuente, inicio + desplazamiento + 1, fin])
+        if self.__segmentos[si][1] == self.__segmentos[si][2]:
+            del self.__segmentos[si]
+        self._reindexar()
+        return elemento
+
+    def descartar(self, cantidad):
+        """Elimina los primeros 'cantidad' elementos."""
+        if cantidad <= 0:
+            return
+        si = self._partir(min(cantidad, len(self)))
+        del self.__segmentos[:si]
+        self._reindexar()
+
+    def vaciar(self):
+        self.__segmentos = []
+        self.__acumulado = [0]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    azar = random.Random(2)
+    cola, espejo = ColaSegmentada(), []
+    for _ in range(5000):
+        operacion = azar.random()
+        if operacion < 0.3:
+            fuente = tuple(range(azar.randrange(1, 50)))
+            posicion = azar.randrange(len(espejo) + 1)
+            cola.insertar(posicion, fuente)
+            espejo[posicion:posicion] = fuente
+        elif operacion < 0.8 and espejo:
+            posicion = azar.randrange(len(espejo))
+            assert cola.quitar(posicion) == espejo.pop(posicion)
+        elif espejo:
+            cantidad = azar.randrange(len(espejo) // 4 + 1)
+            cola.descartar(cantidad)
+            del espejo[:cantidad]
+    assert list(cola) == espejo and all(cola[i] == x for i, x in enumerate(espejo))
+    print(f"✅ Coincide con list ({len(espejo)} elementos en {cola.segmentos} segmentos)")
+
+    # Cinco playlists enormes una detrás de otra, y "reproducir a continuación" en medio
+    playlists = [range(i * 200_000, (i + 1) * 200_000) for i in range(5)]
+    inicio = time.perf_counter()
+    cola = ColaSegmentada()
+    for playlist in playlists:
+        cola.agregar(playlist)
+    cola.insertar(1, ("siguiente",))
+    cola.quitar(500_000)
+    x = cola[999_999]
+    print(f"1M pistas encoladas, insertar/quitar/acceder: {(time.perf_counter() - inicio) * 1e6:.0f} µs")
@@ -67,6 +67,27 @@ class ArchivoAudioNoEncontradoError(SpotipyError):
         super().__init__(mensaje)
 
 
+class MotorAudioNoDisponibleError(SpotipyError):
+    """Excepción lanzada cuando el motor de audio elegido no se puede iniciar (librería o dispositivo ausente)."""
+
+    def __init__(self, mensaje="El motor de audio no está disponible"):
+        super().__init__(mensaje)
+
+
+class FormatoCatalogoInvalidoError(SpotipyError):
+    """Excepción lanzada cuando un archivo de catálogo binario está dañado o no es de Spotipy."""
+
+    def __init__(self, mensaje="El archivo de catálogo no tiene un formato válido"):
+        super().__init__(mensaje)
+
+
+class FormatoMeGustaInvalidoError(SpotipyError):
+    """Excepción lanzada cuando un archivo de "Me Gusta" está dañado o no es de Spotipy."""
+
+    def __init__(self, mensaje="El archivo de Me Gusta no tiene un formato válido"):
+        super().__init__(mensaje)
+
+
 class ListaVaciaError(SpotipyError):
     """Excepción lanzada al intentar reproducir una lista sin canciones."""
 
@@ -0,0 +1,295 @@
+def _ubicar(arbol, posicion):
+    """Posición global -> (índice de bloque, desplazamiento), descendiendo el Fenwick."""
+    i = 0
+    paso = 1 << (len(arbol) - 1).bit_length()
+    while paso:
+        siguiente = i + paso
+        if siguiente < len(arbol) and arbol[siguiente] <= posicion:
+            i = siguiente
+            posicion -= arbol[siguiente]
+        paso >>= 1
+    return i, posicion
+
+
+class ListaIndexada:
+    """
+    Secuencia ordenada por posición, pensada para listas muy largas.
+    Guarda los elementos en bloques de tamaño acotado y un árbol de Fenwick
+    con el tamaño de cada bloque, así que insertar, eliminar, mover y
+    ubicar una posición cuestan O(log n) (más un memmove de un bloque pequeño).
+    Un índice elemento -> bloques permite 'indice(x)' sin recorrer toda la lista.
+    Los elementos deben ser hashables.
+    instantanea() congela el contenido sin copiarlo: los bloques se comparten y
+    la lista copia un bloque (copy-on-write) solo la primera vez que lo modifica.
+    """
+
+    CARGA = 256  # Tamaño objetivo de cada bloque
+
+    def __init__(self, iterable=()):
+        elementos = list(iterable)
+        self.__bloques = [
+            elementos[i : i + self.CARGA] for i in range(0, len(elementos), self.CARGA)
+        ] or [[]]
+        self.__total = len(elementos)
+        self.__donde = {}  # elemento -> {id(bloque): apariciones}
+        self.__compartidos = set()  # id de bloques que alguna instantánea también ve
+        for bloque in self.__bloques:
+            for x in bloque:
+                self._registrar(x, bloque, 1)
+        self._reconstruir()
+
+    # --- Estructuras auxiliares ---
+    def _reconstruir(self):
+        """Recalcula el Fenwick y los índices tras partir/fusionar bloques (O(n/CARGA))."""
+        k = len(self.__bloques)
+        self.__arbol = [0] * (k + 1)
+        for i, bloque in enumerate(self.__bloques):
+            self._fenwick_sumar(i, len(bloque))
+        self.__posicion_bloque = {id(b): i for i, b in enumerate(self.__bloques)}
+
+    def _fenwick_sumar(self, i, delta):
+        i += 1
+        while i < len(self.__arbol):
+            self.__arbol[i] += delta
+            i += i & -i
+
+    def _antes_de(self, i):
+        """Cantidad de elementos en los bloques [0, i)."""
+        total = 0
+        while i > 0:
+            total += self.__arbol[i]
+            i -= i & -i
+        return total
+
+    def _ubicar(self, posicion):
+        return _ubicar(self.__arbol, posicion)
+
+    def _propio(self, bi):
+        """Devuelve el bloque bi listo para modificar (lo copia si una instantánea lo comparte)."""
+        bloque = self.__bloques[bi]
+        if id(bloque) not in self.__compartidos:
+            return bloque
+        self.__compartidos.discard(id(bloque))
+        copia = list(bloque)
+        for x in bloque:
+            self._registrar(x, bloque, -1)
+            self._registrar(x, copia, 1)
+        self.__bloques[bi] = copia
+        del self.__posicion_bloque[id(bloque)]
+        self.__posicion_bloque[id(copia)] = bi
+        return copia
+
+    def _registrar(self, x, bloque, delta):
+        conteo = self.__donde.setdefault(x, {})
+        clave = id(bloque)
+        conteo[clave] = conteo.get(clave, 0) + delta
+        if not conteo[clave]:
+            del conteo[clave]
+            if not conteo:
+                del self.__donde[x]
+
+    def _normalizar(self, posicion, permitir_final=False):
+        limite = self.__total + (1 if permitir_final else 0)
+        if posicion < 0:
+            posicion += self.__total
+        if not 0 <= posicion < limite:
+            raise IndexError("Posición fuera de rango")
+        return posicion
+
+    # --- API de secuencia ---
+    def __len__(self):
+        return self.__total
+
+    def __contains__(self, x):
+        return x in self.__donde
+
+    def __iter__(self):
+        for bloque in self.__bloques:
+            yield from bloque
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(self.__total))]
+        bi, off = self._ubicar(self._normalizar(posicion))
+        return self.__bloques[bi][off]
+
+    def insertar(self, posicion, x):
+        """Inserta x antes de 'posicion' (len(lista) = al final)."""
+        posicion = self._normalizar(posicion, permitir_final=True)
+        if posicion == self.__total:
+            bi = len(self.__bloques) - 1
+            off = len(self.__bloques[bi])
+        else:
+            bi, off = self._ubicar(posicion)
+
+        bloque = self._propio(bi)
+        bloque.insert(off, x)
+        self.__total += 1
+        self._registrar(x, bloque, 1)
+        self._fenwick_sumar(bi, 1)
+
+        if len(bloque) > 2 * self.CARGA:
+            mitad = bloque[self.CARGA :]
+            del bloque[self.CARGA :]
+            for y in mitad:
+                self._registrar(y, bloque, -1)
+                self._registrar(y, mitad, 1)
+            self.__bloques.insert(bi + 1, mitad)
+            self._reconstruir()
+
+    def agregar(self, x):
+        self.insertar(self.__total, x)
+
+    def quitar(self, posicion):
+        """Elimina y devuelve el elemento en 'posicion'."""
+        bi, off = self._ubicar(self._normalizar(posicion))
+        bloque = self._propio(bi)
+        x = bloque.pop(off)
+        self.__total -= 1
+        self._registrar(x, bloque, -1)
+        self._fenwick_sumar(bi, -1)
+
+        # Fusionamos bloques pequeños para que la lista no se fragmente
+        if len(self.__bloques) > 1 and len(bloque) < self.CARGA // 2:
+            vecino = bi + 1 if bi + 1 < len(self.__bloques) else bi - 1
+            izq, der = sorted((bi, vecino))
+            destino, origen = self._propio(izq), self.__bloques[der]
+            if len(destino) + len(origen) <= 2 * self.CARGA:
+                for y in origen:
+                    self._registrar(y, origen, -1)
+                    self._registrar(y, destino, 1)
+                destino.extend(origen)
+                del self.__bloques[der]
+                self._reconstruir()
+        return x
+
+    def mover(self, origen, destino):
+        """Mueve el elemento de 'origen' para que quede en la posición 'destino'."""
+        destino = self._normalizar(destino)
+        self.insertar(destino, self.quitar(origen))
+
+    def indice(self, x):
+        """Posición de la PRIMERA aparición de x. Lanza ValueError si no está."""
+        bloques = self.__donde.get(x)
+        if not bloques:
+            raise ValueError(f"{x!r} no está en la lista")
+        bi = min(self.__posicion_bloque[clave] for clave in bloques)
+        return self._antes_de(bi) + self.__bloques[bi].index(x)
+
+    def instantanea(self):
+        """
+        Copia inmutable del contenido actual en O(n / CARGA): no copia elementos,
+        solo las referencias a los bloques y el Fenwick. Los cambios posteriores
+        de la lista no se ven en la instantánea.
+        """
+        self.__compartidos = {id(b) for b in self.__bloques}
+        return Instantanea(list(self.__bloques), list(self.__arbol), self.__total)
+
+
+class Instantanea:
+    """Secuencia congelada de una ListaIndexada (acceso por posición en O(log n))."""
+
+    __slots__ = ("_bloques", "_arbol", "_total")
+
+    def __init__(self, bloques, arbol, total):
+        self._bloques = bloques
+        self._arbol = arbol
+        self._total = total
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(self._total))]
+        if posicion < 0:
+            posicion += self._total
+        if not 0 <= posicion < self._total:
+            raise IndexError("Posición fuera de rango")
+        bi, off = _ubicar(self._arbol, posicion)
+        return self._bloques[bi][off]
+
+    def __iter__(self):
+        for bloque in self._bloques:
+            yield from bloque
+
+    def __contains__(self, x):
+        return any(x in bloque for bloque in self._bloques)
+
+    def index(self, x):
+        antes = 0
+        for bloque in self._bloques:
+            if x in bloque:
+                return antes + bloque.index(x)
+            antes += len(bloque)
+        raise ValueError(f"{x!r} no está en la instantánea")
+
+
+class VistaSoloLectura:
+    """
+    Vista barata (no copia) de una secuencia: permite len, índices, iterar,
+    'in' e index(), pero no modificarla.
+    """
+
+    __slots__ = ("_datos",)
+
+    def __init__(self, datos):
+        self._datos = datos
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __getitem__(self, posicion):
+        return self._datos[posicion]
+
+    def __iter__(self):
+        return iter(self._datos)
+
+    def __contains__(self, x):
+        return x in self._datos
+
+    def __bool__(self):
+        return len(self._datos) > 0
+
+    def __repr__(self):
+        return repr(list(self._datos))
+
+    def index(self, x):
+        if isinstance(self._datos, ListaIndexada):
+            return self._datos.indice(x)
+        return self._datos.index(x)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    # Instantáneas frente a copias de list() con operaciones al azar
+    azar = random.Random(6)
+    lista, espejo = ListaIndexada(), []
+    fotos = []
+    for paso in range(20_000):
+        if espejo and azar.random() < 0.4:
+            i = azar.randrange(len(espejo))
+            assert lista.quitar(i) == espejo.pop(i)
+        else:
+            i = azar.randrange(len(espejo) + 1)
+            x = azar.randrange(500)
+            lista.insertar(i, x)
+            espejo.insert(i, x)
+        if paso % 2000 == 0:
+            fotos.append((lista.instantanea(), list(espejo)))
+    assert list(lista) == espejo and all(lista.indice(x) == espejo.index(x) for x in set(espejo))
+    for foto, esperado in fotos:
+        assert list(foto) == esperado and [foto[i] for i in range(len(foto))] == esperado
+    print(f"✅ {len(fotos)} instantáneas intactas tras 20k operaciones")
+
+    grande = ListaIndexada(range(1_000_000))
+    inicio = time.perf_counter()
+    foto = grande.instantanea()
+    print(f"Instantánea de 1M elementos: {(time.perf_counter() - inicio) * 1000:.2f} ms "
+          f"(list(): ", end="")
+    inicio = time.perf_counter()
+    list(grande)
+    print(f"{(time.perf_counter() - inicio) * 1000:.2f} ms)")
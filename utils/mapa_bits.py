@@ -0,0 +1,312 @@
+import sys
+import struct
+from array import array
+from bisect import bisect_left
+
+# --- FORMATO SERIALIZADO ---
+# magic(4s) version(H) n_contenedores(I)
+# por contenedor: clave(H) tipo(B) cardinalidad-1(H) + datos
+#   tipo 0 (arreglo): cardinalidad uint16 ordenados
+#   tipo 1 (mapa):    8192 bytes, un bit por valor
+MAGIC = b"NTFB"
+VERSION = 1
+CABECERA = struct.Struct("<4sHI")
+CONTENEDOR = struct.Struct("<HBH")
+_ARREGLO, _MAPA = 0, 1
+
+LIMITE_ARREGLO = 4096  # Por encima, un mapa de 8 KiB ocupa menos que el arreglo
+BYTES_MAPA = 1 << 13  # 65536 bits
+_BITS_DE_BYTE = [tuple(j for j in range(8) if b >> j & 1) for b in range(256)]
+
+
+def _posiciones(datos):
+    """Posiciones de los bits encendidos de un mapa, en orden."""
+    for i, byte in enumerate(datos):
+        if byte:
+            base = i << 3
+            for j in _BITS_DE_BYTE[byte]:
+                yield base + j
+
+
+def _a_mapa(arreglo):
+    mapa = bytearray(BYTES_MAPA)
+    for bajo in arreglo:
+        mapa[bajo >> 3] |= 1 << (bajo & 7)
+    return mapa
+
+
+def _a_entero(contenedor):
+    if isinstance(contenedor, array):
+        contenedor = _a_mapa(contenedor)
+    return int.from_bytes(contenedor, "little")
+
+
+def _desde_entero(bits):
+    """Entero de 65536 bits -> (contenedor, cardinalidad), eligiendo la forma más compacta."""
+    cantidad = bits.bit_count()
+    if not cantidad:
+        return None, 0
+    datos = bits.to_bytes(BYTES_MAPA, "little")
+    if cantidad > LIMITE_ARREGLO:
+        return bytearray(datos), cantidad
+    return array("H", _posiciones(datos)), cantidad
+
+
+class MapaBits:
+    """
+    Conjunto de enteros no negativos de 32 bits comprimido al estilo Roaring.
+    Cada valor se parte en (16 bits altos, 16 bits bajos): los altos eligen un
+    contenedor y los bajos se guardan en él como
+    - arreglo ordenado de uint16 si hay pocos (<= 4096: 2 bytes por valor), o
+    - mapa de bits de 8 KiB si hay muchos (1 bit por valor posible).
+    Pertenencia y alta/baja son O(1) en mapas y O(log 4096) en arreglos;
+    las operaciones de conjunto trabajan contenedor a contenedor.
+    """
+
+    def __init__(self, valores=()):
+        self.__contenedores = {}  # 16 bits altos -> array('H') | bytearray
+        self.__cuentas = {}  # 16 bits altos -> cardinalidad del contenedor
+        self.__total = 0
+        for valor in valores:
+            self.agregar(valor)
+
+    @classmethod
+    def _desde_contenedores(cls, contenedores, cuentas):
+        mapa = cls()
+        mapa.__contenedores = contenedores
+        mapa.__cuentas = cuentas
+        mapa.__total = sum(cuentas.values())
+        return mapa
+
+    # --- Elementos ---
+    def __len__(self):
+        return self.__total
+
+    def __contains__(self, valor):
+        contenedor = self.__contenedores.get(valor >> 16)
+        if contenedor is None:
+            return False
+        bajo = valor & 0xFFFF
+        if isinstance(contenedor, bytearray):
+            return bool(contenedor[bajo >> 3] >> (bajo & 7) & 1)
+        i = bisect_left(contenedor, bajo)
+        return i < len(contenedor) and contenedor[i] == bajo
+
+    def __iter__(self):
+        for alto in sorted(self.__contenedores):
+            contenedor = self.__contenedores[alto]
+            base = alto << 16
+            if isinstance(contenedor, bytearray):
+                for bajo in _posiciones(contenedor):
+                    yield base | bajo
+            else:
+                for bajo in contenedor:
+                    yield base | bajo
+
+    def agregar(self, valor):
+        """Agrega el valor. Devuelve True si no estaba."""
+        if not 0 <= valor <= 0xFFFFFFFF:
+            raise ValueError(f"{valor} está fuera del rango de 32 bits")
+        alto, bajo = valor >> 16, valor & 0xFFFF
+        contenedor = self.__contenedores.get(alto)
+        if contenedor is None:
+            self.__contenedores[alto] = array("H", [bajo])
+            self.__cuentas[alto] = 1
+            self.__total += 1
+            return True
+        if isinstance(contenedor, bytearray):
+            byte, bit = bajo >> 3, 1 << (bajo & 7)
+            if contenedor[byte] & bit:
+                return False
+            contenedor[byte] |= bit
+        else:
+            i = bisect_left(contenedor, bajo)
+            if i < len(contenedor) and contenedor[i] == bajo:
+                return False
+            contenedor.insert(i, bajo)
+            if len(contenedor) > LIMITE_ARREGLO:
+                self.__contenedores[alto] = _a_mapa(contenedor)
+        self.__cuentas[alto] += 1
+        self.__total += 1
+        return True
+
+    def quitar(self, valor):
+        """Quita el valor. Devuelve True si estaba."""
+        alto, bajo = valor >> 16, valor & 0xFFFF
+        contenedor = self.__contenedores.get(alto)
+        if contenedor is None:
+            return False
+        if isinstance(contenedor, bytearray):
+            byte, bit = bajo >> 3, 1 << (bajo & 7)
+            if not contenedor[byte] & bit:
+                return False
+            contenedor[byte] &= ~bit
+        else:
+            i = bisect_left(contenedor, bajo)
+            if i == len(contenedor) or contenedor[i] != bajo:
+                return False
+            del contenedor[i]
+        self.__cuentas[alto] -= 1
+        self.__total -= 1
+        cuenta = self.__cuentas[alto]
+        if not cuenta:
+            del self.__contenedores[alto], self.__cuentas[alto]
+        elif cuenta == LIMITE_ARREGLO and isinstance(contenedor, bytearray):
+            self.__contenedores[alto] = array("H", _posiciones(contenedor))
+        return True
+
+    def alternar(self, valor):
+        """Enciende el valor si estaba apagado y viceversa. Devuelve el estado final."""
+        if self.quitar(valor):
+            return False
+        self.agregar(valor)
+        return True
+
+    # --- Operaciones de conjunto ---
+    def _combinar(self, otro, claves, operar_ints, operar_sets):
+        contenedores, cuentas = {}, {}
+        for alto in claves:
+            a = self.__contenedores.get(alto)
+            b = otro.__contenedores.get(alto)
+            if a is None or b is None or isinstance(a, bytearray) or isinstance(b, bytearray):
+                # Con mapas (o un lado vacío) se opera sobre enteros de 65536 bits en C
+                bits = operar_ints(_a_entero(a) if a is not None else 0,
+                                   _a_entero(b) if b is not None else 0)
+                contenedor, cantidad = _desde_entero(bits)
+            else:
+                valores = sorted(operar_sets(set(a), b))
+                contenedor, cantidad = array("H", valores), len(valores)
+                if cantidad > LIMITE_ARREGLO:
+                    contenedor = _a_mapa(contenedor)
+            if cantidad:
+                contenedores[alto], cuentas[alto] = contenedor, cantidad
+        return MapaBits._desde_contenedores(contenedores, cuentas)
+
+    def __and__(self, otro):
+        claves = self.__contenedores.keys() & otro.__contenedores.keys()
+        return self._combinar(otro, claves, lambda a, b: a & b, set.intersection)
+
+    def __or__(self, otro):
+        claves = self.__contenedores.keys() | otro.__contenedores.keys()
+        return self._combinar(otro, claves, lambda a, b: a | b, set.union)
+
+    def __sub__(self, otro):
+        return self._combinar(otro, self.__contenedores.keys(), lambda a, b: a & ~b, set.difference)
+
+    def __xor__(self, otro):
+        claves = self.__contenedores.keys() | otro.__contenedores.keys()
+        return self._combinar(otro, claves, lambda a, b: a ^ b, set.symmetric_difference)
+
+    def __eq__(self, otro):
+        if not isinstance(otro, MapaBits):
+            return NotImplemented
+        return self.__total == otro.__total and not (self ^ otro)
+
+    def __repr__(self):
+        return f"MapaBits({self.__total} valores, {len(self.__contenedores)} contenedores)"
+
+    def bytes_en_memoria(self):
+        """Tamaño aproximado de los datos (sin contar el overhead de los dicts)."""
+        return sum(
+            len(c) if isinstance(c, bytearray) else len(c) * c.itemsize
+            for c in self.__contenedores.values()
+        )
+
+    # --- Serialización ---
+    def a_bytes(self):
+        partes = [CABECERA.pack(MAGIC, VERSION, len(self.__contenedores))]
+        for alto in sorted(self.__contenedores):
+            contenedor = self.__contenedores[alto]
+            cuenta = self.__cuentas[alto]
+            if isinstance(contenedor, bytearray):
+                partes.append(CONTENEDOR.pack(alto, _MAPA, cuenta - 1))
+                partes.append(bytes(contenedor))
+            else:
+                if sys.byteorder != "little":
+                    contenedor = array("H", contenedor)
+                    contenedor.byteswap()
+                partes.append(CONTENEDOR.pack(alto, _ARREGLO, cuenta - 1))
+                partes.append(contenedor.tobytes())
+        return b"".join(partes)
+
+    @classmethod
+    def desde_bytes(cls, datos, inicio=0):
+        """Reconstruye un mapa. Devuelve (mapa, posición donde terminó de leer)."""
+        try:
+            magic, version, n = CABECERA.unpack_from(datos, inicio)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("cabecera desconocida")
+            posicion = inicio + CABECERA.size
+            contenedores, cuentas = {}, {}
+            for _ in range(n):
+                alto, tipo, cuenta = CONTENEDOR.unpack_from(datos, posicion)
+                cuenta += 1
+                posicion += CONTENEDOR.size
+                if tipo == _MAPA:
+                    contenedor = bytearray(datos[posicion : posicion + BYTES_MAPA])
+                    posicion += BYTES_MAPA
+                elif tipo == _ARREGLO:
+                    contenedor = array("H")
+                    contenedor.frombytes(datos[posicion : posicion + 2 * cuenta])
+                    if sys.byteorder != "little":
+                        contenedor.byteswap()
+                    posicion += 2 * cuenta
+                else:
+                    raise ValueError(f"tipo de contenedor {tipo}")
+                contenedores[alto], cuentas[alto] = contenedor, cuenta
+        except (struct.error, ValueError) as e:
+            raise ValueError(f"Datos de MapaBits inválidos: {e}") from None
+        return cls._desde_contenedores(contenedores, cuentas), posicion
+
+
+def contar_por_valor(mapas, total):
+    """
+    Pasada masiva: para cada valor en [0, total), en cuántos mapas aparece.
+    Devuelve un array('I') (ej.: cantidad de "Me Gusta" por canción).
+    """
+    conteos = array("I", bytes(4 * total))
+    for mapa in mapas:
+        for valor in mapa:
+            if valor < total:
+                conteos[valor] += 1
+    return conteos
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    azar = random.Random(5)
+    universo = 1_000_000
+
+    # 1. Comparación contra set() con operaciones al azar (incluye contenedores densos)
+    a, b = MapaBits(), MapaBits()
+    sa, sb = set(), set()
+    for _ in range(60_000):
+        v = azar.randrange(70_000) if azar.random() < 0.7 else azar.randrange(universo)
+        m, s = (a, sa) if azar.random() < 0.5 else (b, sb)
+        m.alternar(v)
+        s.symmetric_difference_update({v})
+    assert set(a) == sa and len(a) == len(sa) and list(a) == sorted(sa)
+    assert set(a & b) == sa & sb and set(a | b) == sa | sb
+    assert set(a - b) == sa - sb and set(a ^ b) == sa ^ sb
+    copia, fin = MapaBits.desde_bytes(a.a_bytes())
+    assert copia == a and fin == len(a.a_bytes())
+    print(f"✅ Coincide con set(): {a!r}")
+
+    # 2. Memoria: 100k usuarios con ~50 "Me Gusta" cada uno sobre 1M de canciones
+    usuarios = [MapaBits(azar.sample(range(universo), 50)) for _ in range(100_000)]
+    datos = sum(m.bytes_en_memoria() for m in usuarios)
+    serializado = sum(len(m.a_bytes()) for m in usuarios)
+    print(f"100k usuarios: {datos / 2**20:.1f} MiB de datos, {serializado / 2**20:.1f} MiB en disco "
+          f"(un bitset plano de 1M bits: {100_000 * universo / 8 / 2**30:.1f} GiB)")
+
+    inicio = time.perf_counter()
+    conteos = contar_por_valor(usuarios, universo)
+    print(f"Conteo global: {time.perf_counter() - inicio:.2f} s, total {sum(conteos):,}")
+
+    inicio = time.perf_counter()
+    for i in range(0, 10_000, 2):
+        usuarios[i] & usuarios[i + 1]
+    print(f"Intersección: {(time.perf_counter() - inicio) / 5000 * 1e6:.1f} µs por par")
@@ -0,0 +1,254 @@
+import os
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+
+# Apagado por defecto: cada punto de medición se reduce a leer este booleano.
+# Se enciende con habilitar() o con la variable de entorno SPOTIPY_METRICAS=1.
+HABILITADO = os.environ.get("SPOTIPY_METRICAS") == "1"
+
+LIMITES_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_NULO = nullcontext()
+
+
+def habilitar(valor=True):
+    global HABILITADO
+    HABILITADO = valor
+
+
+def _formatear_etiquetas(clave, extra=None):
+    pares = list(clave) + ([extra] if extra else [])
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pares) + "}"
+
+
+class Contador:
+    """Valor que solo crece (ej.: reproducciones, fallos de login), con etiquetas opcionales."""
+
+    tipo = "counter"
+
+    def __init__(self, nombre, ayuda):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.__valores = {}  # tupla de etiquetas -> valor
+        self.__candado = threading.Lock()
+
+    def inc(self, cantidad=1, **etiquetas):
+        if not HABILITADO:
+            return
+        clave = tuple(sorted(etiquetas.items()))
+        with self.__candado:
+            self.__valores[clave] = self.__valores.get(clave, 0) + cantidad
+
+    def valor(self, **etiquetas):
+        return self.__valores.get(tuple(sorted(etiquetas.items())), 0)
+
+    def exportar(self):
+        with self.__candado:
+            valores = dict(self.__valores)
+        return [f"{self.nombre}{_formatear_etiquetas(c)} {v}" for c, v in valores.items()]
+
+
+class Histograma:
+    """Distribución de valores (típicamente latencias en segundos) por cubetas."""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, limites=LIMITES_LATENCIA):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.limites = tuple(limites)
+        self.__series = {}  # etiquetas -> [conteos por cubeta..., suma, total]
+        self.__candado = threading.Lock()
+
+    def observar(self, valor, **etiquetas):
+        if not HABILITADO:
+            return
+        clave = tuple(sorted(etiquetas.items()))
+        cubeta = bisect.bisect_left(self.limites, valor)
+        with self.__candado:
+            serie = self.__series.get(clave)
+            if serie is None:
+                serie = self.__series[clave] = [0] * (len(self.limites) + 1) + [0.0, 0]
+            serie[cubeta] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def medir(self, **etiquetas):
+        """Context manager: 'with hist.medir(): ...' observa la duración del bloque."""
+        if not HABILITADO:
+            return _NULO
+        return self._medir(etiquetas)
+
+    @contextmanager
+    def _medir(self, etiquetas):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **etiquetas)
+
+    def total(self, **etiquetas):
+        serie = self.__series.get(tuple(sorted(etiquetas.items())))
+        return serie[-1] if serie else 0
+
+    def exportar(self):
+        with self.__candado:
+            series = {clave: list(serie) for clave, serie in self.__series.items()}
+        lineas = []
+        for clave, serie in series.items():
+            acumulado = 0
+            for limite, conteo in zip(self.limites + ("+Inf",), serie):
+                acumulado += conteo
+                lineas.append(
+                    f"{self.nombre}_bucket{_formatear_etiquetas(clave, ('le', limite))} {acumulado}"
+                )
+            lineas.append(f"{self.nombre}_sum{_formatear_etiquetas(clave)} {serie[-2]}")
+            lineas.append(f"{self.nombre}_count{_formatear_etiquetas(clave)} {serie[-1]}")
+        return lineas
+
+
+class RegistroMetricas:
+    """Conjunto de métricas del proceso. Exporta en formato de texto de Prometheus."""
+
+    def __init__(self):
+        self.__metricas = {}
+        self.__candado = threading.Lock()
+
+    def _registrar(self, clase, nombre, *args):
+        with self.__candado:
+            metrica = self.__metricas.get(nombre)
+            if metrica is None:
+                metrica = self.__metricas[nombre] = clase(nombre, *args)
+            elif not isinstance(metrica, clase):
+                raise ValueError(f"La métrica '{nombre}' ya existe con otro tipo")
+            return metrica
+
+    def contador(self, nombre, ayuda=""):
+        return self._registrar(Contador, nombre, ayuda)
+
+    def histograma(self, nombre, ayuda="", limites=LIMITES_LATENCIA):
+        return self._registrar(Histograma, nombre, ayuda, limites)
+
+    def exportar_prometheus(self):
+        lineas = []
+        for metrica in list(self.__metricas.values()):
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.extend(metrica.exportar())
+        return "\n".join(lineas) + "\n"
+
+    def guardar(self, ruta):
+        """Escribe el archivo de forma atómica (para el textfile collector de node_exporter)."""
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(self.exportar_prometheus())
+        os.replace(temporal, ruta)
+
+    def servir(self, puerto=9464, host="127.0.0.1"):
+        """Expone /metrics en un hilo de fondo. Devuelve el servidor (para .shutdown())."""
+        # Import diferido: http.server cuesta ~50 ms y casi nunca se sirve /metrics
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registro = self
+
+        class _Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                cuerpo = registro.exportar_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass  # Silencioso: no ensuciar la consola del reproductor
+
+        servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+        threading.Thread(target=servidor.serve_forever, name="spotipy-metricas", daemon=True).start()
+        return servidor
+
+
+REGISTRO = RegistroMetricas()
+
+
+def contador(nombre, ayuda=""):
+    return REGISTRO.contador(nombre, ayuda)
+
+
+def histograma(nombre, ayuda="", limites=LIMITES_LATENCIA):
+    return REGISTRO.histograma(nombre, ayuda, limites)
+
+
+def cronometrar(hist, errores=None, **etiquetas):
+    """
+    Decorador: mide la duración de la función en 'hist' y, si se pasa un contador
+    'errores', cuenta las excepciones por tipo (etiqueta error="NombreDeLaClase").
+    Deshabilitado, solo añade la lectura de HABILITADO.
+    """
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not HABILITADO:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            except Exception as e:
+                if errores is not None:
+                    errores.inc(error=type(e).__name__, **etiquetas)
+                raise
+            finally:
+                hist.observar(time.perf_counter() - inicio, **etiquetas)
+
+        return envoltura
+
+    return decorador
+
+
+def iniciar_desde_entorno():
+    """Si SPOTIPY_METRICAS_PUERTO está definido (y las métricas activas), levanta /metrics."""
+    puerto = os.environ.get("SPOTIPY_METRICAS_PUERTO")
+    if HABILITADO and puerto:
+        return REGISTRO.servir(int(puerto))
+    return None
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    llamadas = contador("demo_llamadas_total", "Llamadas de prueba")
+    latencia = histograma("demo_latencia_segundos", "Latencia de prueba")
+
+    @cronometrar(latencia, errores=llamadas)
+    def trabajo(fallar=False):
+        if fallar:
+            raise ValueError("falla de prueba")
+
+    def trabajo_sin_medir(fallar=False):
+        if fallar:
+            raise ValueError("falla de prueba")
+
+    # 1. Costo: sin decorador vs deshabilitado vs habilitado
+    inicio = time.perf_counter()
+    for _ in range(200_000):
+        trabajo_sin_medir()
+    print(f"Sin decorador:    {(time.perf_counter() - inicio) / 200_000 * 1e9:.0f} ns/llamada")
+    for estado in (False, True):
+        habilitar(estado)
+        inicio = time.perf_counter()
+        for _ in range(200_000):
+            trabajo()
+        print(f"Habilitado={estado!s:<5}: {(time.perf_counter() - inicio) / 200_000 * 1e9:.0f} ns/llamada")
+
+    try:
+        trabajo(fallar=True)
+    except ValueError:
+        pass
+    print(REGISTRO.exportar_prometheus())
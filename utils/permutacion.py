@@ -0,0 +1,115 @@
+import random
+
+
+class PermutacionPerezosa:
+    """
+    Permutación aleatoria de range(n) que se genera a demanda (Fisher–Yates perezoso).
+    Crearla es O(1) aunque n sea enorme: solo se baraja hasta la posición que se
+    pide, y solo se guardan las casillas que un intercambio movió (dict disperso).
+    Pedir la posición i cuesta O(1) amortizado.
+    'al_final' deja esos valores fijos en las últimas posiciones (en ese orden, desde
+    la última hacia atrás) y baraja solo el resto: O(len(al_final)) al crearla.
+    descartar_hasta(i) da por consumidas las posiciones anteriores a i sin sortearlas,
+    en O(1) (ver el método); después de eso solo se pueden pedir posiciones >= i.
+    """
+
+    def __init__(self, n, azar=None, primero=None, al_final=()):
+        self.__n = n
+        self.__azar = azar or random.Random()
+        self.__movidos = {}  # posición -> valor (las demás valen su propia posición)
+        self.__listos = 0  # Posiciones [0, listos) ya son definitivas
+        self.__limite = n  # Solo se baraja [0, limite): lo de después es 'al_final'
+        self.__desfase = 0  # Posiciones descartadas sin sortear: interna = pedida - desfase
+        self.__inicio = 0  # Primera posición que todavía se puede pedir
+        posicion_de = {}  # valor -> posición, solo de los valores movidos al crearla
+        if primero is not None and n:
+            # Fija 'primero' en la posición 0 (ej.: la canción que ya está sonando)
+            self._intercambiar(0, primero)
+            posicion_de[self.__movidos[primero]] = primero
+            posicion_de[primero] = 0
+            self.__listos = 1
+        for valor in al_final:
+            if valor == primero or posicion_de.get(valor, valor) >= self.__limite:
+                continue  # La posición 0 no se cede; un valor repetido ya está al final
+            self.__limite -= 1
+            origen = posicion_de.get(valor, valor)
+            desplazado = self.__movidos.get(self.__limite, self.__limite)
+            self._intercambiar(origen, self.__limite)
+            posicion_de[desplazado], posicion_de[valor] = origen, self.__limite
+
+    def __len__(self):
+        return self.__n
+
+    def _intercambiar(self, i, j):
+        movidos = self.__movidos
+        vi, vj = movidos.get(i, i), movidos.get(j, j)
+        movidos[i], movidos[j] = vj, vi
+
+    def __getitem__(self, posicion):
+        if not 0 <= posicion < self.__n:
+            raise IndexError("Posición fuera de rango")
+        if posicion >= self.__limite:
+            return self.__movidos.get(posicion, posicion)  # Fijada por 'al_final': no se baraja nada
+        if posicion < self.__inicio:
+            raise IndexError("Posición ya descartada")
+        interna = posicion - self.__desfase
+        while self.__listos <= interna:
+            self._intercambiar(self.__listos, self.__azar.randrange(self.__listos, self.__limite))
+            self.__listos += 1
+        return self.__movidos.get(interna, interna)
+
+    def descartar_hasta(self, posicion):
+        """
+        Las posiciones anteriores a 'posicion' se dan por consumidas. Las que aún no se
+        sortearon no se sortean: las posiciones siguientes se eligen entre todo lo que
+        queda, y lo que nunca llegue a elegirse es lo "descartado". Una secuencia
+        uniforme sin reposición, cortada antes del final, deja fuera un subconjunto
+        uniforme: la distribución es la misma que barajando todo el tramo, en O(1).
+        """
+        if posicion <= self.__inicio:
+            return
+        hueco = posicion - self.__desfase - self.__listos
+        if hueco > 0:
+            self.__desfase += hueco
+        self.__inicio = posicion
+
+    def __iter__(self):
+        for posicion in range(self.__inicio, self.__n):
+            yield self[posicion]
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import time
+    from collections import Counter
+
+    p = PermutacionPerezosa(10, random.Random(1), primero=7)
+    orden = list(p)
+    assert sorted(orden) == list(range(10)) and orden[0] == 7
+    print(f"Orden: {orden}")
+
+    p = PermutacionPerezosa(10, random.Random(2), primero=3, al_final=[0, 9, 5])
+    orden = list(p)
+    assert sorted(orden) == list(range(10)) and orden[0] == 3 and orden[-3:] == [5, 9, 0]
+    print(f"Con 0, 9 y 5 al final: {orden}")
+
+    # Descartar un tramo sin sortearlo: lo que queda sigue siendo una mezcla uniforme
+    p = PermutacionPerezosa(10, random.Random(5), primero=2)
+    p.descartar_hasta(6)
+    resto = list(p)
+    assert len(resto) == 4 and len(set(resto)) == 4 and 2 not in resto
+    conteo = Counter()
+    for i in range(20_000):
+        p = PermutacionPerezosa(5, random.Random(i), primero=0)
+        p.descartar_hasta(3)
+        conteo[p[3]] += 1
+    print(f"Posición 3 tras descartar 1-2, en 20k: {sorted(conteo.items())}")
+
+    # Uniformidad: cada valor debería caer en la posición 0 ~1/5 de las veces
+    conteo = Counter(PermutacionPerezosa(5, random.Random(i))[0] for i in range(50_000))
+    print(f"Posición 0 en 50k permutaciones de 5: {sorted(conteo.items())}")
+
+    inicio = time.perf_counter()
+    grande = PermutacionPerezosa(10_000_000)
+    primeras = [grande[i] for i in range(20)]
+    print(f"10M elementos, 20 primeras posiciones: {(time.perf_counter() - inicio) * 1e6:.0f} µs")
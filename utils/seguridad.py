@@ -0,0 +1,55 @@
+import base64
+import hashlib
+import hmac
+import os
+
+# Parámetros de scrypt (costo CPU/memoria). Si se endurecen, los hashes antiguos
+# se regeneran automáticamente en el siguiente login correcto.
+PARAMETROS_KDF = {"n": 2**14, "r": 8, "p": 1}
+LONGITUD_SAL = 16
+LONGITUD_HASH = 32
+
+
+def _b64(datos):
+    return base64.b64encode(datos).decode("ascii")
+
+
+def _derivar(contraseña, sal, n, r, p):
+    return hashlib.scrypt(
+        contraseña.encode("utf-8"),
+        salt=sal,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=2 * 128 * r * n + 2**20,  # Holgura sobre los 128·r·n bytes que exige scrypt
+        dklen=LONGITUD_HASH,
+    )
+
+
+def generar_hash(contraseña):
+    """
+    Devuelve 'scrypt$n$r$p$sal$hash' (sal y hash en base64).
+    Nunca se guarda la contraseña en texto plano.
+    """
+    n, r, p = PARAMETROS_KDF["n"], PARAMETROS_KDF["r"], PARAMETROS_KDF["p"]
+    sal = os.urandom(LONGITUD_SAL)
+    return f"scrypt${n}${r}${p}${_b64(sal)}${_b64(_derivar(contraseña, sal, n, r, p))}"
+
+
+def _parsear(hash_guardado):
+    algoritmo, n, r, p, sal, derivado = hash_guardado.split("$")
+    if algoritmo != "scrypt":
+        raise ValueError(f"Algoritmo de hash desconocido: {algoritmo}")
+    return int(n), int(r), int(p), base64.b64decode(sal), base64.b64decode(derivado)
+
+
+def verificar_hash(contraseña, hash_guardado):
+    """Compara en tiempo constante (hmac.compare_digest) para no filtrar información."""
+    n, r, p, sal, esperado = _parsear(hash_guardado)
+    return hmac.compare_digest(_derivar(contraseña, sal, n, r, p), esperado)
+
+
+def necesita_rehash(hash_guardado):
+    """True si el hash se generó con parámetros distintos a los actuales."""
+    n, r, p, _, _ = _parsear(hash_guardado)
+    return (n, r, p) != (PARAMETROS_KDF["n"], PARAMETROS_KDF["r"], PARAMETROS_KDF["p"])
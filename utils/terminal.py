@@ -0,0 +1,287 @@
+import sys
+import os
+import time
+import select
+import statistics
+import contextlib
+from collections import deque
+
+# --- CONFIGURACIÓN DE RUTA ---
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# -----------------------------
+
+from utils import metricas
+
+try:
+    import termios
+    import tty
+
+    TERMIOS_DISPONIBLE = True
+except ImportError:  # Windows: se usa msvcrt
+    TERMIOS_DISPONIBLE = False
+
+_CUADRO = metricas.histograma(
+    "spotipy_tui_cuadro_segundos", "Costo de armar la diferencia y escribir un cuadro de la interfaz",
+    limites=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+BORRAR_PANTALLA = "\x1b[H\x1b[2J"
+BORRAR_LINEA = "\x1b[K"  # Desde el cursor hasta el final de la línea
+BORRAR_DEBAJO = "\x1b[J"  # Desde el cursor hasta el final de la pantalla
+OCULTAR_CURSOR = "\x1b[?25l"
+MOSTRAR_CURSOR = "\x1b[?25h"
+
+_ansi_windows = None
+
+
+def _habilitar_ansi_windows():
+    """La consola de Windows 10+ entiende ANSI si se lo pedimos (sin lanzar 'cls')."""
+    global _ansi_windows
+    if _ansi_windows is None:
+        try:
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            consola = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+            modo = ctypes.c_uint32()
+            _ansi_windows = bool(
+                kernel32.GetConsoleMode(consola, ctypes.byref(modo))
+                and kernel32.SetConsoleMode(consola, modo.value | 0x0004)  # VIRTUAL_TERMINAL_PROCESSING
+            )
+        except (ImportError, AttributeError, OSError):
+            _ansi_windows = False
+    return _ansi_windows
+
+
+def es_terminal(flujo):
+    try:
+        return flujo.isatty() and (os.name != "nt" or _habilitar_ansi_windows())
+    except (AttributeError, ValueError):
+        return False
+
+
+def limpiar(salida=None):
+    """Borra la pantalla con una secuencia ANSI (no lanza procesos). Si no es una terminal, nada."""
+    salida = salida or sys.stdout
+    if es_terminal(salida):
+        salida.write(BORRAR_PANTALLA)
+        salida.flush()
+
+
+def mmss(segundos):
+    segundos = max(0, int(segundos))
+    return f"{segundos // 60}:{segundos % 60:02d}"
+
+
+def barra_progreso(posicion, duracion, ancho=24):
+    """'1:23 ━━━━━━━━──────────────── 4:05'. Sin duración conocida, solo el tiempo."""
+    if duracion <= 0:
+        return mmss(posicion)
+    llenos = round(min(max(posicion / duracion, 0.0), 1.0) * ancho)
+    return f"{mmss(posicion)} {'━' * llenos}{'─' * (ancho - llenos)} {mmss(duracion)}"
+
+
+class Lienzo:
+    """
+    Dibuja cuadros de texto (una lista de líneas) redibujando solo las que cambiaron:
+    cada línea distinta a la del cuadro anterior se escribe con una secuencia de
+    posición del cursor + borrar el resto de la línea. Un cuadro igual al anterior
+    no escribe nada. Todo el cuadro sale en un único write().
+    Si la salida no es una terminal (tubería, archivo) se imprime el cuadro entero.
+    Mide el costo de cada cuadro (ver estadisticas()).
+    """
+
+    def __init__(self, salida=None):
+        self.salida = salida or sys.stdout
+        self.ansi = es_terminal(self.salida)
+        self.__anteriores = None  # Líneas del último cuadro (None = repintar todo)
+        self.__costos = deque(maxlen=1000)  # Segundos por cuadro
+        self.__stats = dict.fromkeys(("cuadros", "lineas_escritas", "bytes"), 0)
+
+    def __enter__(self):
+        self.invalidar()
+        if self.ansi:
+            self.salida.write(OCULTAR_CURSOR)
+        return self
+
+    def __exit__(self, *exc):
+        if self.ansi:
+            self.salida.write(MOSTRAR_CURSOR)
+            self.salida.flush()
+
+    def invalidar(self):
+        """El próximo cuadro se pinta entero (alguien más escribió en la pantalla)."""
+        self.__anteriores = None
+
+    def dibujar(self, lineas):
+        """Pinta 'lineas'. Devuelve cuántas líneas se escribieron."""
+        inicio = time.perf_counter()
+        if not self.ansi:
+            texto = "\n".join(lineas) + "\n"
+            escritas = len(lineas)
+        else:
+            anteriores = self.__anteriores
+            partes = []
+            for i, linea in enumerate(lineas):
+                if anteriores is None or i >= len(anteriores) or anteriores[i] != linea:
+                    partes.append(f"\x1b[{i + 1};1H{linea}{BORRAR_LINEA}")
+            escritas = len(partes)
+            if anteriores is None or len(lineas) < len(anteriores):
+                partes.append(f"\x1b[{len(lineas) + 1};1H{BORRAR_DEBAJO}")
+            elif partes:
+                partes.append(f"\x1b[{len(lineas) + 1};1H")  # Cursor debajo del cuadro
+            texto = "".join(partes)
+            self.__anteriores = list(lineas)
+        if texto:
+            self.salida.write(texto)
+            self.salida.flush()
+        segundos = time.perf_counter() - inicio
+        self.__costos.append(segundos)
+        self.__stats["cuadros"] += 1
+        self.__stats["lineas_escritas"] += escritas
+        self.__stats["bytes"] += len(texto)
+        _CUADRO.observar(segundos)
+        return escritas
+
+    def estadisticas(self):
+        """Cuadros dibujados, líneas y bytes escritos, y costo por cuadro en ms."""
+        stats = dict(self.__stats)
+        if self.__costos:
+            ordenados = sorted(self.__costos)
+            stats["ms_p50"] = statistics.median(ordenados) * 1000
+            stats["ms_max"] = ordenados[-1] * 1000
+        return stats
+
+
+class Teclado:
+    """
+    Lectura de teclas sin bloquear: leer(espera) devuelve la tecla pulsada o None
+    si pasó 'espera' sin ninguna (no hace falta Enter). En POSIX pone la terminal
+    en modo cbreak mientras se usa como context manager; en Windows usa msvcrt.
+    Si la entrada no es una terminal, interactivo es False y se lee por líneas.
+    """
+
+    def __init__(self, entrada=None, salida=None):
+        self.entrada = entrada or sys.stdin
+        self.salida = salida or sys.stdout
+        self.interactivo = es_terminal(self.entrada) and es_terminal(self.salida) and (
+            TERMIOS_DISPONIBLE or os.name == "nt"
+        )
+        self.__original = None
+
+    def __enter__(self):
+        if self.interactivo and TERMIOS_DISPONIBLE:
+            descriptor = self.entrada.fileno()
+            self.__original = termios.tcgetattr(descriptor)
+            tty.setcbreak(descriptor)
+        return self
+
+    def __exit__(self, *exc):
+        if self.__original is not None:
+            termios.tcsetattr(self.entrada.fileno(), termios.TCSADRAIN, self.__original)
+            self.__original = None
+
+    def leer(self, espera):
+        """Una tecla (str de un carácter) o None. Flechas y otras secuencias se ignoran."""
+        if not TERMIOS_DISPONIBLE:
+            import msvcrt
+
+            limite = time.monotonic() + espera
+            while time.monotonic() < limite:
+                if msvcrt.kbhit():
+                    tecla = msvcrt.getwch()
+                    if tecla in ("\x00", "\xe0"):
+                        msvcrt.getwch()  # Tecla especial: viene en dos partes
+                        continue
+                    return tecla
+                time.sleep(0.01)
+            return None
+        descriptor = self.entrada.fileno()
+        listos, _, _ = select.select([descriptor], [], [], espera)
+        if not listos:
+            return None
+        datos = os.read(descriptor, 32)
+        if not datos or datos.startswith(b"\x1b"):
+            return None
+        return datos[:1].decode("ascii", "ignore") or None
+
+    def pedir(self, texto):
+        """Una línea completa con input() (la terminal vuelve a su modo normal mientras tanto)."""
+        pausado = self.__original is not None
+        if pausado:
+            termios.tcsetattr(self.entrada.fileno(), termios.TCSADRAIN, self.__original)
+        if self.interactivo:
+            self.salida.write(MOSTRAR_CURSOR)
+        try:
+            with contextlib.redirect_stdout(self.salida):
+                return input(texto)
+        finally:
+            if self.interactivo:
+                self.salida.write(OCULTAR_CURSOR)
+            if pausado:
+                tty.setcbreak(self.entrada.fileno())
+
+
+class RegistroMensajes:
+    """
+    Destino para sys.stdout mientras hay una interfaz en pantalla: los print() de los
+    servicios (incluidos los de otros hilos) se guardan acá en vez de romper el cuadro,
+    y la interfaz muestra las últimas líneas.
+    """
+
+    def __init__(self, maximo=3):
+        self.__lineas = deque(maxlen=maximo)
+        self.__parcial = ""
+
+    def write(self, texto):
+        lineas = (self.__parcial + texto).split("\n")
+        self.__parcial = lineas.pop()
+        self.__lineas.extend(linea.strip() for linea in lineas if linea.strip())
+        return len(texto)
+
+    def flush(self):
+        pass
+
+    def ultimas(self):
+        return list(self.__lineas)
+
+
+# --- ZONA DE PRUEBAS ---
+if __name__ == "__main__":
+    import io
+
+    # Un reproductor de 15 líneas donde, tick a tick, solo avanza la barra de progreso
+    def cuadro(segundos):
+        lineas = [f"│ Canción de prueba {i:<20} │" for i in range(12)]
+        lineas.insert(4, f"│ {barra_progreso(segundos, 240):^36} │")
+        return lineas + ["", "[P] Play/Pause | [S]iguiente | [X] Salir"]
+
+    salida = io.StringIO()
+    salida.isatty = lambda: True  # Como si fuera una terminal
+    lienzo = Lienzo(salida)
+    with lienzo:
+        for tick in range(4 * 240):  # 4 cuadros por segundo durante 4 minutos
+            lienzo.dibujar(cuadro(tick / 4))
+    stats = lienzo.estadisticas()
+    completo = len("\n".join(cuadro(0)))
+    print(
+        f"{stats['cuadros']} cuadros: {stats['lineas_escritas']} líneas escritas, "
+        f"{stats['bytes'] / stats['cuadros']:.0f} bytes/cuadro (repintar todo: ~{completo}), "
+        f"p50 {stats['ms_p50'] * 1000:.1f} µs, máx {stats['ms_max'] * 1000:.1f} µs"
+    )
+    assert stats["ms_p50"] < 1.0
+
+    # Se verifica el resultado final emulando las secuencias sobre una grilla
+    import re
+
+    pantalla, fila, escrito = {}, 1, ""
+    for codigo, texto in re.findall(r"\x1b\[([0-9;?]*[A-Za-z])([^\x1b]*)", salida.getvalue()):
+        if codigo.endswith("H"):
+            fila = int(codigo.split(";")[0]) if ";" in codigo else 1
+            escrito = texto
+        elif codigo == "K":
+            pantalla[fila] = escrito
+        elif codigo == "J":
+            pantalla = {f: linea for f, linea in pantalla.items() if f < fila}
+    assert [pantalla[i + 1] for i in range(15)] == cuadro(239.75)
+    print("✅ La pantalla final coincide con el último cuadro")